@@ -7,7 +7,7 @@ import multiprocessing
 import queue
 import sys
 import time
-from asyncio import Lock, Queue
+from asyncio import Lock
 from contextlib import asynccontextmanager
 from typing import Awaitable, Callable
 
@@ -38,6 +38,7 @@ from logging_utils import restore_original_streams, setup_server_logging
 from models import WebSocketConnectionManager
 
 from . import auth_utils
+from .fast_queue import FastQueue
 
 VERSION = "0.1.0"
 
@@ -58,8 +59,9 @@ def _setup_logging():
 def _initialize_globals():
     from api_utils.server_state import state
 
-    state.request_queue = Queue()
+    state.request_queue = FastQueue()
     state.processing_lock = Lock()
+    # Re-created per lifespan so they bind to the running event loop
     state.model_switching_lock = Lock()
     state.params_cache_lock = Lock()
 
@@ -419,19 +421,27 @@ def create_app() -> FastAPI:
         get_api_info,
         get_api_keys,
         get_queue_status,
+        get_static_files_app,
         health_check,
         list_models,
         model_capabilities_router,
         ports_router,
         proxy_router,
         read_index,
-        serve_react_assets,
         test_api_key,
         websocket_log_endpoint,
     )
 
     app.get("/", response_class=FileResponse)(read_index)
-    app.get("/assets/{filename:path}")(serve_react_assets)
+    # The assets directory is checked once here rather than on every request
+    assets_app = get_static_files_app()
+    if assets_app is not None:
+        app.mount("/assets", assets_app, name="react-assets")
+    else:
+        state.logger.warning(
+            "React assets not found - run 'npm run build' in static/frontend/ "
+            "and restart to serve /assets"
+        )
     app.get("/api/info")(get_api_info)
     app.get("/health")(health_check)
     app.get("/v1/models")(list_models)
@@ -1,11 +1,14 @@
 import asyncio
 from asyncio import Event, Task
-from typing import Any, Callable, Coroutine, Dict, Tuple
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple, Union
 
-from fastapi import HTTPException, Request
+from fastapi import Request
 
+from api_utils.server_state import state
 from models import ClientDisconnectedError
 
+from .error_utils import client_disconnected, server_error
+
 
 async def check_client_connection(req_id: str, http_request: Request) -> bool:
     """
@@ -117,7 +120,7 @@ async def non_streaming_disconnect_monitor(
                 )
                 if not result_future.done():
                     result_future.set_exception(
-                        HTTPException(status_code=499, detail="Client disconnected")
+                        client_disconnected(req_id, "non-streaming response")
                     )
                 return True
             await asyncio.sleep(0.3)
@@ -129,61 +132,112 @@ async def non_streaming_disconnect_monitor(
     return False
 
 
+class ClientConnectionWatcher:
+    """
+    Polls the connection of every registered request from one shared task.
+
+    Each registration gets a future that stays pending while it is watched;
+    cancelling it (or resolving it from the callback) unregisters the request.
+    The polling task starts with the first registration and stops once none
+    are left.
+    """
+
+    def __init__(self, interval: float = 0.3):
+        self._interval = interval
+        self._watches: Dict[
+            "asyncio.Future[None]",
+            Tuple[str, Request, Callable[[Union[bool, BaseException]], bool]],
+        ] = {}
+        self._task: Optional[Task[None]] = None
+
+    def register(
+        self,
+        req_id: str,
+        http_request: Request,
+        on_poll: Callable[[Union[bool, BaseException]], bool],
+    ) -> "asyncio.Future[None]":
+        """
+        Watches ``http_request`` until the returned future is done.
+
+        ``on_poll`` receives each check result (or the exception it raised)
+        and returns True once it no longer needs to be polled.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # Registrations left over from another loop can never be polled
+            self._watches.clear()
+            self._task = loop.create_task(self._run())
+        handle: "asyncio.Future[None]" = loop.create_future()
+        self._watches[handle] = (req_id, http_request, on_poll)
+        handle.add_done_callback(self._unregister)
+        return handle
+
+    def _unregister(self, handle: "asyncio.Future[None]") -> None:
+        self._watches.pop(handle, None)
+        if not self._watches and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while self._watches:
+            watches = list(self._watches.items())
+            results = await asyncio.gather(
+                *(
+                    check_client_connection(req_id, http_request)
+                    for _, (req_id, http_request, _) in watches
+                ),
+                return_exceptions=True,
+            )
+            for (handle, (_, _, on_poll)), result in zip(watches, results):
+                if not handle.done() and on_poll(result):
+                    handle.set_result(None)
+            await asyncio.sleep(self._interval)
+
+
+_connection_watcher = ClientConnectionWatcher()
+
+
 async def setup_disconnect_monitoring(
     req_id: str, http_request: Request, result_future
-) -> Tuple[Event, asyncio.Task, Callable]:
-    from api_utils.server_state import state
-
+) -> Tuple[Event, asyncio.Future, Callable]:
     logger = state.logger
 
     client_disconnected_event = Event()
     disconnect_count = 0
     disconnect_threshold = 5  # Require 5 consecutive disconnect signals (1.5 seconds)
 
-    async def check_disconnect_periodically():
+    def on_poll(result: Union[bool, BaseException]) -> bool:
         nonlocal disconnect_count
-        while not client_disconnected_event.is_set():
-            try:
-                is_connected = await check_client_connection(req_id, http_request)
-                if not is_connected:
-                    disconnect_count += 1
-                    if disconnect_count >= disconnect_threshold:
-                        logger.info(
-                            f"[{req_id}] Active detection of client disconnect (consecutive {disconnect_count} times)."
-                        )
-                        client_disconnected_event.set()
-                        if not result_future.done():
-                            result_future.set_exception(
-                                HTTPException(
-                                    status_code=499,
-                                    detail=f"[{req_id}] Client closed the request",
-                                )
-                            )
-                        break
-                    else:
-                        logger.debug(
-                            f"[{req_id}] Active detection of potential disconnect (round {disconnect_count}/{disconnect_threshold})"
-                        )
-                else:
-                    disconnect_count = 0  # Reset counter on successful connection
+        if isinstance(result, BaseException):
+            logger.error(f"(Disco Check Task) Error: {result}")
+            client_disconnected_event.set()
+            if not result_future.done():
+                result_future.set_exception(
+                    server_error(req_id, f"Internal disconnect checker error: {result}")
+                )
+            return True
 
-                await asyncio.sleep(0.3)
-            except asyncio.CancelledError:
-                # Task cancelled, exit gracefully
-                break
-            except Exception as e:
-                logger.error(f"(Disco Check Task) Error: {e}")
-                client_disconnected_event.set()
-                if not result_future.done():
-                    result_future.set_exception(
-                        HTTPException(
-                            status_code=500,
-                            detail=f"[{req_id}] Internal disconnect checker error: {e}",
-                        )
-                    )
-                break
+        if result:
+            disconnect_count = 0  # Reset counter on successful connection
+            return False
 
-    disconnect_check_task = asyncio.create_task(check_disconnect_periodically())
+        disconnect_count += 1
+        if disconnect_count < disconnect_threshold:
+            logger.debug(
+                f"[{req_id}] Active detection of potential disconnect (round {disconnect_count}/{disconnect_threshold})"
+            )
+            return False
+
+        logger.info(
+            f"[{req_id}] Active detection of client disconnect (consecutive {disconnect_count} times)."
+        )
+        client_disconnected_event.set()
+        if not result_future.done():
+            result_future.set_exception(client_disconnected(req_id, "processing"))
+        return True
+
+    # Cancelling this handle stops monitoring, like cancelling a task would
+    disconnect_check_task = _connection_watcher.register(req_id, http_request, on_poll)
 
     def check_client_disconnected(stage: str = "") -> bool:
         if client_disconnected_event.is_set():
@@ -194,3 +248,32 @@ async def setup_disconnect_monitoring(
         return False
 
     return client_disconnected_event, disconnect_check_task, check_client_disconnected
+
+
+async def watch_queued_disconnect(item: Dict[str, Any], logger: Any) -> None:
+    """
+    Waits on the request's ASGI receive channel while it sits in the queue.
+    Marks the item cancelled and fails its future on http.disconnect, so the
+    worker's queue sweep does not have to poll it.
+    """
+    req_id = item.get("req_id", "unknown")
+    receive = item["http_request"].receive
+    try:
+        while not item.get("cancelled", False):
+            message = await receive()
+            message_type = message.get("type")
+            if message_type == "http.disconnect":
+                logger.info(f"[{req_id}] Client disconnected while queued.")
+                item["cancelled"] = True
+                result_future = item.get("result_future")
+                if result_future and not result_future.done():
+                    result_future.set_exception(
+                        client_disconnected(req_id, "queue wait")
+                    )
+                return
+            if message_type != "http.request":
+                return
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.debug(f"[{req_id}] Queued disconnect watcher stopped: {e}")
@@ -1,7 +1,18 @@
 import logging
-from asyncio import Future, Lock
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypedDict, Union
+from asyncio import Event, Future, Lock, Task
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    TypedDict,
+    Union,
+)
 
+from playwright.async_api import Locator
 from playwright.async_api import Page as AsyncPage
 
 if TYPE_CHECKING:
@@ -24,6 +35,7 @@ class QueueItem(TypedDict):
     result_future: "Future[Union[JSONResponse, StreamingResponse]]"
     enqueue_time: float
     cancelled: bool
+    disconnect_watcher: "Task[None]"
 
 
 class RequestContext(TypedDict):
@@ -52,3 +64,17 @@ class RequestContext(TypedDict):
     requested_model: Optional[str]  # Value can be None if not specified
     model_id_to_use: Optional[str]  # Value set during model analysis
     needs_model_switching: bool
+
+
+class ProcessResult(NamedTuple):
+    """Outcome of ``_process_request_refactored`` handed back to the queue worker.
+
+    All fields are None when processing ended before reaching the page (e.g. the
+    client disconnected up front). ``completion_event`` is an Event for streaming
+    responses and the response dict for non-streaming replies. The streaming
+    response handlers return one directly; non-streaming ones return the dict.
+    """
+
+    completion_event: Optional[Union[Event, Dict[str, Any]]]
+    submit_btn_loc: Optional[Locator]
+    client_disco_checker: Optional[Callable[[str], bool]]
@@ -2,50 +2,41 @@
 FastAPI Dependencies Module
 """
 
+import asyncio
 import logging
-from asyncio import Event, Lock, Queue
-from typing import Any, Dict, List, Set
+import time
+from asyncio import Event, Lock
+from typing import Any, Dict, List, Set, cast
+
+from fastapi import HTTPException
 
 from api_utils.context_types import QueueItem
+from api_utils.fast_queue import FastQueue
+from api_utils.server_state import state
+from config.global_state import GlobalState
 
 
 def get_logger() -> logging.Logger:
-    from api_utils.server_state import state
-
     return state.logger
 
 
 def get_log_ws_manager():
-    from api_utils.server_state import state
-
     return state.log_ws_manager
 
 
-def get_request_queue() -> "Queue[QueueItem]":
-    from typing import cast
-
-    from api_utils.server_state import state
-
-    return cast("Queue[QueueItem]", state.request_queue)
+def get_request_queue() -> "FastQueue[QueueItem]":
+    return cast("FastQueue[QueueItem]", state.request_queue)
 
 
 def get_processing_lock() -> Lock:
-    from typing import cast
-
-    from api_utils.server_state import state
-
     return cast(Lock, state.processing_lock)
 
 
 def get_worker_task():
-    from api_utils.server_state import state
-
     return state.worker_task
 
 
 def get_server_state() -> Dict[str, Any]:
-    from api_utils.server_state import state
-
     # Return immutable snapshot to prevent downstream modifications to global references
     return dict(
         is_initializing=state.is_initializing,
@@ -56,36 +47,22 @@ def get_server_state() -> Dict[str, Any]:
 
 
 def get_page_instance():
-    from api_utils.server_state import state
-
     return state.page_instance
 
 
 def get_model_list_fetch_event() -> Event:
-    from typing import cast
-
-    from api_utils.server_state import state
-
     return cast(Event, state.model_list_fetch_event)
 
 
 def get_parsed_model_list() -> List[Dict[str, Any]]:
-    from api_utils.server_state import state
-
     return state.parsed_model_list
 
 
 def get_excluded_model_ids() -> Set[str]:
-    from api_utils.server_state import state
-
     return state.excluded_model_ids
 
 
 def get_current_ai_studio_model_id() -> str:
-    from typing import cast
-
-    from api_utils.server_state import state
-
     return cast(str, state.current_ai_studio_model_id)
 
 
@@ -95,13 +72,7 @@ async def ensure_request_lock():
     If Auth Rotation is in progress (Lock is cleared) or Quota is Exceeded (Rotation imminent),
     this will pause the request until the system is ready.
     """
-    import asyncio
-    import time
-
-    from api_utils.server_state import state as server_state
-    from config.global_state import GlobalState
-
-    logger = server_state.logger
+    logger = state.logger
 
     # A request is considered "queued" if it has to wait for the lock.
     is_waiting = (
@@ -126,8 +97,6 @@ async def ensure_request_lock():
                 logger.error(
                     f"🚨 Request parking timeout after {max_total_wait}s. Quota={GlobalState.IS_QUOTA_EXCEEDED}, LockSet={GlobalState.AUTH_ROTATION_LOCK.is_set()}"
                 )
-                from fastapi import HTTPException
-
                 raise HTTPException(
                     status_code=530,  # Custom code for state resolution timeout
                     detail="System state resolution timeout - please try again later",
@@ -143,8 +112,6 @@ async def ensure_request_lock():
                     logger.warning(
                         "🚨 Lock wait timeout after 30s. Service may be unavailable."
                     )
-                    from fastapi import HTTPException
-
                     raise HTTPException(
                         status_code=503,
                         detail="Service temporarily unavailable - timeout waiting for system lock",
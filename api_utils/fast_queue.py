@@ -0,0 +1,61 @@
+"""
+Fast request queue.
+
+A minimal replacement for ``asyncio.Queue`` tuned for the request path, where
+the chat endpoint produces items and a single queue worker consumes them.
+``asyncio.Queue`` allocates a waiter ``Future`` for every blocked ``get``/``put``;
+this queue keeps items in a plain ``deque`` and wakes the consumer through a
+single reusable ``asyncio.Event``.
+
+Only the subset of the ``asyncio.Queue`` API used by this project is provided.
+The underlying deque is exposed as ``_queue`` (same as ``asyncio.Queue``) so
+callers can inspect queued items in place.
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class FastQueue(Generic[T]):
+    """Unbounded FIFO queue backed by a deque and a wake-up event."""
+
+    def __init__(self) -> None:
+        self._queue: Deque[T] = deque()
+        self._not_empty = asyncio.Event()
+        self._unfinished_tasks = 0
+
+    def qsize(self) -> int:
+        return len(self._queue)
+
+    def empty(self) -> bool:
+        return not self._queue
+
+    def put_nowait(self, item: T) -> None:
+        self._queue.append(item)
+        self._unfinished_tasks += 1
+        self._not_empty.set()
+
+    async def put(self, item: T) -> None:
+        self.put_nowait(item)
+
+    def get_nowait(self) -> T:
+        if not self._queue:
+            raise asyncio.QueueEmpty
+        return self._queue.popleft()
+
+    async def get(self) -> T:
+        while not self._queue:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._queue.popleft()
+
+    def task_done(self) -> None:
+        if self._unfinished_tasks <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished_tasks -= 1
+
+    def __repr__(self) -> str:
+        return f"<FastQueue maxsize=0 qsize={len(self._queue)}>"
@@ -4,49 +4,178 @@ Handles tasks in the request queue
 """
 
 import asyncio
-import time
+import itertools
+import logging
+import random
 from asyncio import Event, Future, Task
-from typing import Callable, Optional, cast
+from typing import Any, Awaitable, Callable, Dict, Optional, Union, cast
 
-from fastapi import HTTPException, Request
+from fastapi import Request
 from playwright.async_api import Locator
 from playwright.async_api import expect as expect_async
 
 from api_utils.context_types import QueueItem
-from models import QuotaExceededError
+from api_utils.server_state import state
+from browser_utils.auth_rotation import perform_auth_rotation
+from browser_utils.cookie_refresh import maybe_refresh_on_request
+from browser_utils.page_controller import PageController
+from config import RESPONSE_COMPLETION_TIMEOUT
+from config.global_state import GlobalState
+from models import ClientDisconnectedError, QuotaExceededError
 
 from .client_connection import check_client_connection
+from .error_utils import client_cancelled, client_disconnected, server_error
+from .fast_queue import FastQueue
+from .request_processor import (
+    _process_request_refactored,
+    _test_client_connection,
+    save_error_snapshot,
+)
+from .utils_ext.stream import clear_stream_queue
+
+# Upper bound on queued items inspected per disconnect sweep
+_DISCONNECT_SWEEP_LIMIT = 10
+# Seconds between disconnect sweeps of the waiting queue
+_DISCONNECT_SWEEP_INTERVAL = 5.0
+# Spacing enforced between consecutive streaming requests
+_STREAM_COOLDOWN_SECONDS = 1.0
+_MIN_STREAM_DELAY_SECONDS = 0.5
+# Exponential backoff bounds (seconds) after worker-level failures
+_INITIAL_ERROR_BACKOFF = 1.0
+_MAX_ERROR_BACKOFF = 30.0
+
+
+def _fail_pending(
+    future: Optional[Future], exc_factory: Callable[[], BaseException]
+) -> None:
+    """Fail ``future`` unless it is missing or already resolved.
+
+    The exception is only built when it will actually be set, so callers on
+    the disconnect paths pay nothing when a monitor got there first.
+    """
+    if future is not None and not future.done():
+        future.set_exception(exc_factory())
+
+
+def _is_watched(item: QueueItem) -> bool:
+    watcher = item.get("disconnect_watcher")
+    return watcher is not None and not watcher.done()
+
+
+async def _check_queue_disconnects(
+    request_queue: "FastQueue[QueueItem]", logger: logging.Logger
+) -> None:
+    """Mark queued requests whose clients have gone away as cancelled.
+
+    Items are inspected in place through the queue's underlying deque, so the
+    queue order is untouched and no get/put round trips are needed. A lone
+    queued item is skipped: it is next in line and the worker checks its
+    connection when dequeuing it anyway. Items with a live disconnect watcher
+    (see ``watch_queued_disconnect``) are skipped too; the ASGI disconnect
+    message marks them without polling.
+    """
+    if request_queue.qsize() <= 1:
+        return
+
+    # Snapshot first: the deque may be appended to while we await below.
+    pending = [
+        item
+        for item in itertools.islice(request_queue._queue, _DISCONNECT_SWEEP_LIMIT)
+        if not item.get("cancelled", False)
+        and item.get("http_request")
+        and not _is_watched(item)
+    ]
+    if not pending or GlobalState.IS_SHUTTING_DOWN.is_set():
+        return
+
+    # Probe all clients concurrently rather than one receive() round trip each
+    results = await asyncio.gather(
+        *(
+            check_client_connection(item.get("req_id", "unknown"), item["http_request"])
+            for item in pending
+        ),
+        return_exceptions=True,
+    )
+    for item, is_connected in zip(pending, results):
+        item_req_id = item.get("req_id", "unknown")
+        if isinstance(is_connected, BaseException):
+            logger.error(
+                "[%s] (Worker Queue Check) Error: %s", item_req_id, is_connected
+            )
+            continue
+        if is_connected:
+            continue
+
+        logger.info(
+            "[%s] (Worker Queue Check) Client disconnect detected.", item_req_id
+        )
+        item["cancelled"] = True
+        _fail_pending(
+            item.get("result_future"),
+            lambda: client_disconnected(
+                item_req_id, "Client disconnected while queued."
+            ),
+        )
+
+
+async def _periodic_disconnect_check(
+    request_queue: "FastQueue[QueueItem]",
+    logger: logging.Logger,
+    interval: float = _DISCONNECT_SWEEP_INTERVAL,
+) -> None:
+    """Sweep the waiting queue for disconnected clients every ``interval`` seconds.
+
+    Runs alongside the worker so that dequeuing can block on the queue directly
+    instead of waking up on a timeout just to perform the sweep.
+    """
+    while not GlobalState.IS_SHUTTING_DOWN.is_set():
+        await asyncio.sleep(interval)
+        if request_queue.qsize() > 1:
+            try:
+                await _check_queue_disconnects(request_queue, logger)
+            except Exception as e:
+                logger.error("(Worker Queue Check) Sweep failed: %s", e)
+
+
+async def _wait_for_completion(
+    waiter: Awaitable[Any], monitor_task: "Task[Any]", timeout: float
+) -> None:
+    """Wait for ``waiter`` while the disconnect monitor runs alongside it.
+
+    Both are awaited together with ``FIRST_COMPLETED`` so a single wake-up
+    covers either side finishing. The monitors resolve the waiter before they
+    return; if the monitor instead dies (e.g. it raised), waiting continues on
+    the waiter alone until the original deadline.
+
+    Raises:
+        asyncio.TimeoutError: If ``waiter`` has not finished within ``timeout``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    wait_task = asyncio.ensure_future(waiter)
+    try:
+        done, _ = await asyncio.wait(
+            {wait_task, monitor_task},
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if wait_task not in done and monitor_task in done:
+            done, _ = await asyncio.wait(
+                {wait_task}, timeout=max(0.0, deadline - loop.time())
+            )
+        if wait_task not in done:
+            raise asyncio.TimeoutError
+        wait_task.result()
+    finally:
+        if not wait_task.done():
+            wait_task.cancel()
 
 
 async def queue_worker() -> None:
     """Queue worker, processes tasks in the request queue"""
-    # Delayed imports to avoid circularity
-    from api_utils.server_state import state
-    from config import RESPONSE_COMPLETION_TIMEOUT
-
     logger = state.logger
     request_queue = state.request_queue
     processing_lock = state.processing_lock
-    model_switching_lock = state.model_switching_lock
-    params_cache_lock = state.params_cache_lock
-    from browser_utils.auth_rotation import perform_auth_rotation
-    from browser_utils.page_controller import PageController
-    from config.global_state import GlobalState
-
-    from .error_utils import (
-        client_cancelled,
-        client_disconnected,
-        server_error,
-    )
-
-    # Internal imports for queue worker logic
-    from .request_processor import (
-        ClientDisconnectedError,
-        _process_request_refactored,
-        _test_client_connection,
-        save_error_snapshot,
-    )
-    from .utils_ext.stream import clear_stream_queue
 
     logger.info("--- Queue Worker Started ---")
 
@@ -59,28 +188,37 @@ async def queue_worker() -> None:
         logger.critical("FATAL: processing_lock is None! Initialization failed.")
         raise RuntimeError("processing_lock not initialized")
 
-    if model_switching_lock is None:
-        logger.critical("FATAL: model_switching_lock is None! Initialization failed.")
-        raise RuntimeError("model_switching_lock not initialized")
-
-    if params_cache_lock is None:
-        logger.critical("FATAL: params_cache_lock is None! Initialization failed.")
-        raise RuntimeError("params_cache_lock not initialized")
-
     logger.debug(
-        f"Queue worker initialized with queue={request_queue}, lock={processing_lock}"
+        "Queue worker initialized with queue=%s, lock=%s",
+        request_queue,
+        processing_lock,
     )
 
+    # Bind hot-path methods once; they are looked up on every request otherwise
+    log_info = logger.info
+    task_done = request_queue.task_done
+    # Time streaming delays on the same clock asyncio.sleep uses
+    loop = asyncio.get_running_loop()
+
     was_last_request_streaming = False
-    last_request_completion_time = 0.0
-    shutdown_check_interval = 0.1
+    # Earliest loop time a streaming request may start after a previous one
+    next_stream_start_time = 0.0
+    error_backoff = _INITIAL_ERROR_BACKOFF
+
+    disconnect_sweep_task = asyncio.create_task(
+        _periodic_disconnect_check(request_queue, logger)
+    )
+    # Stop the sweep however the worker exits (shutdown, cancellation or crash)
+    worker_task = asyncio.current_task()
+    if worker_task is not None:
+        worker_task.add_done_callback(lambda _: disconnect_sweep_task.cancel())
 
     while True:
         request_item: Optional[QueueItem] = None
         result_future: Optional[Future] = None
         http_request: Optional[Request] = None
         req_id: str = "UNKNOWN"
-        completion_event: Optional[Event] = None
+        completion_event: Optional[Union[Event, Dict[str, Any]]] = None
         submit_btn_loc: Optional[Locator] = None
         client_disco_checker: Optional[Callable[[str], bool]] = None
         disconnect_monitor_task: Optional[Task] = None
@@ -89,59 +227,9 @@ async def queue_worker() -> None:
         try:
             # [SHUTDOWN] Check shutdown signal
             if GlobalState.IS_SHUTTING_DOWN.is_set():
-                logger.info("🚨 Queue Worker detected shutdown signal, exiting.")
+                log_info("🚨 Queue Worker detected shutdown signal, exiting.")
                 break
 
-            # Clean up disconnected requests in queue
-            queue_size = request_queue.qsize()
-            if queue_size > 0:
-                checked_count = 0
-                items_to_requeue = []
-                processed_ids = set()
-
-                while checked_count < queue_size and checked_count < 10:
-                    if GlobalState.IS_SHUTTING_DOWN.is_set():
-                        break
-                    try:
-                        item = request_queue.get_nowait()
-                        item_req_id = item.get("req_id", "unknown")
-                        if item_req_id in processed_ids:
-                            items_to_requeue.append(item)
-                            continue
-                        processed_ids.add(item_req_id)
-
-                        if not item.get("cancelled", False):
-                            item_http_req = item.get("http_request")
-                            if item_http_req:
-                                try:
-                                    if not await check_client_connection(
-                                        item_req_id, item_http_req
-                                    ):
-                                        logger.info(
-                                            f"[{item_req_id}] (Worker Queue Check) Client disconnect detected."
-                                        )
-                                        item["cancelled"] = True
-                                        item_fut = item.get("result_future")
-                                        if item_fut and not item_fut.done():
-                                            item_fut.set_exception(
-                                                client_disconnected(
-                                                    item_req_id,
-                                                    "Client disconnected while queued.",
-                                                )
-                                            )
-                                except Exception as e:
-                                    logger.error(
-                                        f"[{item_req_id}] (Worker Queue Check) Error: {e}"
-                                    )
-
-                        items_to_requeue.append(item)
-                        checked_count += 1
-                    except asyncio.QueueEmpty:
-                        break
-
-                for item in items_to_requeue:
-                    await request_queue.put(item)
-
             # [AUTH-ROTATION] Handle quota or rotation needs
             if GlobalState.IS_QUOTA_EXCEEDED or GlobalState.NEEDS_ROTATION:
                 reason = (
@@ -149,7 +237,7 @@ async def queue_worker() -> None:
                     if GlobalState.IS_QUOTA_EXCEEDED
                     else "Graceful Rotation Pending"
                 )
-                logger.info(f"⏸️ Pausing worker for Auth Rotation ({reason})...")
+                log_info("⏸️ Pausing worker for Auth Rotation (%s)...", reason)
                 GlobalState.start_recovery()
                 try:
                     current_model_id = state.current_ai_studio_model_id
@@ -158,10 +246,11 @@ async def queue_worker() -> None:
                     )
                     if rotation_success:
                         GlobalState.NEEDS_ROTATION = False
-                        logger.info("✅ Auth rotation completed successfully.")
+                        log_info("✅ Auth rotation completed successfully.")
                     else:
                         logger.error("❌ Auth rotation failed.")
-                        await asyncio.sleep(1)
+                        await asyncio.sleep(error_backoff + random.random() * 0.1)
+                        error_backoff = min(error_backoff * 2, _MAX_ERROR_BACKOFF)
                 finally:
                     GlobalState.finish_recovery()
                 if not rotation_success:
@@ -170,21 +259,13 @@ async def queue_worker() -> None:
             if GlobalState.IS_SHUTTING_DOWN.is_set():
                 break
 
-            # Get next request
-            try:
-                current_timeout = (
-                    shutdown_check_interval
-                    if GlobalState.IS_SHUTTING_DOWN.is_set()
-                    else 5.0
-                )
-                request_item = await asyncio.wait_for(
-                    request_queue.get(), timeout=current_timeout
-                )
-            except asyncio.TimeoutError:
-                continue
+            # Get next request (disconnect sweeps run on their own task)
+            request_item = await request_queue.get()
 
-            if request_item is None:
-                continue
+            # The worker's own connection checks take over the receive channel
+            watcher = request_item.get("disconnect_watcher")
+            if watcher is not None:
+                watcher.cancel()
 
             req_id = request_item["req_id"]
             request_data = request_item["request_data"]
@@ -192,69 +273,55 @@ async def queue_worker() -> None:
             result_future = request_item["result_future"]
 
             GlobalState.CURRENT_STREAM_REQ_ID = req_id
-            logger.info(f"[{req_id}] (Worker) Processing request dequeued.")
+            log_info("[%s] (Worker) Processing request dequeued.", req_id)
 
             if GlobalState.IS_QUOTA_EXCEEDED:
-                logger.warning(f"[{req_id}] (Worker) ⛔ Quota exceeded, re-queueing.")
+                logger.warning("[%s] (Worker) ⛔ Quota exceeded, re-queueing.", req_id)
                 await request_queue.put(request_item)
-                request_queue.task_done()
                 continue
 
             if request_item.get("cancelled", False):
-                if result_future and not result_future.done():
-                    result_future.set_exception(
-                        client_cancelled(req_id, "Request cancelled by user")
-                    )
-                request_queue.task_done()
+                _fail_pending(
+                    result_future,
+                    lambda: client_cancelled(req_id, "Request cancelled by user"),
+                )
                 continue
 
             is_streaming_request = request_data.stream
 
-            # Initial connection check
+            # Single pre-lock connection check. _process_request_refactored checks
+            # again on entry and the disconnect monitors cover the rest.
             if not await _test_client_connection(req_id, http_request):
-                if result_future and not result_future.done():
-                    result_future.set_exception(
-                        HTTPException(status_code=499, detail="Client disconnected")
-                    )
-                request_queue.task_done()
-                continue
-
-            # Streaming delay
-            current_time = time.time()
-            if (
-                was_last_request_streaming
-                and is_streaming_request
-                and (current_time - last_request_completion_time < 1.0)
-            ):
-                await asyncio.sleep(
-                    max(0.5, 1.0 - (current_time - last_request_completion_time))
+                _fail_pending(
+                    result_future,
+                    lambda: client_disconnected(req_id, "queue wait"),
                 )
+                continue
 
             # Wait for lock
             async with processing_lock:
-                logger.info(f"[{req_id}] (Worker) Lock acquired.")
-
-                if not await _test_client_connection(req_id, http_request):
-                    if result_future and not result_future.done():
-                        result_future.set_exception(
-                            HTTPException(status_code=499, detail="Client disconnected")
+                log_info("[%s] (Worker) Lock acquired.", req_id)
+
+                # Streaming delay (only between back-to-back streaming requests)
+                if is_streaming_request and was_last_request_streaming:
+                    stream_delay = next_stream_start_time - loop.time()
+                    if stream_delay > 0:
+                        await asyncio.sleep(
+                            max(_MIN_STREAM_DELAY_SECONDS, stream_delay)
                         )
-                elif result_future and result_future.done():
-                    logger.info(f"[{req_id}] (Worker) Future already done.")
+
+                if result_future and result_future.done():
+                    log_info("[%s] (Worker) Future already done.", req_id)
                 else:
                     try:
-                        returned_value = await _process_request_refactored(
+                        (
+                            completion_event,
+                            submit_btn_loc,
+                            client_disco_checker,
+                        ) = await _process_request_refactored(
                             req_id, request_data, http_request, result_future
                         )
 
-                        if (
-                            isinstance(returned_value, tuple)
-                            and len(returned_value) == 3
-                        ):
-                            completion_event, submit_btn_loc, client_disco_checker = (
-                                returned_value
-                            )
-
                         if completion_event:
                             if isinstance(completion_event, dict):
                                 if (
@@ -301,8 +368,9 @@ async def queue_worker() -> None:
                                 disconnect_monitor_task = asyncio.create_task(
                                     enhanced_disconnect_monitor_fn()
                                 )
-                                await asyncio.wait_for(
+                                await _wait_for_completion(
                                     comp_ev.wait(),
+                                    disconnect_monitor_task,
                                     timeout=RESPONSE_COMPLETION_TIMEOUT / 1000 + 60,
                                 )
                         else:
@@ -320,11 +388,11 @@ async def queue_worker() -> None:
                                         req_id, http_request
                                     ):
                                         client_disconnected_early = True
-                                        res_fut.set_exception(
-                                            HTTPException(
-                                                status_code=499,
-                                                detail="Client disconnected",
-                                            )
+                                        _fail_pending(
+                                            res_fut,
+                                            lambda: client_disconnected(
+                                                req_id, "non-streaming response"
+                                            ),
                                         )
                                         break
                                     await asyncio.sleep(0.3)
@@ -332,8 +400,9 @@ async def queue_worker() -> None:
                             disconnect_monitor_task = asyncio.create_task(
                                 non_streaming_monitor_fn()
                             )
-                            await asyncio.wait_for(
+                            await _wait_for_completion(
                                 asyncio.shield(res_fut),
+                                disconnect_monitor_task,
                                 timeout=RESPONSE_COMPLETION_TIMEOUT / 1000 + 60,
                             )
 
@@ -367,11 +436,11 @@ async def queue_worker() -> None:
                     except QuotaExceededError:
                         raise
                     except Exception as e:
-                        logger.error(f"[{req_id}] (Worker) Error: {e}")
-                        if result_future and not result_future.done():
-                            result_future.set_exception(
-                                server_error(req_id, f"Error: {e}")
-                            )
+                        logger.error("[%s] (Worker) Error: %s", req_id, e)
+                        _fail_pending(
+                            result_future,
+                            lambda err=e: server_error(req_id, f"Error: {err}"),
+                        )
                     finally:
                         if (
                             disconnect_monitor_task
@@ -400,14 +469,12 @@ async def queue_worker() -> None:
                 # [COOKIE-REFRESH] Save cookies after successful requests
                 if not client_disconnected_early and not GlobalState.IS_QUOTA_EXCEEDED:
                     try:
-                        from browser_utils.cookie_refresh import (
-                            maybe_refresh_on_request,
-                        )
-
                         await maybe_refresh_on_request()
                     except Exception as cookie_err:
                         logger.debug(
-                            f"[{req_id}] Cookie refresh error (non-critical): {cookie_err}"
+                            "[%s] Cookie refresh error (non-critical): %s",
+                            req_id,
+                            cookie_err,
                         )
 
                 if (
@@ -435,10 +502,12 @@ async def queue_worker() -> None:
                                 except Exception:
                                     pass
             except Exception as e:
-                logger.error(f"[{req_id}] Cleanup error: {e}")
+                logger.error("[%s] Cleanup error: %s", req_id, e)
 
             was_last_request_streaming = is_streaming_request
-            last_request_completion_time = time.time()
+            if is_streaming_request:
+                next_stream_start_time = loop.time() + _STREAM_COOLDOWN_SECONDS
+            error_backoff = _INITIAL_ERROR_BACKOFF
 
         except asyncio.CancelledError:
             if result_future and not result_future.done():
@@ -448,20 +517,27 @@ async def queue_worker() -> None:
             try:
                 if await _test_client_connection(req_id, http_request):
                     request_queue.put_nowait(request_item)
-                elif result_future and not result_future.done():
-                    result_future.set_exception(
-                        HTTPException(
-                            status_code=499, detail="Disconnected during quota error"
-                        )
+                else:
+                    _fail_pending(
+                        result_future,
+                        lambda: client_disconnected(req_id, "quota error"),
                     )
             except Exception:
                 pass
         except Exception as e:
-            logger.error(f"[{req_id}] Unexpected error: {e}", exc_info=True)
-            if result_future and not result_future.done():
-                result_future.set_exception(server_error(req_id, f"Error: {e}"))
+            logger.error("[%s] Unexpected error: %s", req_id, e, exc_info=True)
+            _fail_pending(
+                result_future, lambda err=e: server_error(req_id, f"Error: {err}")
+            )
+            if request_item is None:
+                # Failed before dequeuing: back off so a persistent fault does
+                # not spin the worker. A request's own failure consumed its
+                # item, so the next request starts right away.
+                await asyncio.sleep(error_backoff + random.random() * 0.1)
+                error_backoff = min(error_backoff * 2, _MAX_ERROR_BACKOFF)
         finally:
+            # Every dequeued item is marked done exactly once, here
             if request_item:
-                request_queue.task_done()
+                task_done()
 
-    logger.info("--- Queue Worker Stopped ---")
+    log_info("--- Queue Worker Stopped ---")
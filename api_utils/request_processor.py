@@ -4,14 +4,13 @@ Contains core request processing logic
 """
 
 import asyncio
-import json
 import os
 import shutil
 from asyncio import Event, Future
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from playwright.async_api import (
     Error as PlaywrightAsyncError,
 )
@@ -26,6 +25,7 @@ from playwright.async_api import (
 from browser_utils import (
     save_error_snapshot,
 )
+from browser_utils.auth_rotation import perform_auth_rotation
 from browser_utils.page_controller import PageController
 
 # --- Configuration Module Imports ---
@@ -57,7 +57,7 @@ from .client_connection import (
 )
 from .common_utils import random_id as _random_id
 from .context_init import initialize_request_context as _init_request_context
-from .context_types import RequestContext
+from .context_types import ProcessResult, RequestContext
 from .error_utils import (
     bad_request,
     client_disconnected,
@@ -80,6 +80,8 @@ from .response_generators import (
     resilient_stream_generator,
 )
 from .response_payloads import build_chat_completion_response_json
+from .server_state import state
+from .tools_registry import register_runtime_tools
 
 # --- api_utils Module Imports ---
 from .utils import (
@@ -91,13 +93,35 @@ from .utils_ext.function_calling_orchestrator import (
     FunctionCallingState,
     get_function_calling_orchestrator,
 )
-from .utils_ext.stream import use_stream_response
+from .utils_ext.json_codec import dumps as dumps_json
+from .utils_ext.json_codec import dumps_bytes as dumps_json_bytes
+from .utils_ext.stream import clear_stream_queue, use_stream_response
 from .utils_ext.tokens import calculate_usage_stats
 from .utils_ext.usage_tracker import increment_profile_usage
 from .utils_ext.validation import validate_chat_request
 
 _initialize_request_context = _init_request_context
 
+# (page, locator) for the submit button; reused while the page stays the same
+_submit_button_locator_cache: Optional[Tuple[AsyncPage, Locator]] = None
+
+
+def _get_submit_button_locator(page: AsyncPage) -> Locator:
+    """Return the submit button locator for page, reusing it across requests"""
+    global _submit_button_locator_cache
+    cached = _submit_button_locator_cache
+    if cached is not None and cached[0] is page:
+        return cached[1]
+    locator = page.locator(SUBMIT_BUTTON_SELECTOR)
+    _submit_button_locator_cache = (page, locator)
+    return locator
+
+
+def _stream_proxy_enabled() -> bool:
+    """Whether responses come from the auxiliary stream proxy (STREAM_PORT != 0)"""
+    # Read at call time: launchers set STREAM_PORT after importing this module
+    return get_environment_variable("STREAM_PORT") != "0"
+
 
 # Wrapper function for backward compatibility
 async def _test_client_connection(req_id: str, http_request) -> bool:
@@ -105,6 +129,15 @@ async def _test_client_connection(req_id: str, http_request) -> bool:
     return await _check_client_connection(req_id, http_request)
 
 
+async def _clear_stream_queue_logged() -> None:
+    try:
+        await clear_stream_queue()
+    except asyncio.CancelledError:
+        raise
+    except Exception as clear_err:
+        state.logger.warning(f"[Stream] Error clearing queue: {clear_err}")
+
+
 async def _analyze_model_requirements(
     req_id: str, context: RequestContext, request: ChatCompletionRequest
 ) -> RequestContext:
@@ -140,8 +173,6 @@ async def _handle_model_switch_failure(
     req_id: str, page: AsyncPage, model_id_to_use: str, model_before_switch: str, logger
 ) -> None:
     """Handle model switch failure"""
-    from api_utils.server_state import state
-
     logger.warning(f"[{req_id}] Failed to switch model to {model_id_to_use}.")
     # Attempt to restore global state
     state.current_ai_studio_model_id = model_before_switch
@@ -169,24 +200,24 @@ async def _prepare_and_validate_request(
     except ValueError as e:
         raise bad_request(req_id, f"Invalid request: {e}")
 
+    tools = getattr(request, "tools", None)
+    tool_choice = getattr(request, "tool_choice", None)
+    mcp_endpoint = getattr(request, "mcp_endpoint", None)
+
     prepared_prompt, attachments_list = prepare_combined_prompt(
         request.messages,
         req_id,
-        getattr(request, "tools", None),
-        getattr(request, "tool_choice", None),
+        tools,
+        tool_choice,
         fc_state=fc_state,
     )
     # Active function execution based on tools/tool_choice (supports per-request MCP endpoints)
     try:
         # Inject mcp_endpoint into utils.maybe_execute_tools registration logic
-        if hasattr(request, "mcp_endpoint") and request.mcp_endpoint:
-            from .tools_registry import register_runtime_tools
-
-            register_runtime_tools(
-                getattr(request, "tools", None), request.mcp_endpoint
-            )
+        if mcp_endpoint:
+            register_runtime_tools(tools, mcp_endpoint)
         tool_exec_results = await maybe_execute_tools(
-            request.messages, request.tools, getattr(request, "tool_choice", None)
+            request.messages, tools, tool_choice
         )
     except asyncio.CancelledError:
         raise
@@ -196,19 +227,24 @@ async def _prepare_and_validate_request(
     check_client_disconnected("After Prompt Prep")
     # Inline results at the end of the prompt for submission together
     if tool_exec_results:
+        prompt_parts = [prepared_prompt]
         try:
             for res in tool_exec_results:
                 name = res.get("name")
                 args = res.get("arguments")
                 result_str = res.get("result")
-                prepared_prompt += f"\n---\nTool Execution: {name}\nArguments:\n{args}\nResult:\n{result_str}\n"
+                prompt_parts.append(
+                    f"\n---\nTool Execution: {name}\nArguments:\n{args}\nResult:\n{result_str}\n"
+                )
         except Exception:
             pass
+        prepared_prompt = "".join(prompt_parts)
 
     # Process and validate attachments
     # Acceptance criteria: Only accept data:/file:/absolute paths provided by current request
-    final_attachments = collect_and_validate_attachments(
-        request, req_id, attachments_list
+    # Path checks and data: URL decoding/writes are blocking; run them off the loop
+    final_attachments = await asyncio.to_thread(
+        collect_and_validate_attachments, request, req_id, attachments_list
     )
 
     return prepared_prompt, final_attachments, tool_exec_results
@@ -225,10 +261,12 @@ async def _handle_response_processing(
     prompt_length: int,
     timeout: float,
     silence_threshold: float = 60.0,
-) -> Optional[Tuple[Event, Locator, Callable]]:
+    page_controller: Optional[PageController] = None,
+    use_stream: Optional[bool] = None,
+) -> Union[ProcessResult, Dict[str, Any]]:
     """Handle response generation"""
-    stream_port = get_environment_variable("STREAM_PORT")
-    use_stream = stream_port != "0"
+    if use_stream is None:
+        use_stream = _stream_proxy_enabled()
 
     if use_stream:
         return await _handle_auxiliary_stream_response(
@@ -252,9 +290,76 @@ async def _handle_response_processing(
             check_client_disconnected,
             prompt_length,
             timeout=timeout,
+            page_controller=page_controller,
         )
 
 
+def _consolidate_content(reasoning: Optional[str], body: Optional[str]) -> str:
+    """Join reasoning and body text the way non-streaming responses report it."""
+    parts = [text.strip() for text in (reasoning, body) if text and text.strip()]
+    return "\n\n".join(parts)
+
+
+async def _build_and_set_json_response(
+    req_id: str,
+    request: ChatCompletionRequest,
+    result_future: Future,
+    message_payload: Dict[str, Any],
+    finish_reason: str,
+    consolidated_content: str,
+    model_id: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Account usage, build the chat.completion payload and resolve the request
+    future with it. Shared by both non-streaming response paths.
+    """
+    logger = state.logger
+
+    usage_stats = calculate_usage_stats(request.messages, consolidated_content, "")
+    logger.info(f"[{req_id}] Token usage stats: {usage_stats}")
+
+    total_tokens = usage_stats.get("total_tokens", 0)
+    GlobalState.increment_token_count(total_tokens)
+
+    if hasattr(state, "current_auth_profile_path") and state.current_auth_profile_path:
+        await increment_profile_usage(state.current_auth_profile_path, total_tokens)
+
+    seed = getattr(request, "seed", None)
+    response_format = getattr(request, "response_format", None)
+    response_payload = build_chat_completion_response_json(
+        req_id,
+        model_id or MODEL_NAME,
+        message_payload,
+        finish_reason,
+        usage_stats,
+        system_fingerprint="camoufox-proxy",
+        seed=seed if seed is not None else 0,
+        response_format=response_format if isinstance(response_format, dict) else {},
+    )
+
+    if not result_future.done():
+        response_body = dumps_json_bytes(response_payload)
+        if len(response_body) > 10000:  # 10KB threshold
+            logger.info(
+                f"[{req_id}] Large response detected ({len(response_body)} bytes), using efficient chunking"
+            )
+
+            async def generate_json_chunks():
+                chunk_size = 8192  # 8KB chunks
+                for i in range(0, len(response_body), chunk_size):
+                    yield response_body[i : i + chunk_size]
+                    await asyncio.sleep(0.01)
+
+            result_future.set_result(
+                StreamingResponse(generate_json_chunks(), media_type="application/json")
+            )
+        else:
+            result_future.set_result(
+                Response(content=response_body, media_type="application/json")
+            )
+    return response_payload
+
+
 async def _handle_auxiliary_stream_response(
     req_id: str,
     request: ChatCompletionRequest,
@@ -264,10 +369,8 @@ async def _handle_auxiliary_stream_response(
     check_client_disconnected: Callable,
     timeout: float,
     silence_threshold: float = 60.0,
-) -> Optional[Tuple[Event, Locator, Callable]]:
+) -> Union[ProcessResult, Dict[str, Any]]:
     """Auxiliary stream response processing path"""
-    from api_utils.server_state import state
-
     logger = state.logger
 
     is_streaming = request.stream
@@ -306,10 +409,8 @@ async def _handle_auxiliary_stream_response(
                 if not completion_event.is_set():
                     completion_event.set()
 
-            return (
-                completion_event,
-                submit_button_locator,
-                check_client_disconnected,
+            return ProcessResult(
+                completion_event, submit_button_locator, check_client_disconnected
             )
 
         except asyncio.CancelledError:
@@ -340,21 +441,10 @@ async def _handle_auxiliary_stream_response(
         ):
             check_client_disconnected(f"Non-streaming aux stream - loop ({req_id}): ")
 
-            if isinstance(raw_data, str):
-                try:
-                    data = json.loads(raw_data)
-                except json.JSONDecodeError:
-                    logger.warning(
-                        f"[{req_id}] Failed to parse non-stream data JSON: {raw_data}"
-                    )
-                    continue
-            elif isinstance(raw_data, dict):
-                data = raw_data
-            else:
-                continue
-
-            if not isinstance(data, dict):
+            # use_stream_response decodes frames as it dequeues them
+            if not isinstance(raw_data, dict):
                 continue
+            data = raw_data
 
             final_data_from_aux_stream = data
             if data.get("done"):
@@ -388,17 +478,7 @@ async def _handle_auxiliary_stream_response(
                 detail=f"[{req_id}] Aux stream completed but no content provided",
             )
 
-        model_name_for_json = current_ai_studio_model_id or MODEL_NAME
-
-        # Consolidate reasoning content with body content
-        consolidated_content = ""
-        if reasoning_content and reasoning_content.strip():
-            consolidated_content += reasoning_content.strip()
-        if content and content.strip():
-            if consolidated_content:
-                consolidated_content += "\n\n"
-            consolidated_content += content.strip()
-
+        consolidated_content = _consolidate_content(reasoning_content, content)
         message_payload = {"role": "assistant", "content": consolidated_content}
         finish_reason_val = "stop"
 
@@ -412,7 +492,7 @@ async def _handle_auxiliary_stream_response(
                         "type": "function",
                         "function": {
                             "name": function_call_data["name"],
-                            "arguments": json.dumps(function_call_data["params"]),
+                            "arguments": dumps_json(function_call_data["params"]),
                         },
                     }
                 )
@@ -420,64 +500,16 @@ async def _handle_auxiliary_stream_response(
             finish_reason_val = "tool_calls"
             message_payload["content"] = None
 
-        usage_stats = calculate_usage_stats(
-            [msg.model_dump() for msg in request.messages],
-            consolidated_content or "",
-            "",
-        )
-
-        total_tokens = usage_stats.get("total_tokens", 0)
-        GlobalState.increment_token_count(total_tokens)
-
-        from api_utils.server_state import state
-
-        if (
-            hasattr(state, "current_auth_profile_path")
-            and state.current_auth_profile_path
-        ):
-            await increment_profile_usage(state.current_auth_profile_path, total_tokens)
-
-        response_payload = build_chat_completion_response_json(
+        return await _build_and_set_json_response(
             req_id,
-            model_name_for_json,
+            request,
+            result_future,
             message_payload,
             finish_reason_val,
-            usage_stats,
-            system_fingerprint="camoufox-proxy",
-            seed=request.seed
-            if hasattr(request, "seed") and request.seed is not None
-            else 0,
-            response_format=(
-                request.response_format
-                if hasattr(request, "response_format")
-                and isinstance(request.response_format, dict)
-                else {}
-            ),
+            consolidated_content,
+            current_ai_studio_model_id,
         )
 
-        if not result_future.done():
-            response_json_str = json.dumps(response_payload, ensure_ascii=False)
-            if len(response_json_str) > 10000:  # 10KB threshold
-                logger.info(
-                    f"[{req_id}] Large response detected ({len(response_json_str)} chars), using efficient chunking"
-                )
-
-                async def generate_json_chunks():
-                    chunk_size = 8192  # 8KB chunks
-                    for i in range(0, len(response_json_str), chunk_size):
-                        chunk = response_json_str[i : i + chunk_size]
-                        yield chunk
-                        await asyncio.sleep(0.01)
-
-                result_future.set_result(
-                    StreamingResponse(
-                        generate_json_chunks(), media_type="application/json"
-                    )
-                )
-            else:
-                result_future.set_result(JSONResponse(content=response_payload))
-        return response_payload
-
 
 async def _handle_playwright_response(
     req_id: str,
@@ -489,10 +521,9 @@ async def _handle_playwright_response(
     check_client_disconnected: Callable,
     prompt_length: int,
     timeout: float,
-) -> Optional[Tuple[Event, Locator, Callable]]:
+    page_controller: Optional[PageController] = None,
+) -> Union[ProcessResult, Dict[str, Any]]:
     """Handle response using Playwright - Enhanced version with integrity verification"""
-    from api_utils.server_state import state
-
     logger = state.logger
 
     is_streaming = request.stream
@@ -529,9 +560,13 @@ async def _handle_playwright_response(
                 StreamingResponse(resilient_gen, media_type="text/event-stream")
             )
 
-        return completion_event, submit_button_locator, check_client_disconnected
+        return ProcessResult(
+            completion_event, submit_button_locator, check_client_disconnected
+        )
     else:
-        page_controller = PageController(page, logger, req_id)
+        # Reuse the caller's controller when it still targets this page
+        if page_controller is None or page_controller.page is not page:
+            page_controller = PageController(page, logger, req_id)
         response_data = await page_controller.get_response_with_integrity_check(
             check_client_disconnected, prompt_length, timeout=timeout
         )
@@ -557,40 +592,10 @@ async def _handle_playwright_response(
                 f"[{req_id}] Successfully retrieved content directly ({len(final_content)} chars)"
             )
 
-        consolidated_content = ""
-        if reasoning_content and reasoning_content.strip():
-            consolidated_content += reasoning_content.strip()
-        if final_content and final_content.strip():
-            if consolidated_content:
-                consolidated_content += "\n\n"
-            consolidated_content += final_content.strip()
-
-        usage_stats = calculate_usage_stats(
-            [msg.model_dump() for msg in request.messages],
-            consolidated_content,
-            "",
-        )
-        logger.info(f"[{req_id}] Token usage stats: {usage_stats}")
-
-        total_tokens = usage_stats.get("total_tokens", 0)
-        GlobalState.increment_token_count(total_tokens)
-
-        from api_utils.server_state import state
-
-        if (
-            hasattr(state, "current_auth_profile_path")
-            and state.current_auth_profile_path
-        ):
-            await increment_profile_usage(state.current_auth_profile_path, total_tokens)
-
-        model_name_for_json = current_ai_studio_model_id or MODEL_NAME
+        consolidated_content = _consolidate_content(reasoning_content, final_content)
 
         # Handle function calls if detected
         if response_data.get("has_function_calls"):
-            from api_utils.utils_ext.function_calling_orchestrator import (
-                get_function_calling_orchestrator,
-            )
-
             orchestrator = get_function_calling_orchestrator()
             message_payload, finish_reason_val = (
                 orchestrator.format_function_calls_for_response(
@@ -601,69 +606,38 @@ async def _handle_playwright_response(
             message_payload = {"role": "assistant", "content": consolidated_content}
             finish_reason_val = "stop"
 
-        response_payload = build_chat_completion_response_json(
+        return await _build_and_set_json_response(
             req_id,
-            model_name_for_json,
+            request,
+            result_future,
             message_payload,
             finish_reason_val,
-            usage_stats,
-            system_fingerprint="camoufox-proxy",
-            seed=request.seed
-            if hasattr(request, "seed") and request.seed is not None
-            else 0,
-            response_format=(
-                request.response_format
-                if hasattr(request, "response_format")
-                and isinstance(request.response_format, dict)
-                else {}
-            ),
+            consolidated_content,
+            current_ai_studio_model_id,
         )
 
-        if not result_future.done():
-            response_json_str = json.dumps(response_payload, ensure_ascii=False)
-            if len(response_json_str) > 10000:
-
-                async def generate_json_chunks():
-                    chunk_size = 8192
-                    for i in range(0, len(response_json_str), chunk_size):
-                        yield response_json_str[i : i + chunk_size]
-                        await asyncio.sleep(0.01)
-
-                result_future.set_result(
-                    StreamingResponse(
-                        generate_json_chunks(), media_type="application/json"
-                    )
-                )
-            else:
-                result_future.set_result(JSONResponse(content=response_payload))
-
-        return response_payload
-
 
 async def _cleanup_request_resources(
     req_id: str,
-    disconnect_check_task: Optional[asyncio.Task],
+    disconnect_check_task: Optional[asyncio.Future],
     completion_event: Optional[Event],
     result_future: Future,
     is_streaming: bool,
 ) -> None:
     """Cleanup request resources"""
-    from api_utils.server_state import state
-
     logger = state.logger
 
+    # This is the connection watcher's registration handle: cancelling it
+    # unregisters the request right away, so there is nothing to await
     if disconnect_check_task and not disconnect_check_task.done():
         disconnect_check_task.cancel()
-        try:
-            await disconnect_check_task
-        except asyncio.CancelledError:
-            pass
 
     # Clean up upload subdirectory
     try:
         req_dir = os.path.join(UPLOAD_FILES_DIR, req_id)
         if os.path.isdir(req_dir):
-            shutil.rmtree(req_dir, ignore_errors=True)
+            # rmtree blocks on file I/O; keep it off the event loop
+            await asyncio.to_thread(shutil.rmtree, req_dir, ignore_errors=True)
             logger.debug(f"Cleaned up request upload directory: {req_dir}")
     except asyncio.CancelledError:
         raise
@@ -687,10 +661,8 @@ async def process_request_with_retry(
     request: ChatCompletionRequest,
     http_request: Request,
     result_future: Future,
-) -> Optional[Tuple[Event, Locator, Callable[[str], bool]]]:
+) -> ProcessResult:
     """Wrapper around _process_request_refactored with retry mechanism for quota"""
-    from api_utils.server_state import state
-
     logger = state.logger
 
     max_retries = 3
@@ -717,7 +689,7 @@ async def process_request(
     request: ChatCompletionRequest,
     http_request: Request,
     result_future: Future,
-) -> Optional[Tuple[Event, Locator, Callable[[str], bool]]]:
+) -> ProcessResult:
     """Main entry point for request processing"""
     return await process_request_with_retry(
         req_id, request, http_request, result_future
@@ -729,10 +701,8 @@ async def _process_request_refactored(
     request: ChatCompletionRequest,
     http_request: Request,
     result_future: Future,
-) -> Optional[Tuple[Event, Locator, Callable[[str], bool]]]:
+) -> ProcessResult:
     """Core Request Processing Function - Refactored Version"""
-    from api_utils.server_state import state
-
     logger = state.logger
 
     # 0. Check Auth Rotation Lock
@@ -744,35 +714,29 @@ async def _process_request_refactored(
     # [GR-03] Pre-Flight Graceful Rotation Check
     if GlobalState.NEEDS_ROTATION:
         logger.info(f"[{req_id}] 🔄 Graceful Rotation Pending. Initiating rotation...")
-        from api_utils.server_state import state
-
         current_model_id = state.current_ai_studio_model_id
-        from browser_utils.auth_rotation import perform_auth_rotation
-
         if await perform_auth_rotation(target_model_id=current_model_id):
             GlobalState.NEEDS_ROTATION = False
             logger.info(f"[{req_id}] ✅ Pre-flight rotation complete.")
 
-    is_connected = await _test_client_connection(req_id, http_request)
+    # Read once per request; the response phase reuses the same decision
+    use_stream = _stream_proxy_enabled()
+    if use_stream:
+        # Independent pre-flight steps: drain stale frames while checking the client
+        is_connected, _ = await asyncio.gather(
+            _test_client_connection(req_id, http_request),
+            _clear_stream_queue_logged(),
+        )
+    else:
+        is_connected = await _test_client_connection(req_id, http_request)
+
     if not is_connected:
         logger.info(f"[{req_id}] Client disconnected before processing.")
         if not result_future.done():
             result_future.set_exception(
-                HTTPException(status_code=499, detail="Client disconnected")
+                client_disconnected(req_id, "pre-processing check")
             )
-        return None
-
-    stream_port = get_environment_variable("STREAM_PORT")
-    use_stream = stream_port != "0"
-    if use_stream:
-        try:
-            from api_utils import clear_stream_queue
-
-            await clear_stream_queue()
-        except asyncio.CancelledError:
-            raise
-        except Exception as clear_err:
-            logger.warning(f"[Stream] Error clearing queue: {clear_err}")
+        return ProcessResult(None, None, None)
 
     context = await _initialize_request_context(req_id, request)
     context = await _analyze_model_requirements(req_id, context, request)
@@ -784,7 +748,7 @@ async def _process_request_refactored(
     ) = await _setup_disconnect_monitoring(req_id, http_request, result_future)
 
     page = context["page"]
-    submit_button_locator = page.locator(SUBMIT_BUTTON_SELECTOR) if page else None
+    submit_button_locator = _get_submit_button_locator(page) if page else None
     completion_event = None
 
     try:
@@ -849,7 +813,7 @@ async def _process_request_refactored(
             }
 
             usage_stats = calculate_usage_stats(
-                [msg.model_dump() for msg in request.messages],
+                request.messages,
                 "",
                 "",
             )
@@ -866,12 +830,19 @@ async def _process_request_refactored(
             )
 
             if not result_future.done():
-                result_future.set_result(JSONResponse(content=response_payload))
+                result_future.set_result(
+                    Response(
+                        content=dumps_json_bytes(response_payload),
+                        media_type="application/json",
+                    )
+                )
 
             # Return dummy event for forced tool execution to satisfy type requirement
             dummy_event = Event()
             dummy_event.set()
-            return dummy_event, submit_button_locator, check_client_disconnected
+            return ProcessResult(
+                dummy_event, submit_button_locator, check_client_disconnected
+            )
 
         request_params = request.model_dump(exclude_none=True)
         if "stop" in request.model_fields_set and request.stop is None:
@@ -899,7 +870,7 @@ async def _process_request_refactored(
             logger.info(f"[{req_id}] Page updated, syncing references...")
             page = page_controller.page
             context["page"] = page
-            submit_button_locator = page.locator(SUBMIT_BUTTON_SELECTOR)
+            submit_button_locator = _get_submit_button_locator(page)
 
         calc_timeout = 5.0 + (len(prepared_prompt) / 1000.0)
         config_timeout = RESPONSE_COMPLETION_TIMEOUT / 1000.0
@@ -921,31 +892,35 @@ async def _process_request_refactored(
             len(prepared_prompt),
             timeout=dynamic_timeout,
             silence_threshold=dynamic_silence_threshold,
+            page_controller=page_controller,
+            use_stream=use_stream,
         )
 
-        if response_result:
-            if isinstance(response_result, dict):
-                return response_result, submit_button_locator, check_client_disconnected
-            if isinstance(response_result, tuple):
-                completion_event, _, _ = response_result
-                return (
-                    completion_event,
-                    submit_button_locator,
-                    check_client_disconnected,
-                )
+        if isinstance(response_result, ProcessResult):
+            completion_event = response_result.completion_event
+        elif response_result:
+            return ProcessResult(
+                response_result, submit_button_locator, check_client_disconnected
+            )
 
-        return completion_event, submit_button_locator, check_client_disconnected
+        return ProcessResult(
+            completion_event, submit_button_locator, check_client_disconnected
+        )
 
     except ClientDisconnectedError as disco_err:
         logger.info(f"[{req_id}] Client disconnected: {disco_err}")
         if not result_future.done():
             result_future.set_exception(client_disconnected(req_id, "Disconnected"))
-        return completion_event, submit_button_locator, check_client_disconnected
+        return ProcessResult(
+            completion_event, submit_button_locator, check_client_disconnected
+        )
     except HTTPException as http_err:
         logger.warning(f"[{req_id}] HTTP exception: {http_err.status_code}")
         if not result_future.done():
             result_future.set_exception(http_err)
-        return completion_event, submit_button_locator, check_client_disconnected
+        return ProcessResult(
+            completion_event, submit_button_locator, check_client_disconnected
+        )
     except QuotaExceededError as quota_err:
         logger.warning(f"[{req_id}] Quota Exceeded: {quota_err}")
         if not GlobalState.IS_QUOTA_EXCEEDED:
@@ -958,13 +933,17 @@ async def _process_request_refactored(
             result_future.set_exception(
                 upstream_error(req_id, f"Interaction failed: {pw_err}")
             )
-        return completion_event, submit_button_locator, check_client_disconnected
+        return ProcessResult(
+            completion_event, submit_button_locator, check_client_disconnected
+        )
     except Exception as e:
         logger.exception(f"[{req_id}] Unexpected error")
         await save_error_snapshot(f"process_error_{req_id}")
         if not result_future.done():
             result_future.set_exception(server_error(req_id, str(e)))
-        return completion_event, submit_button_locator, check_client_disconnected
+        return ProcessResult(
+            completion_event, submit_button_locator, check_client_disconnected
+        )
     finally:
         await _cleanup_request_resources(
             req_id,
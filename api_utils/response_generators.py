@@ -459,7 +459,7 @@ async def gen_sse_from_aux_stream(
     finally:
         try:
             usage_stats = calculate_usage_stats(
-                [msg.model_dump() for msg in request.messages],
+                request.messages,
                 full_body_content,
                 full_reasoning_content,
             )
@@ -545,9 +545,7 @@ async def gen_sse_from_playwright(
                 yield generate_sse_chunk("\n", req_id, model_name_for_stream)
                 await asyncio.sleep(0.01)
 
-        usage_stats = calculate_usage_stats(
-            [msg.model_dump() for msg in request.messages], final_content, ""
-        )
+        usage_stats = calculate_usage_stats(request.messages, final_content, "")
         total_tokens = usage_stats.get("total_tokens", 0)
         GlobalState.increment_token_count(total_tokens)
         from api_utils.server_state import state
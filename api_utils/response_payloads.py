@@ -3,6 +3,18 @@ from typing import Any, Dict, Optional
 
 from config import CHAT_COMPLETION_ID_PREFIX
 
+# Envelope with the constant fields already filled in. Copying it keeps the
+# key order stable and leaves only the per-response fields to assign.
+_RESPONSE_TEMPLATE: Dict[str, Any] = {
+    "id": None,
+    "object": "chat.completion",
+    "created": None,
+    "model": None,
+    "choices": None,
+    "usage": None,
+    "system_fingerprint": "camoufox-proxy",
+}
+
 
 def build_chat_completion_response_json(
     req_id: str,
@@ -16,22 +28,20 @@ def build_chat_completion_response_json(
 ) -> Dict[str, Any]:
     """Construct an OpenAI-compatible non-streaming chat.completion JSON response."""
     created_ts = int(time.time())
-    resp: Dict[str, Any] = {
-        "id": f"{CHAT_COMPLETION_ID_PREFIX}{req_id}-{created_ts}",
-        "object": "chat.completion",
-        "created": created_ts,
-        "model": model_name,
-        "choices": [
-            {
-                "index": 0,
-                "message": message_payload,
-                "finish_reason": finish_reason,
-                "native_finish_reason": finish_reason,
-            }
-        ],
-        "usage": usage_stats,
-        "system_fingerprint": system_fingerprint,
-    }
+    resp = _RESPONSE_TEMPLATE.copy()
+    resp["id"] = f"{CHAT_COMPLETION_ID_PREFIX}{req_id}-{created_ts}"
+    resp["created"] = created_ts
+    resp["model"] = model_name
+    resp["choices"] = [
+        {
+            "index": 0,
+            "message": message_payload,
+            "finish_reason": finish_reason,
+            "native_finish_reason": finish_reason,
+        }
+    ]
+    resp["usage"] = usage_stats
+    resp["system_fingerprint"] = system_fingerprint
     if seed is not None:
         resp["seed"] = seed
     if response_format is not None:
@@ -17,11 +17,11 @@ from .ports import router as ports_router
 from .proxy import router as proxy_router
 from .queue import cancel_request, get_queue_status
 from .server import router as server_router
-from .static import read_index, serve_react_assets
+from .static import get_static_files_app, read_index
 
 __all__ = [
     "read_index",
-    "serve_react_assets",
+    "get_static_files_app",
     "get_api_info",
     "health_check",
     "list_models",
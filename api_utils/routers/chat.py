@@ -2,7 +2,7 @@ import asyncio
 import logging
 import random
 import time
-from asyncio import Future, Queue
+from asyncio import Future
 
 from fastapi import Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
@@ -11,6 +11,7 @@ from config import RESPONSE_COMPLETION_TIMEOUT, get_environment_variable
 from logging_utils import set_request_id, set_source
 from models import ChatCompletionRequest
 
+from ..client_connection import watch_queued_disconnect
 from ..dependencies import (
     ensure_request_lock,
     get_logger,
@@ -19,13 +20,14 @@ from ..dependencies import (
     get_worker_task,
 )
 from ..error_utils import service_unavailable
+from ..fast_queue import FastQueue
 
 
 async def chat_completions(
     request: ChatCompletionRequest,
     http_request: Request,
     logger: logging.Logger = Depends(get_logger),
-    request_queue: Queue = Depends(get_request_queue),
+    request_queue: FastQueue = Depends(get_request_queue),
     server_state: dict = Depends(get_server_state),
     worker_task=Depends(get_worker_task),
     _lock: None = Depends(ensure_request_lock),
@@ -67,6 +69,11 @@ async def chat_completions(
         "enqueue_time": time.time(),
         "cancelled": False,
     }
+    # Let the ASGI disconnect message mark the item while it waits in the queue
+    disconnect_watcher = asyncio.create_task(
+        watch_queued_disconnect(queue_item, logger)
+    )
+    queue_item["disconnect_watcher"] = disconnect_watcher
     await request_queue.put(queue_item)
 
     try:
@@ -90,3 +97,5 @@ async def chat_completions(
         raise HTTPException(
             status_code=500, detail=f"[{req_id}] Internal server error: {e}"
         )
+    finally:
+        disconnect_watcher.cancel()
@@ -1,4 +1,3 @@
-from asyncio import Queue
 from typing import Any, Dict
 
 from fastapi import Depends
@@ -7,12 +6,13 @@ from fastapi.responses import JSONResponse
 from config import get_environment_variable
 
 from ..dependencies import get_request_queue, get_server_state, get_worker_task
+from ..fast_queue import FastQueue
 
 
 async def health_check(
     server_state: Dict[str, Any] = Depends(get_server_state),
     worker_task=Depends(get_worker_task),
-    request_queue: Queue = Depends(get_request_queue),
+    request_queue: FastQueue = Depends(get_request_queue),
 ) -> JSONResponse:
     is_worker_running = bool(worker_task and not worker_task.done())
     launch_mode = get_environment_variable("LAUNCH_MODE", "unknown")
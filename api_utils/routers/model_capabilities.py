@@ -8,14 +8,17 @@ Configuration is loaded from config/model_capabilities.json.
 When new models are released, update the JSON file - no code changes needed.
 """
 
+import hashlib
 import json
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Final, Optional
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from ..utils_ext.json_codec import dumps_bytes as dumps_json_bytes
 
 router = APIRouter()
 
@@ -43,6 +46,80 @@ def _load_config() -> dict[str, Any]:
 def reload_config() -> None:
     """Clear the config cache, forcing a reload on next access."""
     _load_config.cache_clear()
+    _compile_matchers.cache_clear()
+    _match_category.cache_clear()
+    _config_body.cache_clear()
+    _config_etag.cache_clear()
+    _category_body.cache_clear()
+
+
+# Flags a plain str pattern compiled with IGNORECASE carries
+_BASE_FLAGS = re.IGNORECASE | re.UNICODE
+
+
+@lru_cache(maxsize=1)
+def _compile_matchers() -> tuple[
+    Optional[re.Pattern[str]], dict[str, str], list[tuple[re.Pattern[str], str]]
+]:
+    """
+    Fold all matchers into one case-insensitive pattern.
+
+    Each matcher becomes a lazy-prefixed alternative wrapped in its own named
+    group. Anchored at the start, the alternatives are tried in config order,
+    so the first matcher that matches anywhere wins, as with a per-matcher
+    loop. Invalid patterns and matchers for unknown categories are skipped.
+
+    Groups, backreferences and inline flags do not survive being joined
+    (numbering shifts, names clash, global flags must lead the expression).
+    If any matcher uses them, or the joined pattern fails to compile, no
+    combined pattern is returned and the per-matcher list is used instead.
+    """
+    config = _load_config()
+    categories = config.get("categories", {})
+
+    alternatives: list[str] = []
+    group_categories: dict[str, str] = {}
+    compiled: list[tuple[re.Pattern[str], str]] = []
+    combinable = True
+    for matcher in config.get("matchers", []):
+        pattern = matcher.get("pattern", "")
+        category_name = matcher.get("category", "")
+        if not pattern or category_name not in categories:
+            continue
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            # Invalid regex pattern, skip
+            continue
+        compiled.append((regex, category_name))
+        if regex.groups or regex.flags & ~_BASE_FLAGS:
+            combinable = False
+        group = f"m{len(alternatives)}"
+        alternatives.append(f"(?P<{group}>(?s:.*?)(?:{pattern}))")
+        group_categories[group] = category_name
+
+    if not alternatives or not combinable:
+        return None, group_categories, compiled
+    try:
+        combined = re.compile("|".join(alternatives), re.IGNORECASE)
+    except re.error:
+        return None, group_categories, compiled
+    return combined, group_categories, compiled
+
+
+@lru_cache(maxsize=256)
+def _match_category(model_lower: str) -> Optional[str]:
+    """Return the category name of the first matcher that matches, if any."""
+    combined, group_categories, compiled = _compile_matchers()
+    if combined is None:
+        for regex, category_name in compiled:
+            if regex.search(model_lower):
+                return category_name
+        return None
+    match = combined.match(model_lower)
+    if match is None or match.lastgroup is None:
+        return None
+    return group_categories[match.lastgroup]
 
 
 def _get_model_capabilities(model_id: str) -> dict[str, Any]:
@@ -56,49 +133,80 @@ def _get_model_capabilities(model_id: str) -> dict[str, Any]:
     - budgetRange: [min, max] for budget slider
     - supportsGoogleSearch: Whether the model supports Google Search
     """
-    config = _load_config()
-    categories = config.get("categories", {})
-    matchers = config.get("matchers", [])
+    categories = _load_config().get("categories", {})
 
-    model_lower = model_id.lower()
+    # Order matters: more specific matchers come first. The same few model ids
+    # are looked up over and over, so the match result is cached per id.
+    category_name = _match_category(model_id.lower())
+    if category_name is not None:
+        return categories[category_name].copy()
+    return _default_capabilities(categories).copy()
 
-    # Try each matcher in order (order matters: more specific first)
-    for matcher in matchers:
-        pattern = matcher.get("pattern", "")
-        category_name = matcher.get("category", "")
 
-        if pattern and category_name:
-            try:
-                if re.search(pattern, model_lower, re.IGNORECASE):
-                    if category_name in categories:
-                        return categories[category_name].copy()
-            except re.error:
-                # Invalid regex pattern, skip
-                continue
-
-    # Default to "other" category
-    return categories.get(
-        "other", {"thinkingType": "none", "supportsGoogleSearch": True}
-    )
+# Used when the config has no "other" category; never handed out uncopied
+_FALLBACK_CAPABILITIES: Final[dict[str, Any]] = {
+    "thinkingType": "none",
+    "supportsGoogleSearch": True,
+}
+
+
+def _default_capabilities(categories: dict[str, Any]) -> dict[str, Any]:
+    """Default to the "other" category."""
+    return categories.get("other", _FALLBACK_CAPABILITIES)
+
+
+@lru_cache(maxsize=1)
+def _config_body() -> bytes:
+    """The full config, encoded once per config load."""
+    return dumps_json_bytes(_load_config())
+
+
+@lru_cache(maxsize=64)
+def _category_body(category_name: Optional[str]) -> bytes:
+    """One category's capabilities (None for the default), encoded once."""
+    categories = _load_config().get("categories", {})
+    if category_name is None:
+        return dumps_json_bytes(_default_capabilities(categories))
+    return dumps_json_bytes(categories[category_name])
+
+
+@lru_cache(maxsize=1)
+def _config_etag() -> str:
+    """Strong validator for the encoded config body."""
+    return '"' + hashlib.sha256(_config_body()).hexdigest()[:16] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
 
 
 @router.get("/api/model-capabilities")
-async def get_model_capabilities() -> JSONResponse:
+async def get_model_capabilities(request: Request) -> Response:
     """
     Return thinking capabilities for all known model categories.
 
     Frontend uses this to dynamically configure thinking controls.
+    Answers 304 when the client already holds the current version.
     """
-    config = _load_config()
-    return JSONResponse(content=config)
+    etag = _config_etag()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=_config_body(), media_type="application/json", headers=headers
+    )
 
 
 @router.get("/api/model-capabilities/{model_id:path}")
-async def get_single_model_capabilities(model_id: str) -> JSONResponse:
+async def get_single_model_capabilities(model_id: str) -> Response:
     """
     Return thinking capabilities for a specific model.
 
     Args:
         model_id: Model identifier (e.g., "gemini-2.5-flash-preview")
     """
-    return JSONResponse(content=_get_model_capabilities(model_id))
+    body = _category_body(_match_category(model_id.lower()))
+    return Response(content=body, media_type="application/json")
@@ -1,6 +1,6 @@
 import logging
 import time
-from asyncio import Lock, Queue
+from asyncio import Lock
 
 from fastapi import Depends
 from fastapi.responses import JSONResponse
@@ -9,34 +9,29 @@ from logging_utils import set_request_id
 
 from ..dependencies import get_logger, get_processing_lock, get_request_queue
 from ..error_utils import client_cancelled
+from ..fast_queue import FastQueue
 
 
 async def cancel_queued_request(
-    req_id: str, request_queue: Queue, logger: logging.Logger
+    req_id: str, request_queue: FastQueue, logger: logging.Logger
 ) -> bool:
     set_request_id(req_id)
-    items_to_requeue = []
     found = False
-    try:
-        while not request_queue.empty():
-            item = request_queue.get_nowait()
-            if item.get("req_id") == req_id:
-                logger.info("Found request in queue, marking as cancelled.")
-                item["cancelled"] = True
-                if (future := item.get("result_future")) and not future.done():
-                    future.set_exception(client_cancelled(req_id))
-                found = True
-            items_to_requeue.append(item)
-    finally:
-        for item in items_to_requeue:
-            await request_queue.put(item)
+    # Mark matching items in place; the queue order is left untouched
+    for item in request_queue._queue:
+        if item.get("req_id") == req_id:
+            logger.info("Found request in queue, marking as cancelled.")
+            item["cancelled"] = True
+            if (future := item.get("result_future")) and not future.done():
+                future.set_exception(client_cancelled(req_id))
+            found = True
     return found
 
 
 async def cancel_request(
     req_id: str,
     logger: logging.Logger = Depends(get_logger),
-    request_queue: Queue = Depends(get_request_queue),
+    request_queue: FastQueue = Depends(get_request_queue),
 ):
     set_request_id(req_id)
     logger.info("Received cancellation request.")
@@ -58,21 +53,14 @@ async def cancel_request(
 
 
 async def get_queue_status(
-    request_queue: Queue = Depends(get_request_queue),
+    request_queue: FastQueue = Depends(get_request_queue),
     processing_lock: Lock = Depends(get_processing_lock),
 ):
-    # Extract all items temporarily to inspect queue contents
-    queue_items = []
+    # Snapshot queue contents without draining and refilling the queue
     try:
-        while not request_queue.empty():
-            item = request_queue.get_nowait()
-            queue_items.append(item)
+        queue_items = list(request_queue._queue)
     except Exception:
-        pass
-    finally:
-        # Put all items back in original order
-        for item in queue_items:
-            await request_queue.put(item)
+        queue_items = []
 
     queue_length = len(queue_items)
 
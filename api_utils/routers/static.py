@@ -3,19 +3,28 @@ Static files serving routes
 Uses FastAPI/Starlette native static files service
 
 Optimization points:
-- Use StaticFiles for high-performance static file serving
+- Built assets are served by a StaticFiles mount (see get_static_files_app)
 - Automatic handling of cache headers, byte-range requests, directory traversal protection
 - SPA routing uses catch-all to return only index.html
 """
 
 import logging
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
+from typing import Optional
 
-from fastapi import Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
 
-from ..dependencies import get_logger
+# Module logger rather than Depends(get_logger): the index is served on every
+# page load, and dependency resolution would run on each request
+logger = logging.getLogger("AIStudioProxyServer")
 
 _BASE_DIR = Path(__file__).parent.parent.parent
 
@@ -23,6 +32,53 @@ _BASE_DIR = Path(__file__).parent.parent.parent
 _REACT_DIST = _BASE_DIR / "static" / "frontend" / "dist"
 _REACT_ASSETS = _REACT_DIST / "assets"
 
+# Media types by lower-cased file suffix
+_MEDIA_TYPES = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".map": "application/json",
+    ".wasm": "application/wasm",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".ico": "image/x-icon",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".ttf": "font/ttf",
+    ".eot": "application/vnd.ms-fontobject",
+}
+
+_IMMUTABLE_ASSET_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+
+class ReactAssetFiles(StaticFiles):
+    """
+    StaticFiles for the React build output.
+
+    Build file names carry a content hash, so they never change: responses
+    are marked immutable. Media types come from ``_MEDIA_TYPES`` where known.
+    """
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=_IMMUTABLE_ASSET_HEADERS,
+            media_type=_MEDIA_TYPES.get(Path(full_path).suffix.lower()),
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
 
 def get_static_files_app() -> StaticFiles | None:
     """
@@ -31,66 +87,77 @@ def get_static_files_app() -> StaticFiles | None:
     Returns None if the directory doesn't exist (frontend not built).
     """
     if _REACT_ASSETS.exists():
-        return StaticFiles(directory=str(_REACT_ASSETS))
+        return ReactAssetFiles(directory=str(_REACT_ASSETS))
     return None
 
 
-async def read_index(logger: logging.Logger = Depends(get_logger)) -> FileResponse:
-    """Serve React index.html for SPA routing."""
-    react_index = _REACT_DIST / "index.html"
-    if react_index.exists():
-        return FileResponse(react_index, media_type="text/html")
+def _validators(stat_result: os.stat_result) -> dict[str, str]:
+    """Weak ETag (nginx-style mtime-size) and Last-Modified for a file."""
+    return {
+        "ETag": f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
 
-    logger.error("React build not found - run 'npm run build' in static/frontend/")
-    raise HTTPException(
-        status_code=503,
-        detail="Frontend not built. Run 'npm run build' in static/frontend/",
-    )
 
+def _not_modified(request: Request, stat_result: os.stat_result, etag: str) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: W/ prefixes are ignored on both sides
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
 
-async def serve_react_assets(
-    filename: str, logger: logging.Logger = Depends(get_logger)
-) -> FileResponse:
-    """
-    Serve React built assets (JS, CSS, etc.).
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(stat_result.st_mtime) <= since
+    return False
 
-    Note: For production deployments, consider mounting StaticFiles directly
-    in the app configuration for better performance:
 
-        from fastapi.staticfiles import StaticFiles
-        app.mount("/assets", StaticFiles(directory="static/frontend/dist/assets"))
+def _stat_file(path: Path) -> Optional[os.stat_result]:
+    """Stat ``path`` once; None if it is missing or not a regular file."""
+    try:
+        stat_result = path.stat()
+    except OSError:
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
+def _conditional_file(
+    request: Request,
+    path: Path,
+    stat_result: os.stat_result,
+    media_type: Optional[str],
+) -> Response:
+    """
+    Serve ``path`` with validators, or 304 if the client copy is current.
 
-    This fallback route is provided for flexibility and development convenience.
+    ``stat_result`` comes from the caller's existence check and is handed to
+    FileResponse, so the file is stat'ed once per request.
     """
-    asset_path = _REACT_ASSETS / filename
+    response_headers = _validators(stat_result)
+    if _not_modified(request, stat_result, response_headers["ETag"]):
+        return Response(status_code=304, headers=response_headers)
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers=response_headers,
+        stat_result=stat_result,
+    )
 
-    if not asset_path.exists():
-        logger.debug(f"Asset not found: {asset_path}")
-        raise HTTPException(status_code=404, detail=f"Asset {filename} not found")
 
-    # Security: Prevent directory traversal
-    try:
-        asset_path.resolve().relative_to(_REACT_ASSETS.resolve())
-    except ValueError:
-        logger.warning(f"Directory traversal attempt blocked: {filename}")
-        raise HTTPException(status_code=403, detail="Access denied")
-
-    # Determine media type based on suffix
-    suffix_to_media_type = {
-        ".js": "application/javascript",
-        ".css": "text/css",
-        ".map": "application/json",
-        ".svg": "image/svg+xml",
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".gif": "image/gif",
-        ".ico": "image/x-icon",
-        ".woff": "font/woff",
-        ".woff2": "font/woff2",
-        ".ttf": "font/ttf",
-        ".eot": "application/vnd.ms-fontobject",
-    }
-    media_type = suffix_to_media_type.get(asset_path.suffix.lower())
+async def read_index(request: Request) -> Response:
+    """Serve React index.html for SPA routing."""
+    react_index = _REACT_DIST / "index.html"
+    stat_result = _stat_file(react_index)
+    if stat_result is not None:
+        return _conditional_file(request, react_index, stat_result, "text/html")
 
-    return FileResponse(asset_path, media_type=media_type)
+    logger.error("React build not found - run 'npm run build' in static/frontend/")
+    raise HTTPException(
+        status_code=503,
+        detail="Frontend not built. Run 'npm run build' in static/frontend/",
+    )
@@ -15,8 +15,9 @@ Usage:
 import asyncio
 import logging
 import multiprocessing
-from asyncio import Event, Lock, Queue, Task
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+from asyncio import Event, Lock, Task
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Set
 
 if TYPE_CHECKING:
     from playwright.async_api import (
@@ -30,8 +31,12 @@ if TYPE_CHECKING:
     )
 
     from api_utils.context_types import QueueItem
+    from api_utils.fast_queue import FastQueue
     from models.logging import WebSocketConnectionManager
 
+# Debug logs keep only the most recent entries so snapshots stay bounded
+DEBUG_LOG_MAX_ENTRIES = 500
+
 
 class ServerState:
     """
@@ -73,7 +78,7 @@ class ServerState:
         self.excluded_model_ids: Set[str] = set()
 
         # --- Request Processing State ---
-        self.request_queue: "Optional[Queue[QueueItem]]" = None
+        self.request_queue: "Optional[FastQueue[QueueItem]]" = None
         self.processing_lock: Optional[Lock] = None
         self.worker_task: "Optional[Task[None]]" = None
 
@@ -82,10 +87,10 @@ class ServerState:
         self.params_cache_lock: Lock = Lock()
 
         # --- Debug Logging State ---
-        self.console_logs: List[Dict[str, Any]] = []
-        self.network_log: Dict[str, List[Dict[str, Any]]] = {
-            "requests": [],
-            "responses": [],
+        self.console_logs: Deque[Dict[str, Any]] = deque(maxlen=DEBUG_LOG_MAX_ENTRIES)
+        self.network_log: Dict[str, Deque[Dict[str, Any]]] = {
+            "requests": deque(maxlen=DEBUG_LOG_MAX_ENTRIES),
+            "responses": deque(maxlen=DEBUG_LOG_MAX_ENTRIES),
         }
 
         # --- Logging ---
@@ -98,8 +103,11 @@ class ServerState:
 
     def clear_debug_logs(self) -> None:
         """Clear console and network logs (called after each request)."""
-        self.console_logs = []
-        self.network_log = {"requests": [], "responses": []}
+        self.console_logs = deque(maxlen=DEBUG_LOG_MAX_ENTRIES)
+        self.network_log = {
+            "requests": deque(maxlen=DEBUG_LOG_MAX_ENTRIES),
+            "responses": deque(maxlen=DEBUG_LOG_MAX_ENTRIES),
+        }
 
 
 # Global singleton instance
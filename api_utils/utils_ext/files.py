@@ -7,6 +7,7 @@ import re
 from typing import Any, Dict, List, Optional, cast
 from urllib.parse import unquote, urlparse
 
+from config import UPLOAD_FILES_DIR
 from logging_utils import set_request_id
 
 
@@ -44,8 +45,6 @@ def _extension_for_mime(mime_type: str) -> str:
 def extract_data_url_to_local(
     data_url: str, req_id: Optional[str] = None
 ) -> Optional[str]:
-    from config import UPLOAD_FILES_DIR
-
     logger = logging.getLogger("AIStudioProxyServer")
 
     output_dir = (
@@ -94,8 +93,6 @@ def save_blob_to_local(
     fmt_ext: Optional[str] = None,
     req_id: Optional[str] = None,
 ) -> Optional[str]:
-    from config import UPLOAD_FILES_DIR
-
     logger = logging.getLogger("AIStudioProxyServer")
 
     output_dir = (
@@ -125,6 +122,10 @@ def save_blob_to_local(
         return None
 
 
+# Message fields that may carry attachments (non-standard but common)
+_ATTACHMENT_FIELDS = ("attachments", "images", "files", "media")
+
+
 def collect_and_validate_attachments(
     request: Any, req_id: str, initial_image_list: List[str]
 ) -> List[str]:
@@ -133,10 +134,19 @@ def collect_and_validate_attachments(
     """
     logger = logging.getLogger("AIStudioProxyServer")
 
+    # The same path often shows up in several fields; stat it only once
+    exists_cache: Dict[str, bool] = {}
+
+    def _exists(path: str) -> bool:
+        found = exists_cache.get(path)
+        if found is None:
+            found = exists_cache[path] = os.path.exists(path)
+        return found
+
     # 1. Validate initial list
     valid_images: List[str] = []
     for p in initial_image_list:
-        if p and os.path.isabs(p) and os.path.exists(p):
+        if p and os.path.isabs(p) and _exists(p):
             valid_images.append(p)
 
     set_request_id(req_id)
@@ -150,49 +160,49 @@ def collect_and_validate_attachments(
     # 2. Collect from request
     def _process_attachments_list(items_list: List[Any], container_desc: str):
         for it in items_list:
-            url_value: Optional[str] = None
             if isinstance(it, str):
                 url_value = it
             elif isinstance(it, dict):
                 typed_it: Dict[str, Any] = cast(Dict[str, Any], it)
                 url_raw: Any = typed_it.get("url") or typed_it.get("path")
-                if isinstance(url_raw, str):
-                    url_value = url_raw
-            if not url_value:
+                if not isinstance(url_raw, str):
+                    continue
+                url_value = url_raw
+            else:
                 continue
             url_value = url_value.strip()
             if not url_value:
                 continue
 
-            if url_value.startswith("data:"):
+            scheme = url_value[:5]
+            if scheme == "data:":
                 fp = extract_data_url_to_local(url_value, req_id=req_id)
                 if fp:
                     image_list.append(fp)
-            elif url_value.startswith("file:"):
-                parsed = urlparse(url_value)
-                lp = unquote(parsed.path)
-                if os.path.exists(lp):
+            elif scheme == "file:":
+                lp = unquote(urlparse(url_value).path)
+                if _exists(lp):
                     image_list.append(lp)
                 else:
                     logger.warning(
                         f"{container_desc} attachment file URL does not exist: {lp}"
                     )
-            elif os.path.isabs(url_value) and os.path.exists(url_value):
+            elif os.path.isabs(url_value) and _exists(url_value):
                 image_list.append(url_value)
 
     try:
         # Top-level attachments
         top_level_atts = getattr(request, "attachments", None)
-        if isinstance(top_level_atts, list) and len(top_level_atts) > 0:
+        if isinstance(top_level_atts, list) and top_level_atts:
             _process_attachments_list(top_level_atts, "request.attachments")
 
         # Message-level attachments/images/files/media
         messages = getattr(request, "messages", None)
         if isinstance(messages, list):
             for i, msg in enumerate(messages):
-                for field in ["attachments", "images", "files", "media"]:
+                for field in _ATTACHMENT_FIELDS:
                     items = getattr(msg, field, None)
-                    if isinstance(items, list) and len(items) > 0:
+                    if isinstance(items, list) and items:
                         _process_attachments_list(items, f"message[{i}].{field}")
 
     except Exception as e:
@@ -0,0 +1,35 @@
+"""
+JSON helpers for the response path.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths produce compact UTF-8 JSON without ASCII escaping.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+    if orjson is not None:  # pragma: no cover - orjson is optional
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a compact JSON string."""
+    if orjson is not None:  # pragma: no cover - orjson is optional
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from ``str`` or ``bytes``; raises ``ValueError`` on bad input."""
+    if orjson is not None:  # pragma: no cover - orjson is optional
+        return orjson.loads(data)
+    return json.loads(data)
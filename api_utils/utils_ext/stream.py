@@ -1,5 +1,4 @@
 import asyncio
-import json
 import queue
 import re
 import time
@@ -8,6 +7,8 @@ from typing import Any, AsyncGenerator, Callable, List, Optional, Tuple
 from config.settings import FUNCTION_CALLING_DEBUG
 from logging_utils import set_request_id
 
+from .json_codec import loads as loads_json
+
 # [REFAC-01] Structural Boundary Pattern
 TOOL_STRUCTURE_PATTERN = re.compile(
     r"(?:^|\n)\s*(?:```[a-zA-Z0-9]*\s*)?<[a-zA-Z0-9_\-]+(?:\s|>)"
@@ -23,7 +24,11 @@ async def use_stream_response(
     stream_start_time: float = 0.0,
     enable_silence_detection: bool = True,
 ) -> AsyncGenerator[Any, None]:
-    """Enhanced stream response handler with UI-based generation active checks."""
+    """
+    Enhanced stream response handler with UI-based generation active checks.
+
+    String frames are decoded here, so consumers only ever receive dicts.
+    """
     from api_utils.server_state import state
 
     STREAM_QUEUE = state.STREAM_QUEUE
@@ -185,7 +190,7 @@ async def use_stream_response(
                 actual_data = data
                 if isinstance(data, str):
                     try:
-                        parsed_wrapper = json.loads(data)
+                        parsed_wrapper = loads_json(data)
                         if (
                             isinstance(parsed_wrapper, dict)
                             and "ts" in parsed_wrapper
@@ -197,7 +202,7 @@ async def use_stream_response(
                             actual_data = parsed_wrapper["data"]
                         else:
                             actual_data = parsed_wrapper
-                    except json.JSONDecodeError:
+                    except ValueError:
                         pass
 
                 if isinstance(actual_data, dict):
@@ -474,15 +479,21 @@ async def clear_stream_queue():
 
     if STREAM_QUEUE is None:
         return
-    cleared_count = 0
-    while True:
-        try:
-            await asyncio.to_thread(STREAM_QUEUE.get_nowait)
-            cleared_count += 1
-        except queue.Empty:
-            break
-        except Exception:
-            break
+
+    def drain() -> int:
+        cleared = 0
+        while True:
+            try:
+                STREAM_QUEUE.get_nowait()
+                cleared += 1
+            except queue.Empty:
+                break
+            except Exception:
+                break
+        return cleared
+
+    # One thread hop for the whole backlog instead of one per item
+    cleared_count = await asyncio.to_thread(drain)
     if cleared_count > 0:
         logger.info(f"Stream queue cleared. Items: {cleared_count}")
 
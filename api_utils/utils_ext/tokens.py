@@ -1,4 +1,7 @@
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Union
+
+if TYPE_CHECKING:
+    from models import Message
 
 
 def estimate_tokens(text: str) -> int:
@@ -18,16 +21,21 @@ def estimate_tokens(text: str) -> int:
 
 
 def calculate_usage_stats(
-    messages: List[Dict[str, Any]],
+    messages: Iterable[Union["Message", Dict[str, Any]]],
     response_content: str,
     reasoning_content: Optional[str] = None,
 ) -> Dict[str, int]:
-    prompt_text = ""
+    # Accept Message models directly so callers need not model_dump() each one
+    prompt_parts = []
     for message in messages:
-        role = message.get("role", "")
-        content = message.get("content", "")
-        prompt_text += f"{role}: {content}\n"
-    prompt_tokens = estimate_tokens(prompt_text)
+        if isinstance(message, dict):
+            role = message.get("role", "")
+            content = message.get("content", "")
+        else:
+            role = message.role
+            content = message.content
+        prompt_parts.append(f"{role}: {content}\n")
+    prompt_tokens = estimate_tokens("".join(prompt_parts))
 
     completion_text = response_content or ""
     if reasoning_content:
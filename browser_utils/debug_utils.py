@@ -14,15 +14,20 @@ import asyncio
 import json
 import logging
 import os
+import platform
+import sys
 import traceback
 from asyncio import Lock, Queue
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Protocol, Tuple, Union
+from types import ModuleType
+from typing import Any, Dict, Optional, Protocol, Set, Tuple, Union
 
 from playwright.async_api import Locator
 from playwright.async_api import Page as AsyncPage
 
+from config.settings import SNAPSHOT_FULL_DOM, SNAPSHOT_ON_ERROR
+
 
 class SupportsSizeQuery(Protocol):
     """Protocol for queue-like objects that support qsize()."""
@@ -42,6 +47,55 @@ class SupportsLockQuery(Protocol):
 
 logger = logging.getLogger("AIStudioProxyServer")
 
+_server_state_module: Optional[ModuleType] = None
+
+
+def _get_server_state() -> Any:
+    """
+    Return the shared ServerState.
+
+    The module is imported on first use (importing it at load time would
+    cycle through api_utils) and kept for later calls. The ``state``
+    attribute is read on every call so tests can patch it.
+    """
+    global _server_state_module
+    if _server_state_module is None:
+        from api_utils import server_state
+
+        _server_state_module = server_state
+    return _server_state_module.state
+
+
+def _read_environment() -> Dict[str, Any]:
+    """Environment settings recorded in snapshot metadata."""
+    return {
+        "headless_mode": os.environ.get("HEADLESS", "true").lower() == "true",
+        "launch_mode": os.environ.get("LAUNCH_MODE", "unknown"),
+        "RESPONSE_COMPLETION_TIMEOUT": os.environ.get(
+            "RESPONSE_COMPLETION_TIMEOUT", "300000"
+        ),
+        "DEBUG_LOGS_ENABLED": os.environ.get("DEBUG_LOGS_ENABLED", "false").lower()
+        == "true",
+        "DEFAULT_MODEL": os.environ.get("DEFAULT_MODEL", "unknown"),
+    }
+
+
+_env_snapshot: Optional[Dict[str, Any]] = None
+
+
+def _get_environment() -> Dict[str, Any]:
+    """
+    Return the environment settings recorded in snapshots.
+
+    Read on first use rather than at import: the launchers import the server
+    before they export LAUNCH_MODE and friends. Tests that change them can
+    reset ``_env_snapshot`` to None.
+    """
+    global _env_snapshot
+    if _env_snapshot is None:
+        _env_snapshot = _read_environment()
+    return _env_snapshot
+
 
 def get_local_timestamp() -> Tuple[str, str]:
     """
@@ -59,10 +113,8 @@ def get_local_timestamp() -> Tuple[str, str]:
     # ISO format (without timezone suffix for directory naming)
     iso_format = local_now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
 
-    # Human-readable format with timezone abbreviation
-    human_format = (
-        local_now.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + " " + local_now.strftime("%Z")
-    )
+    # Human-readable format with timezone abbreviation, derived from the ISO one
+    human_format = f"{iso_format.replace('T', ' ')} {local_now.tzname()}"
 
     return iso_format, human_format
 
@@ -71,7 +123,7 @@ def get_local_timestamp() -> Tuple[str, str]:
 get_texas_timestamp = get_local_timestamp
 
 
-async def capture_dom_structure(page: AsyncPage) -> str:
+async def capture_dom_structure(page: AsyncPage, max_depth: int = 15) -> str:
     """
     Capture human-readable DOM tree structure.
 
@@ -80,71 +132,101 @@ async def capture_dom_structure(page: AsyncPage) -> str:
     - IDs and classes
     - Important attributes (disabled, value, etc.)
 
+    The tree is walked iteratively in the page and collected into an array
+    that is joined once, so large DOMs neither blow the JS stack nor pay for
+    repeated string concatenation.
+
     Args:
         page: Playwright page instance
+        max_depth: Elements nested deeper than this are elided
 
     Returns:
         str: Human-readable DOM tree structure
     """
     try:
-        dom_tree = await page.evaluate("""() => {
-            function getTreeStructure(element, indent = '', depth = 0, maxDepth = 15) {
-                // Prevent infinite recursion
-                if (depth > maxDepth) {
-                    return indent + '... (max depth reached)\\n';
-                }
+        dom_tree = await page.evaluate(
+            """(maxDepth) => {
+            const root = document.body;
+            if (!root) {
+                return '';
+            }
+
+            const importantAttrs = ['aria-label', 'type', 'role', 'data-test-id'];
+            const parts = [];
 
-                let result = indent + element.tagName;
+            function describe(element, indent) {
+                parts.push(indent, element.tagName);
 
                 // Add ID
                 if (element.id) {
-                    result += `#${element.id}`;
+                    parts.push('#', element.id);
                 }
 
                 // Add classes
                 if (element.className && typeof element.className === 'string') {
                     const classes = element.className.trim().split(/\\s+/).filter(c => c);
                     if (classes.length > 0) {
-                        result += '.' + classes.join('.');
+                        parts.push('.', classes.join('.'));
                     }
                 }
 
+                // Read the attribute list once instead of one lookup per name
+                const attrs = {};
+                for (const attr of element.attributes) {
+                    attrs[attr.name] = attr.value;
+                }
+
                 // Add important attributes
-                const importantAttrs = ['aria-label', 'type', 'role', 'data-test-id'];
-                for (const attr of importantAttrs) {
-                    const val = element.getAttribute(attr);
+                for (const name of importantAttrs) {
+                    const val = attrs[name];
                     if (val) {
-                        result += ` [${attr}="${val}"]`;
+                        parts.push(` [${name}="${val}"]`);
                     }
                 }
 
                 // Add state attributes
                 if (element.disabled !== undefined) {
-                    result += ` [disabled=${element.disabled}]`;
+                    parts.push(` [disabled=${element.disabled}]`);
                 }
-                if (element.hasAttribute('aria-disabled')) {
-                    result += ` [aria-disabled=${element.getAttribute('aria-disabled')}]`;
+                if ('aria-disabled' in attrs) {
+                    parts.push(` [aria-disabled=${attrs['aria-disabled']}]`);
                 }
 
                 // Add value for input elements (truncated)
                 if (element.value && typeof element.value === 'string') {
                     const truncated = element.value.substring(0, 50);
                     const suffix = element.value.length > 50 ? '...' : '';
-                    result += ` value="${truncated}${suffix}"`;
+                    parts.push(` value="${truncated}${suffix}"`);
                 }
 
-                result += '\\n';
+                parts.push('\\n');
+            }
 
-                // Recurse for children
-                for (let child of element.children) {
-                    result += getTreeStructure(child, indent + '  ', depth + 1, maxDepth);
+            const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+            let depth = 0;
+            for (;;) {
+                const indent = '  '.repeat(depth);
+                if (depth > maxDepth) {
+                    parts.push(indent, '... (max depth reached)\\n');
+                } else {
+                    describe(walker.currentNode, indent);
+                    if (walker.firstChild()) {
+                        depth++;
+                        continue;
+                    }
                 }
 
-                return result;
+                // Climb until a sibling is found; the walker stops at root
+                while (!walker.nextSibling()) {
+                    if (!walker.parentNode()) {
+                        return parts.join('');
+                    }
+                    depth--;
+                }
             }
-
-            return getTreeStructure(document.body);
-        }""")
+        }""",
+            max_depth,
+        )
 
         return dom_tree
     except asyncio.CancelledError:
@@ -171,11 +253,7 @@ async def capture_system_context(
     Returns:
         Dict containing comprehensive system context
     """
-    # Import server locally to avoid circular dependency
-    import platform
-    import sys
-
-    from api_utils.server_state import state
+    state = _get_server_state()
 
     iso_time, texas_time = get_texas_timestamp()
 
@@ -267,7 +345,7 @@ async def capture_system_context(
 
     # Add snippets of recent logs (last 5)
     if state.console_logs:
-        context["recent_activity"]["last_console_logs"] = state.console_logs[-5:]
+        context["recent_activity"]["last_console_logs"] = list(state.console_logs)[-5:]
 
         # Filter for errors/warnings
         console_errors = [
@@ -300,6 +378,52 @@ async def capture_system_context(
     return context
 
 
+async def _probe_locator(name: str, locator: Locator) -> Dict[str, Any]:
+    """Capture one locator's state, issuing the element queries concurrently."""
+    loc_state: Dict[str, Any] = {
+        "exists": False,
+        "count": 0,
+        "visible": False,
+        "enabled": False,
+        "value": None,
+    }
+
+    try:
+        loc_state["count"] = await locator.count()
+        loc_state["exists"] = loc_state["count"] > 0
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Failed to capture state for locator '{name}': {e}")
+        loc_state["error"] = str(e)
+        return loc_state
+
+    if not loc_state["exists"]:
+        # The remaining queries would only wait out their timeouts
+        return loc_state
+
+    # Short timeouts; a failed query keeps its default
+    visible, enabled, value = await asyncio.gather(
+        locator.is_visible(timeout=1000),
+        locator.is_enabled(timeout=1000),
+        locator.input_value(timeout=1000),  # Fails for non-input elements
+        return_exceptions=True,
+    )
+    for result in (visible, enabled, value):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+
+    if not isinstance(visible, BaseException):
+        loc_state["visible"] = visible
+    if not isinstance(enabled, BaseException):
+        loc_state["enabled"] = enabled
+    if not isinstance(value, BaseException) and value:
+        # Truncate long values
+        loc_state["value"] = value[:100] + "..." if len(value) > 100 else value
+
+    return loc_state
+
+
 async def capture_playwright_state(
     page: AsyncPage, locators: Optional[Dict[str, Locator]] = None
 ) -> Dict[str, Any]:
@@ -327,85 +451,67 @@ async def capture_playwright_state(
         },
     }
 
-    try:
-        state["page"]["title"] = await page.title()
-    except asyncio.CancelledError:
-        raise
-    except Exception as e:
-        logger.warning(f"Failed to get page title: {e}")
-        state["page"]["title"] = f"Error: {e}"
-
-    # Capture locator states
-    if locators:
-        for name, locator in locators.items():
-            loc_state: Dict[str, Any] = {
-                "exists": False,
-                "count": 0,
-                "visible": False,
-                "enabled": False,
-                "value": None,
-            }
+    # Page, storage and locator queries are independent; issue them together
+    locators = locators or {}
+    title, cookies, localStorage_keys, *loc_states = await asyncio.gather(
+        page.title(),
+        page.context.cookies(),
+        page.evaluate("() => Object.keys(localStorage)"),
+        *(_probe_locator(name, locator) for name, locator in locators.items()),
+        return_exceptions=True,
+    )
+    for result in (title, cookies, localStorage_keys, *loc_states):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+
+    if isinstance(title, Exception):
+        logger.warning(f"Failed to get page title: {title}")
+        state["page"]["title"] = f"Error: {title}"
+    else:
+        state["page"]["title"] = title
+
+    state["locators"] = dict(zip(locators, loc_states))
+
+    # Storage info
+    if isinstance(cookies, Exception):
+        logger.warning(f"Failed to get cookies: {cookies}")
+    else:
+        state["storage"]["cookies_count"] = len(cookies)
 
-            try:
-                loc_state["count"] = await locator.count()
-                loc_state["exists"] = loc_state["count"] > 0
-
-                if loc_state["exists"]:
-                    # Check visibility with short timeout
-                    try:
-                        loc_state["visible"] = await locator.is_visible(timeout=1000)
-                    except asyncio.CancelledError:
-                        raise
-                    except Exception:
-                        loc_state["visible"] = False
-
-                    # Check enabled state
-                    try:
-                        loc_state["enabled"] = await locator.is_enabled(timeout=1000)
-                    except asyncio.CancelledError:
-                        raise
-                    except Exception:
-                        loc_state["enabled"] = False
-
-                    # Try to get value (for input elements)
-                    try:
-                        value = await locator.input_value(timeout=1000)
-                        if value:
-                            # Truncate long values
-                            loc_state["value"] = (
-                                value[:100] + "..." if len(value) > 100 else value
-                            )
-                    except asyncio.CancelledError:
-                        raise
-                    except Exception:
-                        pass  # Not an input element or error
+    if isinstance(localStorage_keys, Exception):
+        logger.warning(f"Failed to get localStorage keys: {localStorage_keys}")
+    else:
+        state["storage"]["localStorage_keys"] = localStorage_keys
 
-            except asyncio.CancelledError:
-                raise
-            except Exception as e:
-                logger.warning(f"Failed to capture state for locator '{name}': {e}")
-                loc_state["error"] = str(e)
+    return state
 
-            state["locators"][name] = loc_state
 
-    # Capture storage info
-    try:
-        cookies = await page.context.cookies()
-        state["storage"]["cookies_count"] = len(cookies)
-    except asyncio.CancelledError:
-        raise
-    except Exception as e:
-        logger.warning(f"Failed to get cookies: {e}")
+# Date directories already created by this process
+_MADE_DIRS: Set[Path] = set()
+
 
+def _make_snapshot_dir(date_dir: Path, snapshot_dir: Path) -> None:
+    """Create ``snapshot_dir``, creating its date directory only once."""
+    if date_dir not in _MADE_DIRS:
+        date_dir.mkdir(parents=True, exist_ok=True)
+        _MADE_DIRS.add(date_dir)
     try:
-        localStorage_keys = await page.evaluate("() => Object.keys(localStorage)")
-        state["storage"]["localStorage_keys"] = localStorage_keys
-    except asyncio.CancelledError:
-        raise
-    except Exception as e:
-        logger.warning(f"Failed to get localStorage keys: {e}")
+        snapshot_dir.mkdir(exist_ok=True)
+    except FileNotFoundError:
+        # errors_py/ was removed while running; rebuild the chain
+        _MADE_DIRS.discard(date_dir)
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        _MADE_DIRS.add(date_dir)
+
+
+def _write_text(path: Union[str, Path], text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
 
-    return state
+
+def _write_json(path: Union[str, Path], data: Any) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
 
 async def save_comprehensive_snapshot(
@@ -452,7 +558,12 @@ async def save_comprehensive_snapshot(
         logger.warning(f"Cannot save snapshot ({error_name}), page is unavailable.")
         return ""
 
+    if not SNAPSHOT_ON_ERROR:
+        logger.info(f"Error snapshots disabled, skipping ({error_name})")
+        return ""
+
     logger.info(f"Saving comprehensive error snapshot ({error_name})...")
+    env = _get_environment()
 
     # Get timestamps
     iso_timestamp, human_timestamp = get_texas_timestamp()
@@ -467,114 +578,132 @@ async def save_comprehensive_snapshot(
 
     try:
         # Create directory structure
-        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        _make_snapshot_dir(date_dir, snapshot_dir)
         logger.info(f"Created snapshot directory: {snapshot_dir}")
 
-        # === 1. Screenshot ===
-        screenshot_path = snapshot_dir / "screenshot.png"
-        try:
-            await page.screenshot(
-                path=str(screenshot_path), full_page=True, timeout=15000
-            )
-            logger.info("Screenshot saved")
-        except asyncio.CancelledError:
-            raise
-        except Exception as ss_err:
-            logger.error(f"Screenshot failed: {ss_err}")
-
-        # === 2. HTML Dump ===
-        html_path = snapshot_dir / "dom_dump.html"
-        try:
-            content = await page.content()
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            logger.info("HTML dump saved")
-        except asyncio.CancelledError:
-            raise
-        except Exception as html_err:
-            logger.error(f"HTML dump failed: {html_err}")
-
-        # === 3. DOM Structure (Human-Readable) ===
-        dom_structure_path = snapshot_dir / "dom_structure.txt"
-        try:
-            dom_tree = await capture_dom_structure(page)
-            with open(dom_structure_path, "w", encoding="utf-8") as f:
-                f.write(dom_tree)
-            logger.info("DOM structure saved")
-        except asyncio.CancelledError:
-            raise
-        except Exception as dom_err:
-            logger.error(f"DOM structure failed: {dom_err}")
-
-        # === 4. Console Logs ===
-        console_logs_path = snapshot_dir / "console_logs.txt"
-        try:
-            # Get console logs from global state
-            from api_utils.server_state import state
+        # === 1-7. Artifacts ===
+        # Each capture is independent and handles its own errors, so the
+        # Playwright round-trips run concurrently instead of back to back.
+        async def save_screenshot() -> None:
+            screenshot_path = snapshot_dir / "screenshot.png"
+            try:
+                await page.screenshot(
+                    path=str(screenshot_path), full_page=True, timeout=15000
+                )
+                logger.info("Screenshot saved")
+            except asyncio.CancelledError:
+                raise
+            except Exception as ss_err:
+                logger.error(f"Screenshot failed: {ss_err}")
 
-            console_logs = state.console_logs
+        async def save_html_dump() -> None:
+            html_path = snapshot_dir / "dom_dump.html"
+            try:
+                content = await page.content()
+                await asyncio.to_thread(_write_text, html_path, content)
+                logger.info("HTML dump saved")
+            except asyncio.CancelledError:
+                raise
+            except Exception as html_err:
+                logger.error(f"HTML dump failed: {html_err}")
+
+        async def save_dom_structure() -> None:
+            # Human-readable DOM tree
+            dom_structure_path = snapshot_dir / "dom_structure.txt"
+            try:
+                dom_tree = await capture_dom_structure(page)
+                await asyncio.to_thread(_write_text, dom_structure_path, dom_tree)
+                logger.info("DOM structure saved")
+            except asyncio.CancelledError:
+                raise
+            except Exception as dom_err:
+                logger.error(f"DOM structure failed: {dom_err}")
 
-            if console_logs:
-                with open(console_logs_path, "w", encoding="utf-8") as f:
-                    f.write("=== Browser Console Logs ===\n\n")
+        async def save_console_logs() -> None:
+            console_logs_path = snapshot_dir / "console_logs.txt"
+            try:
+                # Get console logs from global state
+                console_logs = _get_server_state().console_logs
+
+                if console_logs:
+                    # Render on the loop: the list keeps growing while we write
+                    lines = ["=== Browser Console Logs ===\n\n"]
                     for log_entry in console_logs:
                         timestamp = log_entry.get("timestamp", "N/A")
                         log_type = log_entry.get("type", "log")
                         text = log_entry.get("text", "")
                         location = log_entry.get("location", "")
 
-                        f.write(f"[{timestamp}] [{log_type.upper()}] {text}\n")
+                        lines.append(f"[{timestamp}] [{log_type.upper()}] {text}\n")
                         if location:
-                            f.write(f"  Location: {location}\n")
-                        f.write("\n")
-
-                logger.info(f"Console logs saved ({len(console_logs)} entries)")
-            else:
-                with open(console_logs_path, "w", encoding="utf-8") as f:
-                    f.write("No console logs captured.\n")
-                logger.info("No console logs available")
-        except Exception as console_err:
-            logger.error(f"Console logs failed: {console_err}")
-
-        # === 5. Network Requests ===
-        network_path = snapshot_dir / "network_requests.json"
-        try:
-            from api_utils.server_state import state
+                            lines.append(f"  Location: {location}\n")
+                        lines.append("\n")
+
+                    await asyncio.to_thread(
+                        _write_text, console_logs_path, "".join(lines)
+                    )
+                    logger.info(f"Console logs saved ({len(console_logs)} entries)")
+                else:
+                    await asyncio.to_thread(
+                        _write_text, console_logs_path, "No console logs captured.\n"
+                    )
+                    logger.info("No console logs available")
+            except Exception as console_err:
+                logger.error(f"Console logs failed: {console_err}")
+
+        async def save_network_log() -> None:
+            network_path = snapshot_dir / "network_requests.json"
+            try:
+                # Entry lists are bounded deques; copy them for serialization
+                network_log = {
+                    key: list(entries)
+                    for key, entries in _get_server_state().network_log.items()
+                }
 
-            network_log = state.network_log
+                # Serialize on the loop: the log keeps growing while we write
+                network_json = json.dumps(network_log, indent=2, ensure_ascii=False)
+                await asyncio.to_thread(_write_text, network_path, network_json)
 
-            with open(network_path, "w", encoding="utf-8") as f:
-                json.dump(network_log, f, indent=2, ensure_ascii=False)
+                req_count = len(network_log.get("requests", []))
+                resp_count = len(network_log.get("responses", []))
+                logger.info(f"Network log saved ({req_count} reqs, {resp_count} resps)")
+            except Exception as net_err:
+                logger.error(f"Network log failed: {net_err}")
 
-            req_count = len(network_log.get("requests", []))
-            resp_count = len(network_log.get("responses", []))
-            logger.info(f"Network log saved ({req_count} reqs, {resp_count} resps)")
-        except Exception as net_err:
-            logger.error(f"Network log failed: {net_err}")
+        async def save_playwright_state() -> None:
+            playwright_state_path = snapshot_dir / "playwright_state.json"
+            try:
+                pw_state = await capture_playwright_state(page, locators)
+                await asyncio.to_thread(_write_json, playwright_state_path, pw_state)
+                logger.info("Playwright state saved")
+            except asyncio.CancelledError:
+                raise
+            except Exception as pw_err:
+                logger.error(f"Playwright state failed: {pw_err}")
 
-        # === 6. Playwright State ===
-        playwright_state_path = snapshot_dir / "playwright_state.json"
-        try:
-            pw_state = await capture_playwright_state(page, locators)
-            with open(playwright_state_path, "w", encoding="utf-8") as f:
-                json.dump(pw_state, f, indent=2, ensure_ascii=False)
-            logger.info("Playwright state saved")
-        except asyncio.CancelledError:
-            raise
-        except Exception as pw_err:
-            logger.error(f"Playwright state failed: {pw_err}")
-
-        # === 7. System Context (LLM Context) ===
-        context_path = snapshot_dir / "llm.json"
-        try:
-            system_context = await capture_system_context(req_id, error_name)
-            with open(context_path, "w", encoding="utf-8") as f:
-                json.dump(system_context, f, indent=2, ensure_ascii=False)
-            logger.info("LLM context saved")
-        except asyncio.CancelledError:
-            raise
-        except Exception as ctx_err:
-            logger.error(f"LLM context failed: {ctx_err}")
+        async def save_system_context() -> None:
+            # System context for LLM-assisted analysis
+            context_path = snapshot_dir / "llm.json"
+            try:
+                system_context = await capture_system_context(req_id, error_name)
+                await asyncio.to_thread(_write_json, context_path, system_context)
+                logger.info("LLM context saved")
+            except asyncio.CancelledError:
+                raise
+            except Exception as ctx_err:
+                logger.error(f"LLM context failed: {ctx_err}")
+
+        captures = [save_screenshot(), save_html_dump()]
+        # The DOM tree walk is the costliest page-side capture
+        if SNAPSHOT_FULL_DOM:
+            captures.append(save_dom_structure())
+        await asyncio.gather(
+            *captures,
+            save_console_logs(),
+            save_network_log(),
+            save_playwright_state(),
+            save_system_context(),
+        )
 
         # === 8. Metadata ===
         metadata_path = snapshot_dir / "metadata.json"
@@ -588,34 +717,36 @@ async def save_comprehensive_snapshot(
                     "iso": iso_timestamp,
                     "human": human_timestamp,
                 },
-                "headless_mode": os.environ.get("HEADLESS", "true").lower() == "true",
-                "launch_mode": os.environ.get("LAUNCH_MODE", "unknown"),
+                "headless_mode": env["headless_mode"],
+                "launch_mode": env["launch_mode"],
                 "environment": {
-                    "RESPONSE_COMPLETION_TIMEOUT": os.environ.get(
-                        "RESPONSE_COMPLETION_TIMEOUT", "300000"
-                    ),
-                    "DEBUG_LOGS_ENABLED": os.environ.get(
-                        "DEBUG_LOGS_ENABLED", "false"
-                    ).lower()
-                    == "true",
-                    "DEFAULT_MODEL": os.environ.get("DEFAULT_MODEL", "unknown"),
+                    "RESPONSE_COMPLETION_TIMEOUT": env["RESPONSE_COMPLETION_TIMEOUT"],
+                    "DEBUG_LOGS_ENABLED": env["DEBUG_LOGS_ENABLED"],
+                    "DEFAULT_MODEL": env["DEFAULT_MODEL"],
                 },
             }
 
-            # Add exception info if available
-            if error_exception:
+            # Add exception info if available. The traceback comes from the
+            # exception itself; format_exc() would report whatever exception
+            # happens to be current here, if any.
+            if error_exception is not None:
                 metadata["exception"] = {
                     "type": type(error_exception).__name__,
                     "message": str(error_exception),
-                    "traceback": traceback.format_exc(),
+                    "traceback": "".join(
+                        traceback.format_exception(
+                            type(error_exception),
+                            error_exception,
+                            error_exception.__traceback__,
+                        )
+                    ),
                 }
 
             # Add additional context
             if additional_context:
                 metadata["additional_context"] = additional_context
 
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(_write_json, metadata_path, metadata)
             logger.info("Metadata saved")
         except Exception as meta_err:
             logger.error(f"Metadata failed: {meta_err}")
@@ -655,8 +786,8 @@ async def save_comprehensive_snapshot(
                     "-" * 70,
                     "QUICK REFERENCE",
                     "-" * 70,
-                    f"Headless Mode: {os.environ.get('HEADLESS', 'true')}",
-                    f"Default Model: {os.environ.get('DEFAULT_MODEL', 'unknown')}",
+                    f"Headless Mode: {env['headless_mode']}",
+                    f"Default Model: {env['DEFAULT_MODEL']}",
                     "",
                     "-" * 70,
                     "FILES IN THIS SNAPSHOT",
@@ -683,8 +814,7 @@ async def save_comprehensive_snapshot(
                 ]
             )
 
-            with open(summary_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(summary_lines))
+            await asyncio.to_thread(_write_text, summary_path, "\n".join(summary_lines))
             logger.info("SUMMARY.txt saved")
         except Exception as summary_err:
             logger.error(f"SUMMARY.txt failed: {summary_err}")
@@ -719,7 +849,11 @@ async def save_error_snapshot_enhanced(
         additional_context: Extra context dict to include in metadata (optional)
         locators: Dict of named locators to capture states for (optional)
     """
-    from api_utils.server_state import state
+    if not SNAPSHOT_ON_ERROR:
+        logger.debug(f"Error snapshots disabled, skipping ({error_name})")
+        return
+
+    state = _get_server_state()
 
     # Parse req_id from error_name if present (format: "error_name_req_id")
     name_parts = error_name.split("_")
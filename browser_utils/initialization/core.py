@@ -2,7 +2,8 @@
 import asyncio
 import logging
 import os
-from typing import Any, Dict, Optional, Tuple
+from types import ModuleType
+from typing import Any, Dict, Optional, Set, Tuple
 
 from playwright.async_api import (
     Browser as AsyncBrowser,
@@ -24,20 +25,79 @@ from config import (
     AI_STUDIO_URL_PATTERN,
     INPUT_SELECTOR,
     MODEL_NAME_SELECTOR,
+    MODELS_ENDPOINT_URL_CONTAINS,
     USER_INPUT_END_MARKER_SERVER,
     USER_INPUT_START_MARKER_SERVER,
     GlobalState,
+    get_boolean_env,
 )
 from config.selector_utils import (
     INPUT_WRAPPER_SELECTORS,
+    find_first_visible_locator,
 )
 
+from ..models.startup import drain_snapshot_tasks
 from .auth import wait_for_model_list_and_handle_auth_save
 from .debug import setup_debug_listeners
 from .network import setup_network_interception_and_scripts
 
 logger = logging.getLogger("AIStudioProxyServer")
 
+_AI_STUDIO_URL_BASE = f"https://{AI_STUDIO_URL_PATTERN}"
+
+_operations_module: Optional[ModuleType] = None
+
+
+def _get_operations() -> ModuleType:
+    """
+    Return browser_utils.operations, importing it on first use.
+
+    Importing it at load time would cycle through the browser_utils package.
+    Attributes are looked up on the module at each call so tests can patch
+    them.
+    """
+    global _operations_module
+    if _operations_module is None:
+        from browser_utils import operations
+
+        _operations_module = operations
+    return _operations_module
+
+
+def _is_ai_studio_prompts_url(url: str) -> bool:
+    """Whether ``url`` is an AI Studio prompt page."""
+    return _AI_STUDIO_URL_BASE in url and "/prompts/" in url
+
+
+# In-flight model list handlers, so page shutdown can let them finish
+_model_list_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def _on_model_list_response(response: Any) -> None:
+    """
+    Context ``response`` listener.
+
+    Only model list responses get a handler task; every other response in the
+    context returns here without scheduling anything.
+    """
+    if MODELS_ENDPOINT_URL_CONTAINS not in response.url:
+        return
+    task = asyncio.create_task(_get_operations()._handle_model_list_response(response))
+    _model_list_tasks.add(task)
+    task.add_done_callback(_model_list_tasks.discard)
+
+
+async def _drain_model_list_tasks(timeout: float = 1.0) -> None:
+    """Give in-flight model list handlers ``timeout`` seconds, then cancel them."""
+    if not _model_list_tasks:
+        return
+    _, pending = await asyncio.wait(set(_model_list_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.debug(f"Cancelled {len(pending)} pending model list handler(s)")
+        await asyncio.gather(*pending, return_exceptions=True)
+
 
 async def _wait_for_shutdown():
     """Helper to wait for GlobalState.IS_SHUTTING_DOWN event."""
@@ -76,10 +136,7 @@ async def initialize_page_logic(  # pragma: no cover
         # Fall back to existing environment variable logic
         if launch_mode == "headless" or launch_mode == "virtual_headless":
             # Check for Auto-Auth Rotation on Startup
-            if (
-                os.environ.get("AUTO_AUTH_ROTATION_ON_STARTUP", "false").lower()
-                == "true"
-            ):
+            if get_boolean_env("AUTO_AUTH_ROTATION_ON_STARTUP"):
                 logger.info(
                     "   🤖 Auto-Auth Rotation on Startup is ENABLED. Selecting profile..."
                 )
@@ -171,6 +228,8 @@ async def initialize_page_logic(  # pragma: no cover
             )
 
     try:
+        from api_utils.server_state import state
+
         # Consolidate into one log message
         auth_file = (
             os.path.basename(storage_state_path_to_use)
@@ -180,21 +239,15 @@ async def initialize_page_logic(  # pragma: no cover
         context_options: Dict[str, Any] = {"viewport": {"width": 460, "height": 800}}
         if storage_state_path_to_use:
             context_options["storage_state"] = storage_state_path_to_use
-            from api_utils.server_state import state
-
             state.current_auth_profile_path = storage_state_path_to_use
             logger.info(
                 f"   (Using storage_state='{os.path.basename(storage_state_path_to_use)}')"
             )
         else:
-            from api_utils.server_state import state
-
             state.current_auth_profile_path = None
             logger.info("   (Not using storage_state)")
 
         # Proxy settings need to be retrieved from the server module
-        from api_utils.server_state import state
-
         if state.PLAYWRIGHT_PROXY_SETTINGS:
             context_options["proxy"] = state.PLAYWRIGHT_PROXY_SETTINGS
             logger.debug(
@@ -214,39 +267,30 @@ async def initialize_page_logic(  # pragma: no cover
         # Set up network interception and script injection
         await setup_network_interception_and_scripts(temp_context)
 
+        # One context-wide listener covers every page, including ones opened later
+        temp_context.on("response", _on_model_list_response)
+
         found_page: Optional[AsyncPage] = None
         pages = temp_context.pages
-        target_url_base = f"https://{AI_STUDIO_URL_PATTERN}"
-        target_full_url = f"{target_url_base}prompts/new_chat"
+        target_full_url = f"{_AI_STUDIO_URL_BASE}prompts/new_chat"
         login_url_pattern = "accounts.google.com"
         current_url = ""
 
-        # Import _handle_model_list_response - delayed import to avoid circular dependency
-        from browser_utils.operations import _handle_model_list_response
-
         for p_iter in pages:
             try:
                 page_url_to_check = p_iter.url
                 if (
-                    not p_iter.is_closed()
-                    and target_url_base in page_url_to_check
-                    and "/prompts/" in page_url_to_check
+                    _is_ai_studio_prompts_url(page_url_to_check)
+                    and not p_iter.is_closed()
                 ):
                     found_page = p_iter
                     current_url = page_url_to_check
                     logger.debug(f"Found opened AI Studio page: {current_url}")
-                    if found_page:
-                        logger.debug(
-                            f"Adding model list response listener to existing page {found_page.url}."
-                        )
-                        found_page.on("response", _handle_model_list_response)
-                        # Setup debug listeners for error snapshots
-                        setup_debug_listeners(found_page)
+                    # Setup debug listeners for error snapshots
+                    setup_debug_listeners(found_page)
                     break
-            except PlaywrightAsyncError as pw_err_url:
-                logger.warning(f"Playwright error checking page URL: {pw_err_url}")
-            except AttributeError as attr_err_url:
-                logger.warning(f"Attribute error checking page URL: {attr_err_url}")
+            except (PlaywrightAsyncError, AttributeError) as url_err:
+                logger.warning(f"{type(url_err).__name__} checking page URL: {url_err}")
             except asyncio.CancelledError:
                 raise
             except Exception as e_url_check:
@@ -258,10 +302,6 @@ async def initialize_page_logic(  # pragma: no cover
             logger.info(f"[Navigation] Opening new page: {target_full_url}")
             found_page = await temp_context.new_page()
             if found_page:
-                logger.debug(
-                    "Adding model list response listener to new page (before navigation)."
-                )
-                found_page.on("response", _handle_model_list_response)
                 # Setup debug listeners for error snapshots
                 setup_debug_listeners(found_page)
             try:
@@ -275,10 +315,7 @@ async def initialize_page_logic(  # pragma: no cover
             except asyncio.CancelledError:
                 raise
             except Exception as new_page_nav_err:
-                # Import save_error_snapshot function
-                from browser_utils.operations import save_error_snapshot
-
-                await save_error_snapshot("init_new_page_nav_fail")
+                await _get_operations().save_error_snapshot("init_new_page_nav_fail")
                 error_str = str(new_page_nav_err)
                 if "NS_ERROR_NET_INTERRUPT" in error_str:
                     logger.error(
@@ -312,28 +349,26 @@ async def initialize_page_logic(  # pragma: no cover
                 ) from new_page_nav_err
 
         if login_url_pattern in current_url:
-            if launch_mode == "headless":
+            # Headless modes always load a storage state and nobody can log in
+            # interactively: fail now instead of waiting out the login window
+            if launch_mode in ("headless", "virtual_headless"):
                 logger.error(
-                    "Detected redirect to login page in headless mode, authentication may have expired. Please update the auth file."
+                    f"Detected redirect to login page in {launch_mode} mode, authentication may have expired. Please update the auth file."
                 )
                 raise RuntimeError(
-                    "Auth failed in headless mode, auth file update required."
+                    f"Auth failed in {launch_mode} mode, auth file update required."
                 )
             else:
                 print(f"\n{'=' * 20} Action Required {'=' * 20}", flush=True)
                 login_prompt = "   Detected login may be required. If the browser shows a login page, please complete the Google login in the browser window, then press Enter here to continue..."
                 # NEW: If SUPPRESS_LOGIN_WAIT is set, skip waiting for user input.
-                if os.environ.get("SUPPRESS_LOGIN_WAIT", "").lower() in (
-                    "1",
-                    "true",
-                    "yes",
-                ):
+                if get_boolean_env("SUPPRESS_LOGIN_WAIT"):
                     logger.info(
                         "SUPPRESS_LOGIN_WAIT flag detected, skipping wait for user input."
                     )
                 else:
                     print(USER_INPUT_START_MARKER_SERVER, flush=True)
-                    await loop.run_in_executor(None, input, login_prompt)
+                    await asyncio.to_thread(input, login_prompt)
                     print(USER_INPUT_END_MARKER_SERVER, flush=True)
                 logger.info("Checking login status...")
                 try:
@@ -353,7 +388,7 @@ async def initialize_page_logic(  # pragma: no cover
                     )
 
                     # Call auth save logic after successful login
-                    if os.environ.get("AUTO_SAVE_AUTH", "false").lower() == "true":
+                    if get_boolean_env("AUTO_SAVE_AUTH"):
                         await wait_for_model_list_and_handle_auth_save(
                             temp_context, launch_mode, loop
                         )
@@ -361,9 +396,7 @@ async def initialize_page_logic(  # pragma: no cover
                 except asyncio.CancelledError:
                     raise
                 except Exception as wait_login_err:
-                    from browser_utils.operations import save_error_snapshot
-
-                    await save_error_snapshot("init_login_wait_fail")
+                    await _get_operations().save_error_snapshot("init_login_wait_fail")
                     logger.error(
                         f"Failed to detect AI Studio URL after login prompt or error saving status: {wait_login_err}",
                         exc_info=True,
@@ -372,12 +405,10 @@ async def initialize_page_logic(  # pragma: no cover
                         f"Failed to detect AI Studio URL after login prompt: {wait_login_err}"
                     ) from wait_login_err
 
-        elif target_url_base not in current_url or "/prompts/" not in current_url:
-            from browser_utils.operations import save_error_snapshot
-
-            await save_error_snapshot("init_unexpected_page")
+        elif not _is_ai_studio_prompts_url(current_url):
+            await _get_operations().save_error_snapshot("init_unexpected_page")
             logger.error(
-                f"Unexpected page URL after initial navigation: {current_url}. Expected it to contain '{target_url_base}' and '/prompts/'."
+                f"Unexpected page URL after initial navigation: {current_url}. Expected it to contain '{_AI_STUDIO_URL_BASE}' and '/prompts/'."
             )
             raise RuntimeError(
                 f"Unexpected page after initial navigation: {current_url}."
@@ -389,8 +420,6 @@ async def initialize_page_logic(  # pragma: no cover
             # Use centralized selector fallback logic to find input container
             # Supports current and old UI structures (ms-prompt-input-wrapper / ms-chunk-editor / ms-prompt-box)
             # Use find_first_visible_locator to wait for element visibility, solving timing issues in headless mode
-            from config.selector_utils import find_first_visible_locator
-
             # Wrap in a way that respects the shutdown signal
             async def find_locator_task():
                 return await find_first_visible_locator(
@@ -450,9 +479,7 @@ async def initialize_page_logic(  # pragma: no cover
         except asyncio.CancelledError:
             raise
         except Exception as input_visible_err:
-            from browser_utils.operations import save_error_snapshot
-
-            await save_error_snapshot("init_fail_input_timeout")
+            await _get_operations().save_error_snapshot("init_fail_input_timeout")
             logger.error(
                 f"Page initialization failed: core input area did not become visible within expected time. Last URL was {found_page.url}",
                 exc_info=True,
@@ -491,9 +518,8 @@ async def initialize_page_logic(  # pragma: no cover
                 raise
             except Exception as close_err:
                 logger.warning(f"Error closing temporary browser context: {close_err}")
-        from browser_utils.operations import save_error_snapshot
 
-        await save_error_snapshot("init_unexpected_error")
+        await _get_operations().save_error_snapshot("init_unexpected_error")
         raise RuntimeError(
             f"Unexpected page initialization error: {e_init_page}"
         ) from e_init_page
@@ -505,10 +531,20 @@ async def close_page_logic() -> Tuple[None, bool]:  # pragma: no cover
     from api_utils.server_state import state
 
     logger.info("--- Running page logic shutdown --- ")
-    if state.page_instance and not state.page_instance.is_closed():
+    page = state.page_instance
+    if page and not page.is_closed():
+        try:
+            # No new model list handlers once shutdown starts
+            page.context.remove_listener("response", _on_model_list_response)
+        except Exception:
+            pass
+    await _drain_model_list_tasks()
+    await drain_snapshot_tasks()
+
+    if page and not page.is_closed():
         try:
             # [ID-04] Optimize Browser Lifecycle Management: 2-second timeout for graceful close
-            await asyncio.wait_for(state.page_instance.close(), timeout=2.0)
+            await asyncio.wait_for(page.close(), timeout=2.0)
             logger.info("   Page closed")
         except asyncio.TimeoutError:
             logger.warning(
@@ -633,6 +669,22 @@ async def enable_temporary_chat_mode(page: AsyncPage) -> bool:  # pragma: no cov
         'button[aria-label="Toggle temporary chat"]'
     )
     menu_trigger_selector = 'button[aria-label="View more actions"]'
+    # Any of the signals _is_temporary_chat_active accepts
+    active_selector = ", ".join(
+        [
+            "ms-incognito-mode-indicator",
+            "[data-test-incognito-checkmark]",
+            *(
+                f"{button}{state}"
+                for button in incognito_selector.split(", ")
+                for state in (
+                    ".ms-button-active",
+                    '[aria-pressed="true"]',
+                    '[aria-checked="true"]',
+                )
+            ),
+        ]
+    )
 
     incognito_locator = page.locator(incognito_selector)
     menu_trigger = page.locator(menu_trigger_selector)
@@ -675,7 +727,14 @@ async def enable_temporary_chat_mode(page: AsyncPage) -> bool:  # pragma: no cov
         else:
             logger.debug("[UI] Enabling temporary chat mode")
             await incognito_locator.click(timeout=5000, force=True)
-            await asyncio.sleep(1)
+            # Wait for the UI to reflect the toggle instead of a fixed delay;
+            # the check below decides either way
+            try:
+                await page.locator(active_selector).first.wait_for(
+                    state="attached", timeout=5000
+                )
+            except Exception:
+                pass
 
         enabled = await _is_temporary_chat_active(page)
 
@@ -5,16 +5,77 @@ Model State Initialization and Synchronization
 import asyncio
 import json
 import logging
+import random
+import sys
+from typing import Any, Dict, Final, Set
 
 from playwright.async_api import Page as AsyncPage
 from playwright.async_api import expect as expect_async
 
 from config import INPUT_SELECTOR, MODEL_NAME_SELECTOR
 
-from .ui_state import _verify_and_apply_ui_state, _verify_ui_state_settings
+from .ui_state import _ui_state_from_prefs, _verify_and_apply_ui_state
 
 logger = logging.getLogger("AIStudioProxyServer")
 
+# Background error snapshots; held so they are not collected mid-run
+_pending_snapshot_tasks: Set["asyncio.Task[None]"] = set()
+
+# Exponential backoff bounds (seconds) between initial reload attempts
+_RELOAD_RETRY_BASE_DELAY = 0.5
+_RELOAD_RETRY_MAX_DELAY = 8.0
+
+# Panel flags the proxy relies on being open
+_UI_STATE_OVERRIDES: Final[Dict[str, Any]] = {
+    "isAdvancedOpen": True,
+    "areToolsOpen": True,
+}
+
+# Preference keys filled in when missing from aiStudioUserPreference
+_DEFAULT_USER_PREFS: Final[Dict[str, Any]] = {
+    "bidiModel": "models/gemini-1.0-pro-001",
+    "isSafetySettingsOpen": False,
+    "hasShownSearchGroundingTos": False,
+    "autosaveEnabled": True,
+    "theme": "system",
+    "bidiOutputFormat": 3,
+    "isSystemInstructionsOpen": False,
+    "warmWelcomeDisplayed": True,
+    "getCodeLanguage": "Node.js",
+    "getCodeHistoryToggle": False,
+    "fileCopyrightAcknowledged": True,
+}
+
+# Merge {defaults, overrides} into the stored aiStudioUserPreference:
+# overrides win, stored values come next, defaults only fill missing keys.
+# Unreadable stored values count as empty. Returns the resulting promptModel.
+_MERGE_USER_PREFS_JS = """
+({ defaults, overrides }) => {
+    let current = {};
+    try {
+        const parsed = JSON.parse(localStorage.getItem('aiStudioUserPreference') || '{}');
+        if (parsed && typeof parsed === 'object' && !Array.isArray(parsed)) {
+            current = parsed;
+        }
+    } catch (e) {}
+    const merged = Object.assign({}, defaults, current, overrides);
+    localStorage.setItem('aiStudioUserPreference', JSON.stringify(merged));
+    return merged.promptModel ?? null;
+}
+"""
+
+
+async def drain_snapshot_tasks(timeout: float = 1.0) -> None:
+    """Give background error snapshots ``timeout`` seconds, then cancel them."""
+    if not _pending_snapshot_tasks:
+        return
+    _, pending = await asyncio.wait(set(_pending_snapshot_tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.debug(f"Cancelled {len(pending)} pending error snapshot(s)")
+        await asyncio.gather(*pending, return_exceptions=True)
+
 
 async def _handle_initial_model_state_and_storage(page: AsyncPage):
     """Handle initial model state and storage"""
@@ -39,7 +100,6 @@ async def _handle_initial_model_state_and_storage(page: AsyncPage):
             try:
                 pref_obj = json.loads(initial_prefs_str)
                 prompt_model_path = pref_obj.get("promptModel")
-                pref_obj.get("isAdvancedOpen")
                 is_prompt_model_valid = (
                     isinstance(prompt_model_path, str) and prompt_model_path.strip()
                 )
@@ -48,9 +108,12 @@ async def _handle_initial_model_state_and_storage(page: AsyncPage):
                     needs_reload_and_storage_update = True
                     reason_for_reload = "promptModel invalid"
                 else:
-                    # Use new UI state verification
-                    ui_state = await _verify_ui_state_settings(page, "initial")
+                    # Check UI state on the preferences already read, rather
+                    # than a second localStorage round trip
+                    ui_state = _ui_state_from_prefs(pref_obj)
                     if ui_state["needsUpdate"]:
+                        # The page only reads these flags on load, so fixing
+                        # storage alone would leave the panels closed
                         needs_reload_and_storage_update = True
                         reason_for_reload = "UI state mismatch"
                     else:
@@ -81,8 +144,10 @@ async def _handle_initial_model_state_and_storage(page: AsyncPage):
                     logger.debug(
                         f"Attempting page reload (attempt {attempt + 1}/{max_retries}): {current_page_url}"
                     )
+                    # The input becoming visible is the readiness signal, so
+                    # the navigation itself only needs to commit
                     await page.goto(
-                        current_page_url, wait_until="domcontentloaded", timeout=40000
+                        current_page_url, wait_until="commit", timeout=40000
                     )
                     await expect_async(page.locator(INPUT_SELECTOR)).to_be_visible(
                         timeout=30000
@@ -107,8 +172,12 @@ async def _handle_initial_model_state_and_storage(page: AsyncPage):
                         f"Page reload attempt {attempt + 1}/{max_retries} failed: {reload_err}"
                     )
                     if attempt < max_retries - 1:
-                        logger.debug("[Init] Retrying in 5 seconds...")
-                        await asyncio.sleep(5)
+                        delay = min(
+                            _RELOAD_RETRY_BASE_DELAY * (2**attempt),
+                            _RELOAD_RETRY_MAX_DELAY,
+                        ) + random.uniform(0, 0.25)
+                        logger.debug(f"[Init] Retrying in {delay:.2f} seconds...")
+                        await asyncio.sleep(delay)
                     else:
                         logger.error(
                             f"Page reload ultimately failed after {max_retries} attempts: {reload_err}. Subsequent model state may be inaccurate.",
@@ -116,9 +185,14 @@ async def _handle_initial_model_state_and_storage(page: AsyncPage):
                         )
                         from browser_utils.operations import save_error_snapshot
 
-                        await save_error_snapshot(
-                            f"initial_storage_reload_fail_attempt_{attempt + 1}"
+                        # Diagnostic only: startup carries on while it is taken
+                        task = asyncio.create_task(
+                            save_error_snapshot(
+                                f"initial_storage_reload_fail_attempt_{attempt + 1}"
+                            )
                         )
+                        _pending_snapshot_tasks.add(task)
+                        task.add_done_callback(_pending_snapshot_tasks.discard)
 
             logger.debug("[State] Syncing model ID after reload")
             await _set_model_from_page_display(page, set_storage=False)
@@ -156,17 +230,23 @@ async def _set_model_from_page_display(page: AsyncPage, set_storage: bool = Fals
     try:
         logger.debug("[Model] Reading current model from page display...")
         model_name_locator = page.locator(MODEL_NAME_SELECTOR)
-        displayed_model_name_from_page_raw = await model_name_locator.first.inner_text(
-            timeout=7000
+        # text_content skips the layout pass inner_text needs; the label is
+        # plain text, so the two agree once stripped
+        displayed_model_name_from_page_raw = (
+            await model_name_locator.first.text_content(timeout=7000)
         )
-        displayed_model_name = displayed_model_name_from_page_raw.strip()
+        displayed_model_name = (displayed_model_name_from_page_raw or "").strip()
         logger.debug(f"[Model] Page display: '{displayed_model_name}'")
 
         found_model_id_from_display = None
         if model_list_fetch_event and not model_list_fetch_event.is_set():
             logger.debug("[Model] Waiting for model list data (up to 5 seconds)...")
             try:
-                await asyncio.wait_for(model_list_fetch_event.wait(), timeout=5.0)
+                if sys.version_info >= (3, 11):
+                    async with asyncio.timeout(5.0):
+                        await model_list_fetch_event.wait()
+                else:
+                    await asyncio.wait_for(model_list_fetch_event.wait(), timeout=5.0)
             except asyncio.TimeoutError:
                 logger.warning(
                     "Timeout waiting for model list, may not be able to accurately convert display name to ID."
@@ -182,62 +262,31 @@ async def _set_model_from_page_display(page: AsyncPage, set_storage: bool = Fals
 
         if set_storage:
             logger.debug("[State] Preparing to update localStorage")
-            existing_prefs_for_update_str = await page.evaluate(
-                "() => localStorage.getItem('aiStudioUserPreference')"
-            )
-            prefs_to_set = {}
-            if existing_prefs_for_update_str:
-                try:
-                    prefs_to_set = json.loads(existing_prefs_for_update_str)
-                except json.JSONDecodeError:
-                    logger.warning(
-                        "Failed to parse existing localStorage.aiStudioUserPreference, will create new preferences."
-                    )
 
             # Use new force settings feature
             logger.debug("[State] Applying forced UI state settings...")
             ui_state_success = await _verify_and_apply_ui_state(page, "set_model")
             if not ui_state_success:
                 logger.warning("UI state setting failed, using legacy method")
-                prefs_to_set["isAdvancedOpen"] = True
-                prefs_to_set["areToolsOpen"] = True
-            else:
-                # Ensure prefs_to_set also contains correct settings
-                prefs_to_set["isAdvancedOpen"] = True
-                prefs_to_set["areToolsOpen"] = True
+            # The merge below forces both flags either way
+            overrides: Dict[str, Any] = dict(_UI_STATE_OVERRIDES)
             logger.debug("[State] Set: isAdvancedOpen=true, areToolsOpen=true")
 
             if found_model_id_from_display:
-                new_prompt_model_path = f"models/{found_model_id_from_display}"
-                prefs_to_set["promptModel"] = new_prompt_model_path
-            elif "promptModel" not in prefs_to_set:
+                overrides["promptModel"] = f"models/{found_model_id_from_display}"
+
+            # Read, merge and write in one evaluate, so the app cannot write
+            # in between and the merge sees the current stored preferences
+            prompt_model = await page.evaluate(
+                _MERGE_USER_PREFS_JS,
+                {"defaults": _DEFAULT_USER_PREFS, "overrides": overrides},
+            )
+            if not found_model_id_from_display and prompt_model is None:
                 logger.warning(
                     f"Could not find model ID from page display '{displayed_model_name}', and no existing promptModel in localStorage. promptModel will not be actively set to avoid potential issues."
                 )
-
-            default_keys_if_missing = {
-                "bidiModel": "models/gemini-1.0-pro-001",
-                "isSafetySettingsOpen": False,
-                "hasShownSearchGroundingTos": False,
-                "autosaveEnabled": True,
-                "theme": "system",
-                "bidiOutputFormat": 3,
-                "isSystemInstructionsOpen": False,
-                "warmWelcomeDisplayed": True,
-                "getCodeLanguage": "Node.js",
-                "getCodeHistoryToggle": False,
-                "fileCopyrightAcknowledged": True,
-            }
-            for key, val_default in default_keys_if_missing.items():
-                if key not in prefs_to_set:
-                    prefs_to_set[key] = val_default
-
-            await page.evaluate(
-                "(prefsStr) => localStorage.setItem('aiStudioUserPreference', prefsStr)",
-                json.dumps(prefs_to_set),
-            )
             logger.debug(
-                f"[State] localStorage updated (model: {prefs_to_set.get('promptModel', 'N/A')})"
+                f"[State] localStorage updated (model: {prompt_model or 'N/A'})"
             )
     except asyncio.CancelledError:
         raise
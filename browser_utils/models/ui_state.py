@@ -13,6 +13,36 @@ from logging_utils import set_request_id
 logger = logging.getLogger("AIStudioProxyServer")
 
 
+def _ui_state_from_prefs(prefs: dict) -> dict:
+    """
+    Build the UI state verification result from parsed preferences.
+
+    Args:
+        prefs: Parsed localStorage.aiStudioUserPreference.
+
+    Returns:
+        dict: The same shape _verify_ui_state_settings returns.
+    """
+    is_advanced_open = prefs.get("isAdvancedOpen")
+    are_tools_open = prefs.get("areToolsOpen")
+
+    # Check if update is needed
+    needs_update = (is_advanced_open is not True) or (are_tools_open is not True)
+
+    if needs_update:
+        logger.debug(
+            f"[State] State mismatch: adv={is_advanced_open}, tools={are_tools_open} (update needed)"
+        )
+    # No log needed when state is correct
+    return {
+        "exists": True,
+        "isAdvancedOpen": is_advanced_open,
+        "areToolsOpen": are_tools_open,
+        "needsUpdate": needs_update,
+        "prefs": prefs,
+    }
+
+
 async def _verify_ui_state_settings(page: AsyncPage, req_id: str = "unknown") -> dict:
     """
     Verify if the UI state settings are correct.
@@ -47,30 +77,7 @@ async def _verify_ui_state_settings(page: AsyncPage, req_id: str = "unknown") ->
             }
 
         try:
-            prefs = json.loads(prefs_str)
-            is_advanced_open = prefs.get("isAdvancedOpen")
-            are_tools_open = prefs.get("areToolsOpen")
-
-            # Check if update is needed
-            needs_update = (is_advanced_open is not True) or (
-                are_tools_open is not True
-            )
-
-            result = {
-                "exists": True,
-                "isAdvancedOpen": is_advanced_open,
-                "areToolsOpen": are_tools_open,
-                "needsUpdate": needs_update,
-                "prefs": prefs,
-            }
-
-            if needs_update:
-                logger.debug(
-                    f"[State] State mismatch: adv={is_advanced_open}, tools={are_tools_open} (update needed)"
-                )
-            # No log needed when state is correct
-            return result
-
+            return _ui_state_from_prefs(json.loads(prefs_str))
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse localStorage JSON: {e}")
             return {
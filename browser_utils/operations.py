@@ -33,6 +33,8 @@ from config import (
 from config.global_state import GlobalState
 from models import ClientDisconnectedError, QuotaExceededError
 
+from .operations_modules.errors import ERROR_TOAST_TEXT_JS
+
 logger = logging.getLogger("AIStudioProxyServer")
 
 
@@ -541,12 +543,16 @@ async def _handle_model_list_response(response: Any):
 
 
 async def detect_and_extract_page_error(page: AsyncPage, req_id: str) -> Optional[str]:
-    """Detect and extract page error"""
-    error_toast_locator = page.locator(ERROR_TOAST_SELECTOR).last
+    """
+    Detect and extract page error.
+
+    One evaluate, no waiting: a toast that appears after the call is only
+    seen by the next check.
+    """
     try:
-        await error_toast_locator.wait_for(state="visible", timeout=500)
-        message_locator = error_toast_locator.locator("span.content-text")
-        error_message = await message_locator.text_content(timeout=500)
+        error_message = await page.evaluate(ERROR_TOAST_TEXT_JS, ERROR_TOAST_SELECTOR)
+        if error_message is None:
+            return None
         if error_message:
             logger.error(
                 f"[{req_id}]    Detected and extracted error message: {error_message}"
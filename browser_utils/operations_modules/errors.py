@@ -17,6 +17,16 @@ from logging_utils import set_request_id
 
 logger = logging.getLogger("AIStudioProxyServer")
 
+# Last visible error toast's message text, '' if it has none, null if there
+# is no visible toast. Shared with browser_utils.operations.
+ERROR_TOAST_TEXT_JS = """(selector) => {
+    const toasts = document.querySelectorAll(selector);
+    const last = toasts[toasts.length - 1];
+    if (!last || !last.getClientRects().length) return null;
+    const text = last.querySelector('span.content-text');
+    return text ? text.textContent.trim() : '';
+}"""
+
 
 class ErrorCategory(Enum):
     """Error type classification for standardized error snapshot saving behavior."""
@@ -81,13 +91,17 @@ def categorize_error(exception: BaseException) -> ErrorCategory:
 
 
 async def detect_and_extract_page_error(page: AsyncPage, req_id: str) -> Optional[str]:
-    """Detect and extract page errors"""
+    """
+    Detect and extract page errors.
+
+    One evaluate, no waiting: a toast that appears after the call is only
+    seen by the next check.
+    """
     set_request_id(req_id)
-    error_toast_locator = page.locator(ERROR_TOAST_SELECTOR).last
     try:
-        await error_toast_locator.wait_for(state="visible", timeout=500)
-        message_locator = error_toast_locator.locator("span.content-text")
-        error_message = await message_locator.text_content(timeout=500)
+        error_message = await page.evaluate(ERROR_TOAST_TEXT_JS, ERROR_TOAST_SELECTOR)
+        if error_message is None:
+            return None
         if error_message:
             logger.error(f"Detected and extracted error message: {error_message}")
             return error_message.strip()
@@ -123,6 +123,8 @@ __all__ = [
     # Settings Configuration
     "DEBUG_LOGS_ENABLED",
     "TRACE_LOGS_ENABLED",
+    "SNAPSHOT_ON_ERROR",
+    "SNAPSHOT_FULL_DOM",
     "AUTO_SAVE_AUTH",
     "AUTH_SAVE_TIMEOUT",
     "AUTO_CONFIRM_LOGIN",
@@ -131,6 +133,7 @@ __all__ = [
     "SAVED_AUTH_DIR",
     "LOG_DIR",
     "APP_LOG_FILE_PATH",
+    "UVICORN_LOOP",
     "NO_PROXY_ENV",
     "ENABLE_SCRIPT_INJECTION",
     "NETWORK_INTERCEPTION_ENABLED",
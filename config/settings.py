@@ -3,6 +3,7 @@ Main Settings Configuration Module
 Contains runtime settings such as environment variable configuration, path configuration, proxy configuration, etc.
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -28,6 +29,18 @@ JSON_LOGS_ENABLED = os.environ.get("JSON_LOGS", "false").lower() in (
     "yes",
 )
 
+# --- Error Snapshot Configuration ---
+SNAPSHOT_ON_ERROR = os.environ.get("SNAPSHOT_ON_ERROR", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+SNAPSHOT_FULL_DOM = os.environ.get("SNAPSHOT_FULL_DOM", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
 # --- Log Rotation Configuration ---
 LOG_FILE_MAX_BYTES = int(
     os.environ.get("LOG_FILE_MAX_BYTES", str(10 * 1024 * 1024))
@@ -77,6 +90,16 @@ def get_int_env(key: str, default: int = 0) -> int:
         return default
 
 
+def get_uvicorn_loop() -> str:
+    """uvicorn loop setting: "uvloop" when enabled and installed, else "asyncio"."""
+    if get_boolean_env("UVLOOP_ENABLED", True) and importlib.util.find_spec("uvloop"):
+        return "uvloop"
+    return "asyncio"
+
+
+# --- Event Loop Configuration ---
+UVICORN_LOOP = get_uvicorn_loop()
+
 # --- Proxy Configuration ---
 NO_PROXY_ENV = os.environ.get("NO_PROXY")
 
@@ -31,6 +31,7 @@ load_dotenv()
 
 import uvicorn
 
+from config import UVICORN_LOOP
 from server import app  # Import FastAPI app object from server.py
 
 # -----------------
@@ -1770,6 +1771,7 @@ if __name__ == "__main__":
                 port=args.server_port,
                 log_config=None,
                 access_log=False,
+                loop=UVICORN_LOOP,
             )
 
             # [ID-03] Custom Server to prevent Uvicorn from overriding signal handlers
@@ -1853,7 +1855,11 @@ if __name__ == "__main__":
         )
 
         server_config = uvicorn.Config(
-            app, host="0.0.0.0", port=args.server_port, log_config=None
+            app,
+            host="0.0.0.0",
+            port=args.server_port,
+            log_config=None,
+            loop=UVICORN_LOOP,
         )
         server = uvicorn.Server(server_config)
 
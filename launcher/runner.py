@@ -13,6 +13,7 @@ from typing import Optional
 
 import uvicorn
 
+from config import UVICORN_LOOP
 from launcher.checks import check_dependencies, ensure_auth_dirs_exist
 from launcher.config import (
     ACTIVE_AUTH_DIR,
@@ -446,14 +447,22 @@ class Launcher:  # pragma: no cover
         if not self.args.exit_on_auth_save:
             try:
                 uvicorn.run(
-                    app, host="0.0.0.0", port=self.args.server_port, log_config=None
+                    app,
+                    host="0.0.0.0",
+                    port=self.args.server_port,
+                    log_config=None,
+                    loop=UVICORN_LOOP,
                 )
             except Exception as e:
                 logger.critical(f"Uvicorn error: {e}", exc_info=True)
                 sys.exit(1)
         else:
             server_config = uvicorn.Config(
-                app, host="0.0.0.0", port=self.args.server_port, log_config=None
+                app,
+                host="0.0.0.0",
+                port=self.args.server_port,
+                log_config=None,
+                loop=UVICORN_LOOP,
             )
             server = uvicorn.Server(server_config)
             stop_watcher = threading.Event()
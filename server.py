@@ -18,6 +18,7 @@ def clear_debug_logs() -> None:
 
 from browser_utils.auth_rotation import perform_auth_rotation
 from config import (
+    UVICORN_LOOP,
     GlobalState,
 )
 
@@ -81,5 +82,10 @@ if __name__ == "__main__":
 
     port = int(os.environ.get("PORT", 2048))
     uvicorn.run(
-        "server:app", host="0.0.0.0", port=port, log_level="info", access_log=False
+        "server:app",
+        host="0.0.0.0",
+        port=port,
+        log_level="info",
+        access_log=False,
+        loop=UVICORN_LOOP,
     )
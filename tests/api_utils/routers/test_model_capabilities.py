@@ -4,9 +4,12 @@ Tests for api_utils/routers/model_capabilities.py
 Tests for model capability determination and API endpoints.
 """
 
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 
+from api_utils.routers import model_capabilities
 from api_utils.routers.model_capabilities import (
     _get_model_capabilities,
     router,
@@ -117,6 +120,84 @@ class TestGetModelCapabilities:
         result = _get_model_capabilities("GEMINI-3-FLASH")
         assert result["thinkingType"] == "level"
 
+    def test_matcher_order_beats_match_position(self):
+        """An earlier matcher wins even if a later one matches earlier in the id."""
+        config = {
+            "categories": {
+                "first": {"thinkingType": "level"},
+                "second": {"thinkingType": "budget"},
+            },
+            "matchers": [
+                {"pattern": "[", "category": "second"},  # invalid, skipped
+                {"pattern": "pro", "category": "first"},
+                {"pattern": "gemini", "category": "second"},
+                {"pattern": "gem", "category": "missing"},  # unknown category
+            ],
+        }
+        model_capabilities.reload_config()
+        try:
+            with patch.object(model_capabilities, "_load_config", return_value=config):
+                assert _get_model_capabilities("gemini-pro")["thinkingType"] == "level"
+                assert (
+                    _get_model_capabilities("gemini-flash")["thinkingType"] == "budget"
+                )
+        finally:
+            model_capabilities.reload_config()
+
+    @pytest.mark.parametrize(
+        "pattern, model_id",
+        [
+            ("(?i)gemini-pro", "gemini-pro"),  # inline global flag
+            ("(?P<m0>gemini)-pro", "gemini-pro"),  # clashes with a generated name
+            ("(e)\\1", "geemini"),  # numbered backreference
+        ],
+    )
+    def test_patterns_that_cannot_be_joined_still_match(self, pattern, model_id):
+        """Patterns valid alone but not when joined are matched one by one."""
+        config = {
+            "categories": {
+                "first": {"thinkingType": "level"},
+                "second": {"thinkingType": "budget"},
+            },
+            "matchers": [
+                {"pattern": pattern, "category": "first"},
+                {"pattern": "gemini", "category": "second"},
+            ],
+        }
+        model_capabilities.reload_config()
+        try:
+            with patch.object(model_capabilities, "_load_config", return_value=config):
+                assert _get_model_capabilities(model_id)["thinkingType"] == "level"
+                assert (
+                    _get_model_capabilities("gemini-flash")["thinkingType"] == "budget"
+                )
+        finally:
+            model_capabilities.reload_config()
+
+    def test_lookup_is_cached_and_returns_copies(self):
+        """Repeated lookups reuse the cached match but hand out fresh dicts."""
+        model_capabilities.reload_config()
+        first = _get_model_capabilities("gemini-3-flash")
+        first["levels"] = []
+        second = _get_model_capabilities("GEMINI-3-FLASH")
+
+        assert second["levels"] == ["minimal", "low", "medium", "high"]
+        assert model_capabilities._match_category.cache_info().hits == 1
+
+    def test_default_lookup_returns_copies(self):
+        """Mutating a default result does not leak into later lookups."""
+        config = {"categories": {}, "matchers": []}
+        model_capabilities.reload_config()
+        try:
+            with patch.object(model_capabilities, "_load_config", return_value=config):
+                first = _get_model_capabilities("unknown-model")
+                first["thinkingType"] = "level"
+                second = _get_model_capabilities("unknown-model")
+        finally:
+            model_capabilities.reload_config()
+
+        assert second == {"thinkingType": "none", "supportsGoogleSearch": True}
+
 
 # ==================== API Endpoint TESTS ====================
 
@@ -177,3 +258,40 @@ class TestModelCapabilitiesEndpoints:
         data = response.json()
         assert data["thinkingType"] == "none"
         assert data["supportsGoogleSearch"] is True
+
+    @pytest.mark.asyncio
+    async def test_responses_are_encoded_once(self, client):
+        """Response bodies are encoded once and rebuilt after reload_config()."""
+        model_capabilities.reload_config()
+
+        first = client.get("/api/model-capabilities/gemini-2.5-pro")
+        second = client.get("/api/model-capabilities/gemini-2.5-pro-preview")
+        client.get("/api/model-capabilities")
+        client.get("/api/model-capabilities")
+
+        assert first.content == second.content
+        assert first.json() == _get_model_capabilities("gemini-2.5-pro")
+        assert model_capabilities._category_body.cache_info().hits == 1
+        assert model_capabilities._config_body.cache_info().misses == 1
+
+        model_capabilities.reload_config()
+        assert model_capabilities._category_body.cache_info().currsize == 0
+
+    @pytest.mark.asyncio
+    async def test_get_model_capabilities_etag(self, client):
+        """The full config carries an ETag and answers 304 when it matches."""
+        response = client.get("/api/model-capabilities")
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and len(etag) == 18
+        assert "max-age=300" in response.headers["cache-control"]
+
+        cached = client.get("/api/model-capabilities", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        stale = client.get(
+            "/api/model-capabilities", headers={"If-None-Match": '"0000000000000000"'}
+        )
+        assert stale.status_code == 200
+        assert stale.json() == response.json()
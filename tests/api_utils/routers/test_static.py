@@ -2,121 +2,156 @@
 High-quality tests for api_utils/routers/static.py - Static file serving.
 
 Focus: Test static file endpoints with both success and error paths.
-Strategy: Mock Path.exists() to control file existence, test actual routing logic.
+Strategy: Mock Path.stat() to control file existence, test actual routing logic.
 """
 
+import os
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
+
+# A real regular-file stat result to stand in for build output
+_FILE_STAT = os.stat(__file__)
+
+
+@pytest.fixture
+def mock_logger():
+    with patch("api_utils.routers.static.logger") as logger:
+        yield logger
+
+
+def _make_request(headers=None):
+    raw_headers = [
+        (name.lower().encode(), value.encode())
+        for name, value in (headers or {}).items()
+    ]
+    return Request({"type": "http", "method": "GET", "headers": raw_headers})
 
 
 class TestReadIndex:
     """Tests for read_index endpoint."""
 
     @pytest.mark.asyncio
-    async def test_read_index_react_exists(self):
+    async def test_read_index_react_exists(self, mock_logger):
         """
         Test scenario: React index.html exists
         Expected: Return FileResponse with React index.html
         """
         from api_utils.routers.static import read_index
 
-        mock_logger = MagicMock()
-
-        with patch.object(Path, "exists", return_value=True):
-            response = await read_index(logger=mock_logger)
+        with patch.object(Path, "stat", return_value=_FILE_STAT):
+            response = await read_index(_make_request())
 
             assert response is not None
 
     @pytest.mark.asyncio
-    async def test_read_index_not_built(self):
+    async def test_read_index_not_built(self, mock_logger):
         """
         Test scenario: React build does not exist
         Expected: Return 503 error (Service Unavailable)
         """
         from api_utils.routers.static import read_index
 
-        mock_logger = MagicMock()
-
-        with patch.object(Path, "exists", return_value=False):
+        with patch.object(Path, "stat", side_effect=FileNotFoundError):
             with pytest.raises(HTTPException) as exc_info:
-                await read_index(logger=mock_logger)
+                await read_index(_make_request())
 
             assert exc_info.value.status_code == 503
             assert "Frontend not built" in exc_info.value.detail
             mock_logger.error.assert_called_once()
 
 
-class TestServeReactAssets:
-    """Tests for serve_react_assets endpoint."""
+class TestReactAssetFiles:
+    """Tests for the StaticFiles mount that serves built assets."""
 
-    @pytest.mark.asyncio
-    async def test_serve_react_assets_js(self):
-        """
-        Test scenario: JS asset exists
-        Expected: Return FileResponse with application/javascript media type
-        """
-        from api_utils.routers.static import serve_react_assets
+    @pytest.fixture
+    def client(self, tmp_path):
+        from starlette.applications import Starlette
+        from starlette.routing import Mount
+        from starlette.testclient import TestClient
 
-        mock_logger = MagicMock()
+        from api_utils.routers.static import ReactAssetFiles
 
-        with patch.object(Path, "exists", return_value=True):
-            response = await serve_react_assets("main.js", logger=mock_logger)
+        assets = tmp_path / "assets"
+        assets.mkdir()
+        for name in ("main.js", "style.css", "main.js.map", "image.svg", "a.woff2"):
+            (assets / name).write_text("x")
 
-            assert response is not None
-            assert response.media_type == "application/javascript"
+        app = Starlette(
+            routes=[Mount("/assets", ReactAssetFiles(directory=str(assets)))]
+        )
+        return TestClient(app)
 
-    @pytest.mark.asyncio
-    async def test_serve_react_assets_css(self):
+    @pytest.mark.parametrize(
+        "filename, media_type",
+        [
+            ("main.js", "application/javascript"),
+            ("style.css", "text/css"),
+            ("main.js.map", "application/json"),
+            ("image.svg", "image/svg+xml"),
+            ("a.woff2", "font/woff2"),
+        ],
+    )
+    def test_media_types(self, client, filename, media_type):
         """
-        Test scenario: CSS asset exists
-        Expected: Return FileResponse with text/css media type
+        Test scenario: Known asset suffixes
+        Expected: Media type from the static module's table
         """
-        from api_utils.routers.static import serve_react_assets
+        response = client.get(f"/assets/{filename}")
 
-        mock_logger = MagicMock()
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(media_type)
 
-        with patch.object(Path, "exists", return_value=True):
-            response = await serve_react_assets("style.css", logger=mock_logger)
+    def test_immutable_cache_headers(self, client):
+        """
+        Test scenario: Hashed build asset is served
+        Expected: Long-lived immutable Cache-Control
+        """
+        response = client.get("/assets/main.js")
 
-            assert response is not None
-            assert response.media_type == "text/css"
+        assert "immutable" in response.headers["cache-control"]
 
-    @pytest.mark.asyncio
-    async def test_serve_react_assets_map(self):
+    def test_not_found(self, client):
         """
-        Test scenario: Source map asset exists
-        Expected: Return FileResponse with application/json media type
+        Test scenario: Asset not found
+        Expected: Return 404 error
         """
-        from api_utils.routers.static import serve_react_assets
+        assert client.get("/assets/missing.js").status_code == 404
 
-        mock_logger = MagicMock()
+    def test_if_none_match_returns_304(self, client):
+        """
+        Test scenario: Client revalidates with the ETag it was given
+        Expected: 304 keeping the immutable Cache-Control header
+        """
+        etag = client.get("/assets/main.js").headers["etag"]
 
-        with patch.object(Path, "exists", return_value=True):
-            response = await serve_react_assets("main.js.map", logger=mock_logger)
+        response = client.get("/assets/main.js", headers={"If-None-Match": etag})
 
-            assert response is not None
-            assert response.media_type == "application/json"
+        assert response.status_code == 304
+        assert "immutable" in response.headers["cache-control"]
 
     @pytest.mark.asyncio
-    async def test_serve_react_assets_not_found(self):
+    async def test_traversal_blocked(self, tmp_path):
         """
-        Test scenario: Asset not found
-        Expected: Return 404 error
+        Test scenario: Attempt directory traversal attack
+        Expected: Files outside the assets directory are not served
         """
-        from api_utils.routers.static import serve_react_assets
+        from starlette.exceptions import HTTPException as StarletteHTTPException
 
-        mock_logger = MagicMock()
+        from api_utils.routers.static import ReactAssetFiles
 
-        with patch.object(Path, "exists", return_value=False):
-            with pytest.raises(HTTPException) as exc_info:
-                await serve_react_assets("missing.js", logger=mock_logger)
+        assets = tmp_path / "assets"
+        assets.mkdir()
+        (tmp_path / "secret.txt").write_text("secret")
+        files = ReactAssetFiles(directory=str(assets))
+        scope = {"type": "http", "method": "GET", "headers": []}
+
+        with pytest.raises(StarletteHTTPException) as exc_info:
+            await files.get_response("../secret.txt", scope)
 
-            assert exc_info.value.status_code == 404
-            assert "missing.js" in exc_info.value.detail
-            mock_logger.debug.assert_called_once()
+        assert exc_info.value.status_code == 404
 
 
 class TestGetStaticFilesApp:
@@ -149,60 +184,45 @@ class TestGetStaticFilesApp:
             assert result is None
 
 
-class TestDirectoryTraversalProtection:
-    """Tests for directory traversal attack prevention."""
+class TestConditionalRequests:
+    """Tests for ETag / Last-Modified revalidation of the index."""
+
+    @pytest.fixture
+    def dist(self, tmp_path):
+        (tmp_path / "index.html").write_text("<html></html>")
+        with patch("api_utils.routers.static._REACT_DIST", tmp_path):
+            yield tmp_path
 
     @pytest.mark.asyncio
-    async def test_serve_react_assets_traversal_blocked(self):
+    async def test_index_sends_validators(self, dist):
         """
-        Test scenario: Attempt directory traversal attack
-        Expected: Return 403 error
+        Test scenario: Plain GET of index.html
+        Expected: Weak mtime-size ETag and Last-Modified headers
         """
-        from api_utils.routers.static import serve_react_assets
-
-        mock_logger = MagicMock()
-
-        # First mock: file exists, second mock for resolve().relative_to() failure
-        with patch.object(Path, "exists", return_value=True):
-            # When the resolved path is outside assets dir, relative_to raises ValueError
-            with patch.object(Path, "resolve") as mock_resolve:
-                mock_resolved = MagicMock()
-                mock_resolved.relative_to.side_effect = ValueError(
-                    "Not a relative path"
-                )
-                mock_resolve.return_value = mock_resolved
+        from api_utils.routers.static import read_index
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await serve_react_assets("../../../etc/passwd", logger=mock_logger)
+        st = (dist / "index.html").stat()
+        response = await read_index(_make_request())
 
-                assert exc_info.value.status_code == 403
-                assert "Access denied" in exc_info.value.detail
-                mock_logger.warning.assert_called_once()
+        assert response.status_code == 200
+        assert response.headers["etag"] == f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        assert "last-modified" in response.headers
 
     @pytest.mark.asyncio
-    async def test_serve_react_assets_additional_mime_types(self):
+    async def test_index_if_none_match_returns_304(self, dist):
         """
-        Test scenario: Additional MIME type support
-        Expected: Correctly identify more file types
+        Test scenario: Client revalidates with the current ETag
+        Expected: 304 without a body
         """
-        from api_utils.routers.static import serve_react_assets
-
-        mock_logger = MagicMock()
-
-        test_cases = [
-            ("image.svg", "image/svg+xml"),
-            ("image.png", "image/png"),
-            ("font.woff2", "font/woff2"),
-        ]
+        from api_utils.routers.static import read_index
 
-        for filename, expected_media_type in test_cases:
-            with patch.object(Path, "exists", return_value=True):
-                with patch.object(Path, "resolve") as mock_resolve:
-                    mock_resolved = MagicMock()
-                    mock_resolved.relative_to.return_value = Path(filename)
-                    mock_resolve.return_value = mock_resolved
+        first = await read_index(_make_request())
+        etag = first.headers["etag"]
 
-                    response = await serve_react_assets(filename, logger=mock_logger)
+        response = await read_index(_make_request({"If-None-Match": etag}))
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
 
-                    assert response is not None
-                    assert response.media_type == expected_media_type
+        stale = await read_index(_make_request({"If-None-Match": 'W/"0-0"'}))
+        assert stale.status_code == 200
@@ -246,14 +246,17 @@ def test_initialize_globals():
     # Ensure state starts clean
     state.request_queue = None
     state.processing_lock = None
+    old_switching_lock = state.model_switching_lock
+    old_params_lock = state.params_cache_lock
 
     with patch("api_utils.auth_utils.initialize_keys") as mock_init_keys:
         _initialize_globals()
 
         assert state.request_queue is not None
         assert state.processing_lock is not None
-        assert state.model_switching_lock is not None
-        assert state.params_cache_lock is not None
+        # Fresh per lifespan, not the ones created at import
+        assert state.model_switching_lock is not old_switching_lock
+        assert state.params_cache_lock is not old_params_lock
         mock_init_keys.assert_called_once()
 
 
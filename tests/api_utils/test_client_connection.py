@@ -5,8 +5,10 @@ import pytest
 from fastapi import HTTPException, Request
 
 from api_utils.client_connection import (
+    ClientConnectionWatcher,
     check_client_connection,
     setup_disconnect_monitoring,
+    watch_queued_disconnect,
 )
 from models import ClientDisconnectedError
 
@@ -375,3 +377,76 @@ async def test_check_client_disconnected_not_disconnected():
             await task
         except asyncio.CancelledError:
             pass
+
+
+@pytest.mark.asyncio
+async def test_watch_queued_disconnect_marks_item():
+    """An ASGI disconnect while queued cancels the item and fails its future."""
+    request = MagicMock(spec=Request)
+    request.receive = AsyncMock(return_value={"type": "http.disconnect"})
+    item = {
+        "req_id": "req1",
+        "http_request": request,
+        "result_future": asyncio.Future(),
+        "cancelled": False,
+    }
+
+    await watch_queued_disconnect(item, MagicMock())
+
+    assert item["cancelled"] is True
+    with pytest.raises(HTTPException) as exc:
+        item["result_future"].result()
+    assert exc.value.status_code == 499
+
+
+@pytest.mark.asyncio
+async def test_watch_queued_disconnect_stops_on_unexpected_message():
+    """Messages other than request body chunks end the watch untouched."""
+    request = MagicMock(spec=Request)
+    request.receive = AsyncMock(return_value={"type": "websocket.connect"})
+    item = {
+        "req_id": "req1",
+        "http_request": request,
+        "result_future": asyncio.Future(),
+        "cancelled": False,
+    }
+
+    await watch_queued_disconnect(item, MagicMock())
+
+    assert item["cancelled"] is False
+    assert not item["result_future"].done()
+
+
+@pytest.mark.asyncio
+async def test_client_connection_watcher_shares_one_task():
+    """Concurrent registrations are polled by a single task that stops when idle."""
+    watcher = ClientConnectionWatcher(interval=0.01)
+    polls = {"a": 0, "b": 0}
+
+    def make_on_poll(key):
+        def on_poll(result):
+            polls[key] += 1
+            return False
+
+        return on_poll
+
+    with patch(
+        "api_utils.client_connection.check_client_connection",
+        new_callable=AsyncMock,
+        return_value=True,
+    ):
+        handle_a = watcher.register("a", MagicMock(spec=Request), make_on_poll("a"))
+        task = watcher._task
+        handle_b = watcher.register("b", MagicMock(spec=Request), make_on_poll("b"))
+        assert watcher._task is task
+
+        await asyncio.sleep(0.05)
+        assert polls["a"] > 0 and polls["b"] > 0
+
+        handle_a.cancel()
+        handle_b.cancel()
+        await asyncio.sleep(0)
+
+    assert watcher._task is None
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from api_utils.fast_queue import FastQueue
+
+
+@pytest.mark.asyncio
+async def test_fifo_order_and_size():
+    queue: FastQueue[int] = FastQueue()
+    assert queue.empty()
+
+    for i in range(3):
+        await queue.put(i)
+
+    assert queue.qsize() == 3
+    assert [await queue.get() for _ in range(3)] == [0, 1, 2]
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_get_nowait_raises_when_empty():
+    queue: FastQueue[int] = FastQueue()
+    with pytest.raises(asyncio.QueueEmpty):
+        queue.get_nowait()
+
+
+@pytest.mark.asyncio
+async def test_get_blocks_until_put():
+    queue: FastQueue[str] = FastQueue()
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+
+    queue.put_nowait("item")
+
+    assert await asyncio.wait_for(getter, timeout=1.0) == "item"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_get_does_not_lose_items():
+    queue: FastQueue[str] = FastQueue()
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    getter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await getter
+
+    queue.put_nowait("item")
+
+    assert queue.get_nowait() == "item"
+
+
+@pytest.mark.asyncio
+async def test_task_done_accounting():
+    queue: FastQueue[int] = FastQueue()
+    queue.put_nowait(1)
+    queue.get_nowait()
+    queue.task_done()
+
+    with pytest.raises(ValueError):
+        queue.task_done()
+
+
+@pytest.mark.asyncio
+async def test_underlying_deque_is_inspectable():
+    queue: FastQueue[int] = FastQueue()
+    queue.put_nowait(1)
+    queue.put_nowait(2)
+
+    assert list(queue._queue) == [1, 2]
+    assert queue.qsize() == 2
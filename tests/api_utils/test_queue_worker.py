@@ -0,0 +1,344 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from api_utils.queue_worker import (
+    _check_queue_disconnects,
+    _fail_pending,
+    _periodic_disconnect_check,
+    _wait_for_completion,
+    queue_worker,
+)
+
+
+def _make_item(req_id: str, disconnected: bool = False, cancelled: bool = False):
+    http_request = MagicMock()
+    http_request.is_disconnected = AsyncMock(return_value=disconnected)
+    return {
+        "req_id": req_id,
+        "http_request": http_request,
+        "result_future": asyncio.Future(),
+        "cancelled": cancelled,
+    }
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_marks_in_place():
+    """Disconnected items are cancelled without changing queue order."""
+    queue: asyncio.Queue = asyncio.Queue()
+    items = [
+        _make_item("a"),
+        _make_item("b", disconnected=True),
+        _make_item("c"),
+    ]
+    for item in items:
+        queue.put_nowait(item)
+
+    await _check_queue_disconnects(queue, MagicMock())
+
+    assert queue.qsize() == 3
+    assert [queue.get_nowait()["req_id"] for _ in range(3)] == ["a", "b", "c"]
+    assert items[1]["cancelled"] is True
+    with pytest.raises(HTTPException) as exc:
+        items[1]["result_future"].result()
+    assert exc.value.status_code == 499
+    assert not items[0]["result_future"].done()
+    assert not items[2]["result_future"].done()
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_skips_cancelled_items():
+    """Already-cancelled items are not probed again."""
+    queue: asyncio.Queue = asyncio.Queue()
+    item = _make_item("a", disconnected=True, cancelled=True)
+    queue.put_nowait(item)
+    queue.put_nowait(_make_item("b"))
+
+    await _check_queue_disconnects(queue, MagicMock())
+
+    item["http_request"].is_disconnected.assert_not_called()
+    assert not item["result_future"].done()
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_skips_single_item():
+    """A lone queued item is left for the worker's dequeue-time check."""
+    queue: asyncio.Queue = asyncio.Queue()
+    item = _make_item("a", disconnected=True)
+    queue.put_nowait(item)
+
+    await _check_queue_disconnects(queue, MagicMock())
+
+    item["http_request"].is_disconnected.assert_not_called()
+    assert item["cancelled"] is False
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_skips_watched_items():
+    """Items with a live disconnect watcher are left to the watcher."""
+    queue: asyncio.Queue = asyncio.Queue()
+    watcher = asyncio.create_task(asyncio.sleep(10))
+    item = _make_item("a", disconnected=True)
+    item["disconnect_watcher"] = watcher
+    queue.put_nowait(item)
+    queue.put_nowait(_make_item("b"))
+
+    await _check_queue_disconnects(queue, MagicMock())
+
+    item["http_request"].is_disconnected.assert_not_called()
+    assert item["cancelled"] is False
+    watcher.cancel()
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_respects_sweep_limit():
+    """Only the head of the queue is inspected per sweep."""
+    queue: asyncio.Queue = asyncio.Queue()
+    items = [_make_item(f"r{i}", disconnected=True) for i in range(12)]
+    for item in items:
+        queue.put_nowait(item)
+
+    await _check_queue_disconnects(queue, MagicMock())
+
+    assert [item["cancelled"] for item in items] == [True] * 10 + [False] * 2
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_logs_probe_errors():
+    """Errors from a single probe are logged and do not cancel the item."""
+    queue: asyncio.Queue = asyncio.Queue()
+    item = _make_item("a")
+    item["http_request"].is_disconnected = AsyncMock(side_effect=Exception("boom"))
+    queue.put_nowait(item)
+    queue.put_nowait(_make_item("b"))
+    logger = MagicMock()
+
+    await _check_queue_disconnects(queue, logger)
+
+    assert item["cancelled"] is False
+    logger.error.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_periodic_disconnect_check_sweeps_queue():
+    """The background sweep cancels disconnected items without a dequeue."""
+    queue: asyncio.Queue = asyncio.Queue()
+    item = _make_item("a", disconnected=True)
+    queue.put_nowait(item)
+    queue.put_nowait(_make_item("b"))
+
+    task = asyncio.create_task(
+        _periodic_disconnect_check(queue, MagicMock(), interval=0.01)
+    )
+    try:
+        for _ in range(50):
+            if item["cancelled"]:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert item["cancelled"] is True
+    assert queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_check_queue_disconnects_probes_concurrently():
+    """All probes are in flight at once instead of being awaited serially."""
+    queue: asyncio.Queue = asyncio.Queue()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_probe():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return False
+
+    for i in range(3):
+        item = _make_item(f"r{i}")
+        item["http_request"].is_disconnected = slow_probe
+        queue.put_nowait(item)
+
+    await _check_queue_disconnects(queue, MagicMock())
+
+    assert max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_returns_when_waiter_finishes():
+    event = asyncio.Event()
+    monitor = asyncio.create_task(asyncio.sleep(10))
+    asyncio.get_running_loop().call_later(0.01, event.set)
+
+    await _wait_for_completion(event.wait(), monitor, timeout=1.0)
+
+    assert not monitor.done()
+    monitor.cancel()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_wakes_when_monitor_resolves_waiter():
+    event = asyncio.Event()
+
+    async def monitor_fn():
+        await asyncio.sleep(0.01)
+        event.set()
+
+    monitor = asyncio.create_task(monitor_fn())
+
+    await _wait_for_completion(event.wait(), monitor, timeout=1.0)
+
+    assert event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_keeps_waiting_if_monitor_dies():
+    event = asyncio.Event()
+
+    async def failing_monitor():
+        raise RuntimeError("monitor crashed")
+
+    monitor = asyncio.create_task(failing_monitor())
+    asyncio.get_running_loop().call_later(0.05, event.set)
+
+    await _wait_for_completion(event.wait(), monitor, timeout=1.0)
+
+    assert event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_times_out():
+    monitor = asyncio.create_task(asyncio.sleep(10))
+
+    with pytest.raises(asyncio.TimeoutError):
+        await _wait_for_completion(asyncio.Event().wait(), monitor, timeout=0.01)
+
+    monitor.cancel()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_completion_propagates_future_exception():
+    future: asyncio.Future = asyncio.Future()
+    monitor = asyncio.create_task(asyncio.sleep(10))
+    future.set_exception(HTTPException(status_code=499, detail="gone"))
+
+    with pytest.raises(HTTPException):
+        await _wait_for_completion(asyncio.shield(future), monitor, timeout=1.0)
+
+    monitor.cancel()
+
+
+@pytest.mark.asyncio
+async def test_fail_pending_sets_exception_on_pending_future():
+    future: asyncio.Future = asyncio.Future()
+
+    _fail_pending(future, lambda: HTTPException(status_code=499, detail="gone"))
+
+    with pytest.raises(HTTPException):
+        future.result()
+
+
+@pytest.mark.asyncio
+async def test_fail_pending_skips_resolved_future_without_building_exception():
+    future: asyncio.Future = asyncio.Future()
+    future.set_result("ok")
+    factory = MagicMock()
+
+    _fail_pending(future, factory)
+    _fail_pending(None, factory)
+
+    factory.assert_not_called()
+    assert future.result() == "ok"
+
+
+def _done_item(req_id: str):
+    """A queue item whose future is already resolved, so the worker skips it."""
+    item = _make_item(req_id)
+    item["result_future"].set_result("ok")
+    item["request_data"] = MagicMock(stream=False)
+    return item
+
+
+async def _run_worker(get_side_effect, connection_check=None):
+    """Drive queue_worker over a scripted queue and return the backoff sleeps."""
+    queue = MagicMock()
+    queue.get = AsyncMock(side_effect=get_side_effect)
+    fake_state = MagicMock(
+        request_queue=queue,
+        processing_lock=asyncio.Lock(),
+        current_ai_studio_model_id=None,
+    )
+    fake_global = MagicMock(
+        IS_SHUTTING_DOWN=threading.Event(),
+        IS_QUOTA_EXCEEDED=False,
+        NEEDS_ROTATION=False,
+    )
+    sleep = AsyncMock()
+    with (
+        patch("api_utils.queue_worker.state", fake_state),
+        patch("api_utils.queue_worker.GlobalState", fake_global),
+        patch("api_utils.queue_worker._periodic_disconnect_check", AsyncMock()),
+        patch("api_utils.queue_worker.clear_stream_queue", AsyncMock()),
+        patch("api_utils.queue_worker.maybe_refresh_on_request", AsyncMock()),
+        patch(
+            "api_utils.queue_worker._test_client_connection",
+            connection_check or AsyncMock(return_value=True),
+        ),
+        patch("api_utils.queue_worker.random.random", return_value=0.0),
+        patch("api_utils.queue_worker.asyncio.sleep", sleep),
+    ):
+        await queue_worker()
+    return [call.args[0] for call in sleep.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_worker_backoff_grows_while_dequeue_fails():
+    delays = await _run_worker(
+        [RuntimeError("queue"), RuntimeError("queue"), RuntimeError("queue")]
+        + [asyncio.CancelledError()]
+    )
+
+    assert delays == [1.0, 2.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_worker_backoff_resets_after_successful_request():
+    delays = await _run_worker(
+        [
+            RuntimeError("queue"),
+            RuntimeError("queue"),
+            _done_item("ok"),
+            RuntimeError("queue"),
+            asyncio.CancelledError(),
+        ]
+    )
+
+    assert delays == [1.0, 2.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_worker_request_error_does_not_back_off():
+    bad = _make_item("bad")
+    bad["request_data"] = MagicMock(stream=False)
+
+    async def connection_check(req_id, _request):
+        if req_id == "bad":
+            raise RuntimeError("boom")
+        return True
+
+    delays = await _run_worker(
+        [bad, _done_item("ok"), asyncio.CancelledError()],
+        connection_check=AsyncMock(side_effect=connection_check),
+    )
+
+    assert delays == []
+    with pytest.raises(HTTPException):
+        bad["result_future"].result()
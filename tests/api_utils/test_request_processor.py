@@ -15,6 +15,7 @@ Mock Budget: <50 (down from 103)
 
 import asyncio
 import json
+import threading
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -22,9 +23,11 @@ import pytest
 from fastapi import HTTPException, Request
 from playwright.async_api import Error as PlaywrightAsyncError
 
-from api_utils.context_types import RequestContext
+from api_utils.context_types import ProcessResult, RequestContext
 from api_utils.request_processor import (
     _analyze_model_requirements,
+    _consolidate_content,
+    _get_submit_button_locator,
     _handle_model_switch_failure,
     _prepare_and_validate_request,
     _validate_page_status,
@@ -35,6 +38,34 @@ from models import ChatCompletionRequest, Message
 # ==================== Unit Tests for Helper Functions ====================
 
 
+def test_get_submit_button_locator_reuses_locator_per_page():
+    """The submit locator is built once per page and rebuilt for a new page."""
+    page = MagicMock()
+    other_page = MagicMock()
+
+    first = _get_submit_button_locator(page)
+    second = _get_submit_button_locator(page)
+    third = _get_submit_button_locator(other_page)
+
+    assert first is second
+    page.locator.assert_called_once()
+    assert third is other_page.locator.return_value
+
+
+@pytest.mark.parametrize(
+    "reasoning,body,expected",
+    [
+        ("  think ", " answer ", "think\n\nanswer"),
+        (None, "answer", "answer"),
+        ("think", "   ", "think"),
+        (None, None, ""),
+    ],
+)
+def test_consolidate_content(reasoning, body, expected):
+    """Reasoning and body are stripped and joined by a blank line."""
+    assert _consolidate_content(reasoning, body) == expected
+
+
 class TestAnalyzeModelRequirements:
     """Unit tests for _analyze_model_requirements helper function."""
 
@@ -544,8 +575,8 @@ class TestProcessRequestRefactoredFlow:
             req_id, request_data, http_request, result_future
         )
 
-        # Should return None (early exit)
-        assert result is None
+        # Should return an empty result (early exit)
+        assert result == (None, None, None)
 
         # Future should be set with 499 error
         assert result_future.done()
@@ -702,6 +733,40 @@ class TestAuxiliaryStreamResponse:
             assert content["choices"][0]["message"]["content"] == "Hello world"
             assert content["usage"]["total_tokens"] == 15
 
+    @pytest.mark.asyncio
+    async def test_auxiliary_stream_streaming_returns_process_result(
+        self, mock_env, make_request_context
+    ):
+        """Streaming via the auxiliary stream hands back a ProcessResult."""
+        from api_utils.request_processor import _handle_auxiliary_stream_response
+
+        request = ChatCompletionRequest(
+            messages=[Message(role="user", content="Hello")],
+            model="gemini-1.5-pro",
+            stream=True,
+        )
+        context = make_request_context(req_id="test-req-id")
+        result_future = asyncio.Future()
+        submit_locator = MagicMock()
+        check_disco = MagicMock()
+
+        with patch("api_utils.request_processor.resilient_stream_generator"):
+            result = await _handle_auxiliary_stream_response(
+                "test-req-id",
+                request,
+                context,
+                result_future,
+                submit_locator,
+                check_disco,
+                timeout=30.0,
+            )
+
+        assert isinstance(result, ProcessResult)
+        assert isinstance(result.completion_event, asyncio.Event)
+        assert result.submit_btn_loc is submit_locator
+        assert result.client_disco_checker is check_disco
+        assert result_future.done()
+
     @pytest.mark.asyncio
     async def test_auxiliary_stream_non_streaming_with_function_calls(
         self, mock_env, make_request_context
@@ -1212,7 +1277,7 @@ async def test_prepare_and_validate_request_with_tools(
         patch(
             "api_utils.request_processor.maybe_execute_tools", new_callable=AsyncMock
         ) as mock_tools,
-        patch("api_utils.tools_registry.register_runtime_tools") as mock_register,
+        patch("api_utils.request_processor.register_runtime_tools") as mock_register,
     ):
         mock_tools.return_value = tool_results
 
@@ -1266,6 +1331,41 @@ async def test_prepare_and_validate_request_attachments(
         mock_collect.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_prepare_and_validate_request_collects_attachments_off_loop(
+    mock_request, mock_check_disconnected
+):
+    """Attachment collection (stat calls, data: URL writes) runs in a worker thread."""
+    loop_thread = threading.get_ident()
+    seen_threads = []
+
+    def fake_collect(request, req_id, attachments):
+        seen_threads.append(threading.get_ident())
+        return []
+
+    with (
+        patch("api_utils.request_processor.validate_chat_request"),
+        patch(
+            "api_utils.request_processor.prepare_combined_prompt",
+            return_value=("prompt", []),
+        ),
+        patch(
+            "api_utils.request_processor.maybe_execute_tools",
+            new_callable=AsyncMock,
+            return_value=None,
+        ),
+        patch(
+            "api_utils.request_processor.collect_and_validate_attachments",
+            side_effect=fake_collect,
+        ),
+    ):
+        await _prepare_and_validate_request(
+            "req1", mock_request, mock_check_disconnected
+        )
+
+    assert seen_threads and seen_threads[0] != loop_thread
+
+
 @pytest.mark.asyncio
 async def test_handle_response_processing_aux_stream(
     mock_request, mock_context, mock_check_disconnected
@@ -1325,6 +1425,34 @@ async def test_handle_response_processing_playwright(
         mock_pw.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_handle_response_processing_uses_caller_stream_decision(
+    mock_request, mock_context, mock_check_disconnected
+):
+    with (
+        patch("api_utils.request_processor.get_environment_variable") as mock_env,
+        patch(
+            "api_utils.request_processor._handle_playwright_response",
+            new_callable=AsyncMock,
+        ) as mock_pw,
+    ):
+        await _handle_response_processing(
+            "req1",
+            mock_request,
+            AsyncMock(),
+            mock_context,
+            asyncio.Future(),
+            MagicMock(),
+            mock_check_disconnected,
+            100,
+            30.0,
+            use_stream=False,
+        )
+
+    mock_env.assert_not_called()
+    mock_pw.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_handle_auxiliary_stream_response_streaming(
     mock_request, mock_context, mock_check_disconnected
@@ -1515,6 +1643,49 @@ async def test_handle_playwright_response_non_streaming(
         assert mock_future.done()
 
 
+@pytest.mark.asyncio
+async def test_handle_playwright_response_reuses_page_controller(
+    mock_request, mock_context, mock_check_disconnected
+):
+    mock_request.stream = False
+    mock_future = asyncio.Future()
+    mock_page = AsyncMock()
+    page_controller = MagicMock()
+    page_controller.page = mock_page
+    page_controller.get_response_with_integrity_check = AsyncMock(
+        return_value={"content": "response content"}
+    )
+
+    with (
+        patch(
+            "api_utils.request_processor.locate_response_elements",
+            new_callable=AsyncMock,
+        ),
+        patch("api_utils.request_processor.PageController") as mock_pc_cls,
+        patch("api_utils.request_processor.calculate_usage_stats", return_value={}),
+        patch(
+            "api_utils.request_processor.build_chat_completion_response_json",
+            return_value={"id": "resp1"},
+        ),
+    ):
+        result = await _handle_playwright_response(
+            "req1",
+            mock_request,
+            mock_page,
+            mock_context,
+            mock_future,
+            MagicMock(),
+            mock_check_disconnected,
+            prompt_length=100,
+            timeout=30.0,
+            page_controller=page_controller,
+        )
+
+    assert isinstance(result, dict)
+    mock_pc_cls.assert_not_called()
+    page_controller.get_response_with_integrity_check.assert_awaited_once()
+
+
 class TestCleanupRequestResources:
     """Tests for _cleanup_request_resources helper function."""
 
@@ -1544,6 +1715,42 @@ class TestCleanupRequestResources:
             mock_rmtree.assert_called_once()
             assert mock_event.is_set()
 
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_watcher_handle(self):
+        """The connection watcher handle is cancelled without being awaited."""
+        handle = asyncio.get_running_loop().create_future()
+        mock_future = asyncio.Future()
+        mock_future.set_result(MagicMock())
+
+        with patch("os.path.isdir", return_value=False):
+            await _cleanup_request_resources("req1", handle, None, mock_future, False)
+
+        assert handle.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_directory_off_event_loop(self):
+        """The upload directory is removed in a worker thread."""
+        import threading
+
+        loop_thread = threading.get_ident()
+        rmtree_threads = []
+        mock_future = asyncio.Future()
+        mock_future.set_result(MagicMock())
+
+        with (
+            patch("os.path.isdir", return_value=True),
+            patch(
+                "shutil.rmtree",
+                side_effect=lambda *a, **k: rmtree_threads.append(
+                    threading.get_ident()
+                ),
+            ),
+        ):
+            await _cleanup_request_resources("req1", None, None, mock_future, False)
+
+        assert len(rmtree_threads) == 1
+        assert rmtree_threads[0] != loop_thread
+
     @pytest.mark.asyncio
     async def test_cleanup_directory_removal_exception(self):
         """Test that directory removal exceptions are caught and logged."""
@@ -1599,7 +1806,7 @@ async def test_process_request_refactored_client_disconnected_early(
             "req1", mock_request, mock_http_request, mock_future
         )
 
-        assert result is None
+        assert result == (None, None, None)
         exc = mock_future.exception()
         assert exc is not None
         assert isinstance(exc, HTTPException)
@@ -1690,7 +1897,7 @@ async def test_process_request_refactored_success(
         # Setup response processing result
         mock_event = asyncio.Event()
         mock_locator = MagicMock()
-        patches["_handle_response_processing"].return_value = (
+        patches["_handle_response_processing"].return_value = ProcessResult(
             mock_event,
             mock_locator,
             mock_check_disconnected,
@@ -1740,7 +1947,7 @@ class TestProcessRequestRefactoredExceptionHandling:
                 return_value="3120",
             ),  # Stream enabled
             patch(
-                "api_utils.clear_stream_queue",  # Fixed: patch from api_utils module
+                "api_utils.request_processor.clear_stream_queue",
                 new_callable=AsyncMock,
                 side_effect=Exception("Queue clear failed"),
             ),
@@ -1776,7 +1983,7 @@ class TestProcessRequestRefactoredExceptionHandling:
                 return_value="3120",
             ),
             patch(
-                "api_utils.clear_stream_queue",
+                "api_utils.request_processor.clear_stream_queue",
                 new_callable=AsyncMock,
                 side_effect=asyncio.CancelledError(),
             ),
@@ -320,3 +320,38 @@ def test_build_chat_completion_response_json_usage_stats_structure():
     # Verify: usage_stats passed as is, including extra fields
     assert response["usage"] == usage_stats
     assert response["usage"]["prompt_tokens_details"]["cached_tokens"] == 20
+
+
+def test_build_chat_completion_response_json_keeps_template_intact():
+    """
+    Test scenario: Build two responses from the shared envelope template
+    Expected: Key order is stable and per-response fields never leak between calls
+    """
+    first = build_chat_completion_response_json(
+        req_id="req-a",
+        model_name="model-a",
+        message_payload={"role": "assistant", "content": "a"},
+        finish_reason="stop",
+        usage_stats={"total_tokens": 1},
+        seed=7,
+    )
+    second = build_chat_completion_response_json(
+        req_id="req-b",
+        model_name="model-b",
+        message_payload={"role": "assistant", "content": "b"},
+        finish_reason="length",
+        usage_stats={"total_tokens": 2},
+    )
+
+    assert list(second) == [
+        "id",
+        "object",
+        "created",
+        "model",
+        "choices",
+        "usage",
+        "system_fingerprint",
+    ]
+    assert "seed" not in second
+    assert first["model"] == "model-a"
+    assert second["choices"][0]["message"]["content"] == "b"
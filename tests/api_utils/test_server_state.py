@@ -8,7 +8,7 @@ Strategy: Test clear_debug_logs and backward compatibility __getattr__.
 import pytest
 
 from api_utils import server_state
-from api_utils.server_state import ServerState, state
+from api_utils.server_state import DEBUG_LOG_MAX_ENTRIES, ServerState, state
 
 
 @pytest.fixture
@@ -38,8 +38,11 @@ def test_clear_debug_logs(fresh_state):
     fresh_state.clear_debug_logs()
 
     # Verify: Logs cleared (lines 96-97)
-    assert fresh_state.console_logs == []
-    assert fresh_state.network_log == {"requests": [], "responses": []}
+    assert list(fresh_state.console_logs) == []
+    assert {k: list(v) for k, v in fresh_state.network_log.items()} == {
+        "requests": [],
+        "responses": [],
+    }
 
 
 def test_module_getattr_success():
@@ -82,7 +85,7 @@ def test_state_reset():
     # Verify: Restore initial values
     assert state.is_page_ready is False
     assert state.current_ai_studio_model_id is None
-    assert state.console_logs == []
+    assert list(state.console_logs) == []
 
 
 def test_state_singleton():
@@ -94,3 +97,21 @@ def test_state_singleton():
 
     # Verify: Is the same instance
     assert state is state2
+
+
+def test_debug_logs_keep_most_recent_entries(fresh_state):
+    """
+    Test scenario: More debug entries arrive than the cap
+    Expected: Only the newest DEBUG_LOG_MAX_ENTRIES are kept
+    """
+    for i in range(DEBUG_LOG_MAX_ENTRIES + 10):
+        fresh_state.console_logs.append({"i": i})
+        fresh_state.network_log["requests"].append({"i": i})
+
+    assert len(fresh_state.console_logs) == DEBUG_LOG_MAX_ENTRIES
+    assert fresh_state.console_logs[0] == {"i": 10}
+    assert len(fresh_state.network_log["requests"]) == DEBUG_LOG_MAX_ENTRIES
+
+    fresh_state.clear_debug_logs()
+    assert fresh_state.console_logs.maxlen == DEBUG_LOG_MAX_ENTRIES
+    assert fresh_state.network_log["responses"].maxlen == DEBUG_LOG_MAX_ENTRIES
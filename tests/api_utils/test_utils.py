@@ -763,6 +763,30 @@ def test_collect_and_validate_attachments_top_level(
     assert any("top2.png" in f for f in result)
 
 
+def test_collect_and_validate_attachments_checks_each_path_once(
+    mock_file_utils, mock_logger, tmp_path
+):
+    """A path repeated across attachment fields is stat'ed only once."""
+    _, _, mock_exists = mock_file_utils
+    mock_exists.return_value = True
+
+    shared = str(tmp_path / "shared.png")
+
+    class MockMessage:
+        attachments = [shared]
+        images = [{"path": shared}]
+        files = None
+        media = None
+
+    class MockRequest:
+        messages = [MockMessage()]
+
+    result = collect_and_validate_attachments(MockRequest(), "req1", [shared])
+
+    assert result == [shared, shared, shared]
+    mock_exists.assert_called_once_with(shared)
+
+
 def test_collect_and_validate_attachments_initial_filter(
     mock_file_utils, mock_logger, tmp_path
 ):
@@ -50,6 +50,20 @@ def test_calculate_usage_stats():
     assert stats["total_tokens"] == stats["prompt_tokens"] + stats["completion_tokens"]
 
 
+def test_calculate_usage_stats_accepts_message_models():
+    """Message models give the same counts as their dumped dicts."""
+    messages = [
+        Message(role="user", content="hello"),
+        Message(role="assistant", content="hi"),
+    ]
+
+    stats = calculate_usage_stats(messages, "response", "reasoning")
+
+    assert stats == calculate_usage_stats(
+        [msg.model_dump() for msg in messages], "response", "reasoning"
+    )
+
+
 # --- validation.py tests ---
 
 
@@ -95,7 +109,7 @@ def test_extract_data_url_to_local_success():
 
     with (
         patch.object(state, "logger"),
-        patch("config.UPLOAD_FILES_DIR", "/tmp/uploads"),
+        patch("api_utils.utils_ext.files.UPLOAD_FILES_DIR", "/tmp/uploads"),
         patch("os.makedirs"),
         patch("os.path.exists", return_value=False),
         patch("builtins.open", mock_open()) as mock_file,
@@ -135,7 +149,7 @@ def test_extract_data_url_to_local_exists():
     data_url = "data:text/plain;base64,AAAA"
     with (
         patch.object(state, "logger"),
-        patch("config.UPLOAD_FILES_DIR", "/tmp/uploads"),
+        patch("api_utils.utils_ext.files.UPLOAD_FILES_DIR", "/tmp/uploads"),
         patch("os.makedirs"),
         patch("os.path.exists", return_value=True),
     ):
@@ -148,7 +162,7 @@ def test_save_blob_to_local():
     data = b"test"
     with (
         patch.object(state, "logger"),
-        patch("config.UPLOAD_FILES_DIR", "/tmp/uploads"),
+        patch("api_utils.utils_ext.files.UPLOAD_FILES_DIR", "/tmp/uploads"),
         patch("os.makedirs"),
         patch("os.path.exists", return_value=False),
         patch("builtins.open", mock_open()),
@@ -322,6 +336,8 @@ async def test_use_stream_response_mixed_types():
 
         # Should have 2 chunks (not-json is skipped as it's not a dict and fails JSON parse)
         assert len(chunks) == 2
+        # String frames are decoded before they reach the consumer
+        assert all(isinstance(chunk, dict) for chunk in chunks)
         assert chunks[0]["body"] == "dict-body"
         assert chunks[1]["done"] is True
 
@@ -361,14 +377,13 @@ async def test_clear_stream_queue():
     with (
         patch.object(state, "STREAM_QUEUE", mock_queue),
         patch.object(state, "logger") as mock_logger,
-        patch("asyncio.to_thread", side_effect=mock_queue.get_nowait),
     ):
         await clear_stream_queue()
 
-        # Should have called get_nowait 3 times via to_thread
-        # Verify debug log for queue cleared
+        # Should have drained both items (3 get_nowait calls) in one thread hop
+        assert mock_queue.get_nowait.call_count == 3
         info_calls = [str(c) for c in mock_logger.info.call_args_list]
-        assert any("Stream queue cleared" in c for c in info_calls)
+        assert any("Stream queue cleared. Items: 2" in c for c in info_calls)
 
 
 @pytest.mark.asyncio
@@ -587,11 +602,13 @@ async def test_clear_stream_queue_empty_queue():
 
     with (
         patch.object(state, "STREAM_QUEUE", mock_queue),
-        patch.object(state, "logger"),
-        patch("asyncio.to_thread", side_effect=queue.Empty),
+        patch.object(state, "logger") as mock_logger,
     ):
         await clear_stream_queue()
 
+        mock_queue.get_nowait.assert_called_once()
+        mock_logger.info.assert_not_called()
+
 
 """
 Extended tests for api_utils/utils_ext/files.py - Final coverage completion.
@@ -614,7 +631,7 @@ def test_extract_data_url_to_local_write_failure():
 
     with (
         patch("logging.getLogger") as mock_get_logger,
-        patch("config.UPLOAD_FILES_DIR", "/tmp/uploads"),
+        patch("api_utils.utils_ext.files.UPLOAD_FILES_DIR", "/tmp/uploads"),
         patch("os.makedirs"),
         patch("os.path.exists", return_value=False),
         patch("builtins.open", side_effect=IOError("Disk full")),
@@ -640,7 +657,7 @@ def test_save_blob_to_local_file_exists():
 
     with (
         patch("logging.getLogger") as mock_get_logger,
-        patch("config.UPLOAD_FILES_DIR", "/tmp/uploads"),
+        patch("api_utils.utils_ext.files.UPLOAD_FILES_DIR", "/tmp/uploads"),
         patch("os.makedirs"),
         patch("os.path.exists", return_value=True),  # File exists
     ):
@@ -666,7 +683,7 @@ def test_save_blob_to_local_write_failure():
 
     with (
         patch("logging.getLogger") as mock_get_logger,
-        patch("config.UPLOAD_FILES_DIR", "/tmp/uploads"),
+        patch("api_utils.utils_ext.files.UPLOAD_FILES_DIR", "/tmp/uploads"),
         patch("os.makedirs"),
         patch("os.path.exists", return_value=False),
         patch("builtins.open", side_effect=IOError("Permission denied")),
@@ -0,0 +1,53 @@
+"""
+Tests for api_utils/utils_ext/json_codec.py.
+
+Both the orjson path and the stdlib fallback must produce the same output.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from api_utils.utils_ext import json_codec
+
+PAYLOAD = {"id": "chatcmpl-1", "content": "你好, world", "usage": {"total": 3}}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_bytes_is_compact_utf8(use_orjson):
+    backend = json_codec.orjson if use_orjson else None
+    if use_orjson and backend is None:
+        pytest.skip("orjson not installed")
+
+    with patch.object(json_codec, "orjson", backend):
+        body = json_codec.dumps_bytes(PAYLOAD)
+
+    assert body == json.dumps(
+        PAYLOAD, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_returns_str(use_orjson):
+    backend = json_codec.orjson if use_orjson else None
+    if use_orjson and backend is None:
+        pytest.skip("orjson not installed")
+
+    with patch.object(json_codec, "orjson", backend):
+        text = json_codec.dumps({"expr": "2+2"})
+
+    assert text == '{"expr":"2+2"}'
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_accepts_str_and_bytes(use_orjson):
+    backend = json_codec.orjson if use_orjson else None
+    if use_orjson and backend is None:
+        pytest.skip("orjson not installed")
+
+    with patch.object(json_codec, "orjson", backend):
+        assert json_codec.loads('{"done": true}') == {"done": True}
+        assert json_codec.loads(b'{"done": true}') == {"done": True}
+        with pytest.raises(ValueError):
+            json_codec.loads("not json")
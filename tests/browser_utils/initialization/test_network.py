@@ -3,13 +3,11 @@ Tests for browser_utils/initialization/network.py
 Target coverage: >80% (from baseline 10%)
 """
 
-import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from browser_utils.initialization.network import (
-    _modify_model_list_response,
     _setup_model_list_interception,
     setup_network_interception_and_scripts,
 )
@@ -67,31 +65,39 @@ async def test_route_handler_registered():
 
 
 @pytest.mark.asyncio
-async def test_modify_response_anti_hijack_prefix():
-    """Test anti-hijack prefix handling"""
-    body_with_prefix = b')]}\'\n{"models": []}'
+async def test_route_pattern_limited_to_model_list():
+    """Only the ListModels request is routed to the handler"""
+    mock_context = AsyncMock()
 
-    result = await _modify_model_list_response(body_with_prefix, "https://example.com")
+    await _setup_model_list_interception(mock_context)
 
-    # Should start with prefix
-    assert result.startswith(b")]}'\n")
-    # Should contain valid JSON after prefix (prefix is 5 bytes: ) ] } ' \n)
-    json_part = result[5:]
-    data = json.loads(json_part)
-    assert "models" in data
+    pattern = mock_context.route.call_args[0][0]
+    assert pattern.search(
+        "https://alkalimakersuite-pa.clients6.google.com/$rpc/"
+        "google.internal.alkali.applications.makersuite.v1.MakerSuiteService/ListModels"
+    )
+    assert not pattern.search("https://aistudio.google.com/static/app.js")
+    assert not pattern.search(
+        "https://alkalimakersuite-pa.clients6.google.com/$rpc/"
+        "google.internal.alkali.applications.makersuite.v1.MakerSuiteService/GenerateContent"
+    )
 
 
 @pytest.mark.asyncio
-async def test_modify_response_no_prefix():
-    """Test response without anti-hijack prefix"""
-    body = b'{"models": []}'
+async def test_route_handler_continues_request():
+    """The handler lets the request through without fetching or fulfilling"""
+    mock_context = AsyncMock()
+    await _setup_model_list_interception(mock_context)
+    handler = mock_context.route.call_args[0][1]
+
+    route = AsyncMock()
+    route.request.url = "https://alkalimakersuite-pa.clients6.google.com/ListModels"
 
-    result = await _modify_model_list_response(body, "https://example.com")
+    await handler(route)
 
-    # Should NOT start with prefix
-    assert not result.startswith(b")]}'\n")
-    data = json.loads(result)
-    assert "models" in data
+    route.continue_.assert_awaited_once_with()
+    route.fetch.assert_not_called()
+    route.fulfill.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -126,14 +132,3 @@ async def test_setup_model_list_interception_exception():
 
         # Verify error was logged
         assert mock_logger.error.called
-
-
-@pytest.mark.asyncio
-async def test_modify_response_json_decode_error():
-    """Test JSON decode error handling in _modify_model_list_response"""
-    invalid_json_body = b'{"invalid json'
-
-    # Should return original body on error
-    result = await _modify_model_list_response(invalid_json_body, "https://example.com")
-
-    assert result == invalid_json_body
@@ -21,7 +21,7 @@ def mock_page():
     page.evaluate = AsyncMock()
     page.goto = AsyncMock()
     # locator() is sync, returns sync Locator - use MagicMock
-    # but locator.first.inner_text() is async
+    # but locator.first.text_content() is async
     return page
 
 
@@ -38,9 +38,9 @@ class TestSetModelFromPageDisplay:
         mock_state_obj.parsed_model_list = []
         mock_state_obj.model_list_fetch_event = None
 
-        # Mock the model name locator - correctly chain .first.inner_text
+        # Mock the model name locator - correctly chain .first.text_content
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-2.0-flash")
+        first_locator.text_content = AsyncMock(return_value="gemini-2.0-flash")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
@@ -60,7 +60,7 @@ class TestSetModelFromPageDisplay:
         mock_state_obj.model_list_fetch_event = None
 
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-2.0-flash")
+        first_locator.text_content = AsyncMock(return_value="gemini-2.0-flash")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
@@ -85,7 +85,7 @@ class TestSetModelFromPageDisplay:
         mock_verify_ui.return_value = True
 
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-pro")
+        first_locator.text_content = AsyncMock(return_value="gemini-pro")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
@@ -93,8 +93,31 @@ class TestSetModelFromPageDisplay:
 
         await _set_model_from_page_display(mock_page, set_storage=True)
 
-        # Verify localStorage was written
-        assert mock_page.evaluate.call_count >= 2  # read + write
+        # Verify localStorage was written in a single read-merge-write call
+        mock_page.evaluate.assert_awaited_once()
+        assert "localStorage.setItem" in mock_page.evaluate.await_args.args[0]
+
+    @pytest.mark.asyncio
+    @patch("api_utils.server_state.state")
+    @patch("browser_utils.models.startup.logger")
+    @patch("browser_utils.models.startup._verify_and_apply_ui_state")
+    async def test_warns_when_no_prompt_model_after_merge(
+        self, mock_verify_ui, mock_logger, mock_state_obj, mock_page
+    ):
+        """Blank page display and no stored promptModel logs a warning."""
+        from browser_utils.models.startup import _set_model_from_page_display
+
+        mock_state_obj.model_list_fetch_event = None
+        mock_verify_ui.return_value = True
+        mock_page.locator.return_value.first.text_content = AsyncMock(return_value=" ")
+        mock_page.evaluate.return_value = None  # merged prefs lack promptModel
+
+        await _set_model_from_page_display(mock_page, set_storage=True)
+
+        overrides = mock_page.evaluate.await_args.args[1]["overrides"]
+        assert "promptModel" not in overrides
+        warnings = [str(call) for call in mock_logger.warning.call_args_list]
+        assert any("no existing promptModel" in w for w in warnings)
 
 
 class TestHandleInitialModelStateAndStorage:
@@ -102,10 +125,7 @@ class TestHandleInitialModelStateAndStorage:
 
     @pytest.mark.asyncio
     @patch("api_utils.server_state.state")
-    @patch("browser_utils.models.startup._verify_ui_state_settings")
-    async def test_no_refresh_when_storage_valid(
-        self, mock_verify_ui, mock_state_obj, mock_page
-    ):
+    async def test_no_refresh_when_storage_valid(self, mock_state_obj, mock_page):
         """Test no page refresh when localStorage is valid."""
         from browser_utils.models.startup import _handle_initial_model_state_and_storage
 
@@ -122,13 +142,40 @@ class TestHandleInitialModelStateAndStorage:
             }
         )
         mock_page.evaluate.return_value = valid_prefs
-        mock_verify_ui.return_value = {"needsUpdate": False}
 
         await _handle_initial_model_state_and_storage(mock_page)
 
         # Model should be set from localStorage
         assert mock_state_obj.current_ai_studio_model_id == "gemini-2.0-flash"
 
+    @pytest.mark.asyncio
+    @patch("api_utils.server_state.state")
+    async def test_ui_state_checked_on_single_storage_read(
+        self, mock_state_obj, mock_page
+    ):
+        """UI flags come from the initial read; no second localStorage read."""
+        from browser_utils.models.startup import _handle_initial_model_state_and_storage
+
+        mock_state_obj.current_ai_studio_model_id = None
+        mock_page.evaluate.return_value = json.dumps(
+            {"promptModel": "models/gemini-2.0-flash", "isAdvancedOpen": False}
+        )
+
+        with patch(
+            "browser_utils.models.startup._set_model_from_page_display",
+            new_callable=AsyncMock,
+        ) as mock_set_model:
+            await _handle_initial_model_state_and_storage(mock_page)
+
+        # isAdvancedOpen is off, so the refresh path is taken
+        mock_set_model.assert_any_await(mock_page, set_storage=True)
+        reads = [
+            call
+            for call in mock_page.evaluate.await_args_list
+            if call.args[0] == "() => localStorage.getItem('aiStudioUserPreference')"
+        ]
+        assert len(reads) == 1
+
     @pytest.mark.asyncio
     @patch("api_utils.server_state.state")
     async def test_refresh_when_storage_missing(self, mock_state_obj, mock_page):
@@ -142,9 +189,9 @@ class TestHandleInitialModelStateAndStorage:
         # No localStorage
         mock_page.evaluate.return_value = None
 
-        # Mock the locator for model name - properly chain .first.inner_text
+        # Mock the locator for model name - properly chain .first.text_content
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-pro")
+        first_locator.text_content = AsyncMock(return_value="gemini-pro")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
@@ -180,7 +227,7 @@ class TestHandleInitialModelStateAndStorage:
         mock_page.evaluate.return_value = "invalid json {"
 
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-pro")
+        first_locator.text_content = AsyncMock(return_value="gemini-pro")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
@@ -218,7 +265,7 @@ class TestStateTaggedLogging:
         mock_page.evaluate.return_value = None  # No localStorage
 
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-pro")
+        first_locator.text_content = AsyncMock(return_value="gemini-pro")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
@@ -253,7 +300,7 @@ class TestStateTaggedLogging:
         mock_state_obj.model_list_fetch_event = None
 
         first_locator = MagicMock()
-        first_locator.inner_text = AsyncMock(return_value="gemini-flash")
+        first_locator.text_content = AsyncMock(return_value="gemini-flash")
         model_locator = MagicMock()
         model_locator.first = first_locator
         mock_page.locator.return_value = model_locator
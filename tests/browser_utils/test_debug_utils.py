@@ -8,15 +8,21 @@ REFACTORED: Reduced from 299 mocks to ~60 mocks by using real server state and
 smart fixture design instead of patching every server attribute individually.
 """
 
+import asyncio
+import json
 import os
 import platform
 import sys
+import threading
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, mock_open, patch
 
 import pytest
 from playwright.async_api import Error as PlaywrightError
 
 from browser_utils.debug_utils import (
+    _make_snapshot_dir,
+    _read_environment,
     capture_dom_structure,
     capture_playwright_state,
     capture_system_context,
@@ -222,11 +228,21 @@ class TestCaptureDomStructure:
 
         await capture_dom_structure(real_mock_page)
 
-        # Verify JavaScript function was passed
-        call_args = real_mock_page.evaluate.call_args[0][0]
-        assert "function getTreeStructure" in call_args
-        assert "maxDepth = 15" in call_args
-        assert "element.tagName" in call_args
+        # Verify JavaScript function was passed with the depth limit as argument
+        script, max_depth = real_mock_page.evaluate.call_args[0]
+        assert "createTreeWalker" in script
+        assert "parts.join('')" in script
+        assert "element.tagName" in script
+        assert max_depth == 15
+
+    @pytest.mark.asyncio
+    async def test_dom_structure_custom_max_depth(self, real_mock_page):
+        """Test max depth is forwarded to the page script."""
+        real_mock_page.evaluate.return_value = "BODY\n"
+
+        await capture_dom_structure(real_mock_page, max_depth=3)
+
+        assert real_mock_page.evaluate.call_args[0][1] == 3
 
 
 # === Section 3: System Context Capture Tests ===
@@ -261,6 +277,19 @@ class TestCaptureSystemContext:
         assert "timestamp_iso" in meta
         assert "timestamp_texas" in meta
 
+    @pytest.mark.asyncio
+    async def test_system_context_launch_args_unset(
+        self, mock_server_state, monkeypatch
+    ):
+        """Unset launch settings are reported as unknown, not as defaults."""
+        monkeypatch.delenv("HEADLESS", raising=False)
+        monkeypatch.setenv("DEBUG_LOGS_ENABLED", "true")
+        with patch("api_utils.server_state.state", mock_server_state):
+            context = await capture_system_context()
+
+        launch_args = context["configuration"]["launch_args"]
+        assert launch_args == {"headless": "unknown", "debug_logs": "true"}
+
     @pytest.mark.asyncio
     async def test_system_context_system_info(self, mock_server_state):
         """Test system info fields."""
@@ -494,6 +523,52 @@ class TestCapturePlaywrightState:
 
         assert "error" in state["locators"]["broken_locator"]
 
+    @pytest.mark.asyncio
+    async def test_playwright_state_locators_probed_concurrently(self, real_mock_page):
+        """Test element queries overlap within and across locators."""
+        in_flight = 0
+        peak = 0
+
+        async def query(result, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return result
+
+        def make_locator():
+            locator = MagicMock()
+            locator.count = AsyncMock(return_value=1)
+            locator.is_visible = lambda **kw: query(True, **kw)
+            locator.is_enabled = lambda **kw: query(False, **kw)
+            locator.input_value = lambda **kw: query("text", **kw)
+            return locator
+
+        locators = {"first": make_locator(), "second": make_locator()}
+        state = await capture_playwright_state(real_mock_page, locators)  # type: ignore[arg-type]
+
+        assert peak == 6
+        for name in locators:
+            assert state["locators"][name]["visible"] is True
+            assert state["locators"][name]["enabled"] is False
+            assert state["locators"][name]["value"] == "text"
+
+    @pytest.mark.asyncio
+    async def test_playwright_state_missing_locator_skips_queries(self, real_mock_page):
+        """Test absent elements are not queried further."""
+        mock_locator = AsyncMock()
+        mock_locator.count.return_value = 0
+
+        state = await capture_playwright_state(
+            real_mock_page,
+            {"missing": mock_locator},  # type: ignore[dict-item]
+        )
+
+        assert state["locators"]["missing"]["visible"] is False
+        mock_locator.is_enabled.assert_not_called()
+        mock_locator.input_value.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_playwright_state_cookies_count(self, real_mock_page):
         """Test cookie count statistics."""
@@ -527,6 +602,35 @@ class TestCapturePlaywrightState:
         assert state["storage"]["cookies_count"] == 0
         assert state["storage"]["localStorage_keys"] == []
 
+    @pytest.mark.asyncio
+    async def test_playwright_state_page_queries_run_concurrently(self, real_mock_page):
+        """Test title, cookies and localStorage are fetched concurrently."""
+        started = []
+        release = asyncio.Event()
+
+        def blocking(name, result):
+            async def call(*args, **kwargs):
+                started.append(name)
+                await release.wait()
+                return result
+
+            return call
+
+        real_mock_page.title = blocking("title", "AI Studio")
+        real_mock_page.context.cookies = blocking("cookies", [{"name": "a"}])
+        real_mock_page.evaluate = blocking("evaluate", ["theme"])
+
+        task = asyncio.create_task(capture_playwright_state(real_mock_page))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert sorted(started) == ["cookies", "evaluate", "title"]
+
+        release.set()
+        state = await task
+        assert state["page"]["title"] == "AI Studio"
+        assert state["storage"]["cookies_count"] == 1
+        assert state["storage"]["localStorage_keys"] == ["theme"]
+
 
 # === Section 5: Comprehensive Snapshot Tests ===
 
@@ -652,6 +756,267 @@ class TestSaveComprehensiveSnapshot:
 
             # Should complete despite screenshot failure
 
+    @pytest.mark.asyncio
+    async def test_snapshot_captures_run_concurrently(
+        self, real_mock_page, tmp_path, mock_server_state
+    ):
+        """Page captures overlap: the HTML dump can wait on the DOM capture."""
+        dom_started = asyncio.Event()
+
+        async def fake_dom(page):
+            dom_started.set()
+            return "BODY\n"
+
+        async def fake_content():
+            await asyncio.wait_for(dom_started.wait(), timeout=1.0)
+            return "<html></html>"
+
+        real_mock_page.content = fake_content
+
+        with (
+            patch("browser_utils.debug_utils.Path") as mock_path_class,
+            patch("api_utils.server_state.state", mock_server_state),
+            patch("browser_utils.debug_utils.capture_dom_structure", fake_dom),
+            patch(
+                "browser_utils.debug_utils.capture_playwright_state",
+                AsyncMock(return_value={"page": {}}),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_system_context",
+                AsyncMock(return_value={"meta": {}}),
+            ),
+        ):
+            mock_path_class.return_value.parent.parent = tmp_path
+            result = await save_comprehensive_snapshot(
+                page=real_mock_page, error_name="test", req_id="req123"
+            )
+
+        snapshot_dir = Path(result)
+        assert (snapshot_dir / "dom_dump.html").read_text() == "<html></html>"
+        assert (snapshot_dir / "dom_structure.txt").read_text() == "BODY\n"
+        assert (snapshot_dir / "metadata.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_writes_files_off_event_loop(
+        self, real_mock_page, tmp_path, mock_server_state
+    ):
+        """Artifact files are written from worker threads, not the event loop."""
+        loop_thread = threading.get_ident()
+        writer_threads = set()
+
+        def record_write(path, data):
+            writer_threads.add(threading.get_ident())
+
+        with (
+            patch("browser_utils.debug_utils.Path") as mock_path_class,
+            patch("api_utils.server_state.state", mock_server_state),
+            patch("browser_utils.debug_utils._write_text", side_effect=record_write),
+            patch("browser_utils.debug_utils._write_json", side_effect=record_write),
+            patch(
+                "browser_utils.debug_utils.capture_dom_structure",
+                AsyncMock(return_value="BODY\n"),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_playwright_state",
+                AsyncMock(return_value={}),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_system_context",
+                AsyncMock(return_value={}),
+            ),
+        ):
+            mock_path_class.return_value.parent.parent = tmp_path
+            await save_comprehensive_snapshot(
+                page=real_mock_page, error_name="test", req_id="req123"
+            )
+
+        assert writer_threads
+        assert loop_thread not in writer_threads
+
+    @pytest.mark.asyncio
+    async def test_snapshot_metadata_traceback_from_exception(
+        self, real_mock_page, tmp_path, mock_server_state
+    ):
+        """Metadata traceback belongs to error_exception, not the current one."""
+
+        def fail_inner():
+            raise ValueError("original failure")
+
+        try:
+            fail_inner()
+        except ValueError as exc:
+            error_exc = exc
+
+        written = {}
+
+        def record_json(path, data):
+            written[Path(path).name] = data
+
+        with (
+            patch("browser_utils.debug_utils.Path") as mock_path_class,
+            patch("api_utils.server_state.state", mock_server_state),
+            patch("browser_utils.debug_utils._write_text"),
+            patch("browser_utils.debug_utils._write_json", side_effect=record_json),
+            patch(
+                "browser_utils.debug_utils.capture_dom_structure",
+                AsyncMock(return_value="BODY\n"),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_playwright_state",
+                AsyncMock(return_value={}),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_system_context",
+                AsyncMock(return_value={}),
+            ),
+        ):
+            mock_path_class.return_value.parent.parent = tmp_path
+            await save_comprehensive_snapshot(
+                page=real_mock_page,
+                error_name="test",
+                req_id="req123",
+                error_exception=error_exc,
+            )
+
+        exception_info = written["metadata.json"]["exception"]
+        assert exception_info["type"] == "ValueError"
+        assert "fail_inner" in exception_info["traceback"]
+        assert "ValueError: original failure" in exception_info["traceback"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_serializes_bounded_debug_logs(
+        self, real_mock_page, tmp_path, mock_server_state
+    ):
+        """Deque-backed console and network logs are written as JSON lists."""
+        from collections import deque
+
+        mock_server_state.console_logs = deque(
+            [{"type": "log", "text": "hello"}], maxlen=5
+        )
+        mock_server_state.network_log = {
+            "requests": deque([{"url": "https://a"}], maxlen=5),
+            "responses": deque(maxlen=5),
+        }
+        written = {}
+
+        def record_text(path, text):
+            written[Path(path).name] = text
+
+        with (
+            patch("browser_utils.debug_utils.Path") as mock_path_class,
+            patch("api_utils.server_state.state", mock_server_state),
+            patch("browser_utils.debug_utils._write_text", side_effect=record_text),
+            patch("browser_utils.debug_utils._write_json"),
+            patch(
+                "browser_utils.debug_utils.capture_dom_structure",
+                AsyncMock(return_value="BODY\n"),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_playwright_state",
+                AsyncMock(return_value={}),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_system_context",
+                AsyncMock(return_value={}),
+            ),
+        ):
+            mock_path_class.return_value.parent.parent = tmp_path
+            await save_comprehensive_snapshot(
+                page=real_mock_page, error_name="test", req_id="req123"
+            )
+
+        assert json.loads(written["network_requests.json"]) == {
+            "requests": [{"url": "https://a"}],
+            "responses": [],
+        }
+        assert "hello" in written["console_logs.txt"]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_disabled_skips_capture(self, real_mock_page):
+        """No Playwright calls are made when error snapshots are disabled."""
+        with patch("browser_utils.debug_utils.SNAPSHOT_ON_ERROR", False):
+            result = await save_comprehensive_snapshot(
+                page=real_mock_page, error_name="test", req_id="req123"
+            )
+
+        assert result == ""
+        real_mock_page.screenshot.assert_not_called()
+        real_mock_page.content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_without_full_dom_skips_tree_walk(
+        self, real_mock_page, tmp_path, mock_server_state
+    ):
+        """SNAPSHOT_FULL_DOM=false leaves out the DOM structure capture."""
+        mock_dom = AsyncMock(return_value="BODY\n")
+
+        with (
+            patch("browser_utils.debug_utils.SNAPSHOT_FULL_DOM", False),
+            patch("browser_utils.debug_utils.Path") as mock_path_class,
+            patch("api_utils.server_state.state", mock_server_state),
+            patch("browser_utils.debug_utils._write_text"),
+            patch("browser_utils.debug_utils._write_json"),
+            patch("browser_utils.debug_utils.capture_dom_structure", mock_dom),
+            patch(
+                "browser_utils.debug_utils.capture_playwright_state",
+                AsyncMock(return_value={}),
+            ),
+            patch(
+                "browser_utils.debug_utils.capture_system_context",
+                AsyncMock(return_value={}),
+            ),
+        ):
+            mock_path_class.return_value.parent.parent = tmp_path
+            await save_comprehensive_snapshot(
+                page=real_mock_page, error_name="test", req_id="req123"
+            )
+
+        mock_dom.assert_not_called()
+        real_mock_page.screenshot.assert_called_once()
+
+    def test_make_snapshot_dir_creates_date_dir_once(self, tmp_path, monkeypatch):
+        """Date directories are created once and recreated if removed."""
+        import shutil
+
+        monkeypatch.setattr("browser_utils.debug_utils._MADE_DIRS", set())
+        date_dir = tmp_path / "errors_py" / "2025-01-15"
+
+        _make_snapshot_dir(date_dir, date_dir / "first")
+        with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mk:
+            _make_snapshot_dir(date_dir, date_dir / "second")
+        assert [call.args[0] for call in mk.call_args_list] == [date_dir / "second"]
+
+        shutil.rmtree(tmp_path / "errors_py")
+        _make_snapshot_dir(date_dir, date_dir / "third")
+        assert (date_dir / "third").is_dir()
+
+    def test_read_environment_parses_settings(self, monkeypatch):
+        """Environment snapshot parses the boolean settings once."""
+        monkeypatch.setenv("HEADLESS", "False")
+        monkeypatch.setenv("DEBUG_LOGS_ENABLED", "TRUE")
+        monkeypatch.setenv("DEFAULT_MODEL", "gemini-test")
+        monkeypatch.delenv("LAUNCH_MODE", raising=False)
+
+        env = _read_environment()
+
+        assert env["headless_mode"] is False
+        assert env["DEBUG_LOGS_ENABLED"] is True
+        assert env["DEFAULT_MODEL"] == "gemini-test"
+        assert env["launch_mode"] == "unknown"
+
+    def test_environment_read_on_first_use(self, monkeypatch):
+        """Settings exported after import are still recorded."""
+        import browser_utils.debug_utils as debug_utils
+
+        monkeypatch.setattr(debug_utils, "_env_snapshot", None)
+        monkeypatch.setenv("LAUNCH_MODE", "headless")
+
+        env = debug_utils._get_environment()
+
+        assert env["launch_mode"] == "headless"
+        monkeypatch.setenv("LAUNCH_MODE", "debug")
+        assert debug_utils._get_environment() is env
+
 
 # === Section 6: Enhanced Snapshot Tests ===
 
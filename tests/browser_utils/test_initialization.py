@@ -50,6 +50,37 @@ async def test_initialize_page_logic_success(
         mock_browser.new_context.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_initialize_page_logic_registers_context_response_listener(
+    mock_browser,
+    mock_browser_context,
+    mock_page,
+    mock_env,
+    mock_expect,
+    mock_server_state,
+):
+    from browser_utils.initialization.core import _on_model_list_response
+
+    mock_server_state.PLAYWRIGHT_PROXY_SETTINGS = None
+    with (
+        patch(
+            "browser_utils.initialization.core.setup_network_interception_and_scripts",
+            new_callable=AsyncMock,
+        ),
+        patch("browser_utils.initialization.core.setup_debug_listeners"),
+    ):
+        mock_page.url = "https://aistudio.google.com/prompts/new_chat"
+        mock_browser_context.pages = [mock_page]
+        mock_page.locator.return_value.first.inner_text = AsyncMock(
+            return_value="Gemini 1.5 Pro"
+        )
+
+        await _initialize_page_logic(mock_browser)
+
+    mock_browser_context.on.assert_called_once_with("response", _on_model_list_response)
+    assert all(call.args[0] != "response" for call in mock_page.on.call_args_list)
+
+
 @pytest.mark.asyncio
 async def test_initialize_page_logic_new_page(
     mock_browser,
@@ -84,8 +115,11 @@ async def test_initialize_page_logic_new_page(
 
 @pytest.mark.asyncio
 async def test_close_page_logic_success():
+    from browser_utils.initialization.core import _on_model_list_response
+
     mock_page = AsyncMock()
     mock_page.is_closed = MagicMock(return_value=False)
+    mock_page.context.remove_listener = MagicMock()
 
     from api_utils.server_state import state
 
@@ -98,6 +132,9 @@ async def test_close_page_logic_success():
 
         await _close_page_logic()
 
+        mock_page.context.remove_listener.assert_called_once_with(
+            "response", _on_model_list_response
+        )
         mock_page.close.assert_called()
         assert state.page_instance is None
         assert state.is_page_ready is False
@@ -473,14 +510,15 @@ async def test_init_new_page_nav_error_net_interrupt(
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize("launch_mode", ["headless", "virtual_headless"])
 async def test_init_login_headless_fail(
-    mock_browser, mock_browser_context, mock_page, mock_server_state
+    mock_browser, mock_browser_context, mock_page, mock_server_state, launch_mode
 ):
     # Ensure ACTIVE_AUTH_JSON_PATH is set so we pass the initial check
     with (
         patch.dict(
             "os.environ",
-            {"LAUNCH_MODE": "headless", "ACTIVE_AUTH_JSON_PATH": "/path/to/auth.json"},
+            {"LAUNCH_MODE": launch_mode, "ACTIVE_AUTH_JSON_PATH": "/path/to/auth.json"},
         ),
         patch("os.path.exists", return_value=True),
         patch(
@@ -498,7 +536,8 @@ async def test_init_login_headless_fail(
 
         with pytest.raises(RuntimeError) as exc:
             await _initialize_page_logic(mock_browser)
-        assert "Auth failed in headless mode" in str(exc.value)
+        assert f"Auth failed in {launch_mode} mode" in str(exc.value)
+        mock_page.wait_for_url.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -544,6 +583,59 @@ async def test_init_login_interactive_success(
         mock_page.wait_for_url.assert_called()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("auto_save", ["true", "1", "yes", "on"])
+async def test_init_login_auto_save_auth_flag_values(
+    mock_browser,
+    mock_browser_context,
+    mock_page,
+    mock_expect,
+    mock_server_state,
+    auto_save,
+):
+    with (
+        patch.dict(
+            "os.environ",
+            {
+                "LAUNCH_MODE": "debug",
+                "SUPPRESS_LOGIN_WAIT": "yes",
+                "AUTO_SAVE_AUTH": auto_save,
+            },
+        ),
+        patch(
+            "browser_utils.initialization.core.setup_network_interception_and_scripts",
+            new_callable=AsyncMock,
+        ),
+        patch("browser_utils.initialization.core.setup_debug_listeners"),
+        patch(
+            "browser_utils.initialization.core.wait_for_model_list_and_handle_auth_save",
+            new_callable=AsyncMock,
+        ) as mock_auth_save,
+        patch("builtins.input") as mock_input,
+        patch("builtins.print"),
+    ):
+        mock_browser_context.pages = []
+        mock_browser_context.new_page.return_value = mock_page
+
+        type(mock_page).url = PropertyMock(
+            side_effect=[
+                "https://accounts.google.com/signin",
+                "https://aistudio.google.com/prompts/new_chat",
+                "https://aistudio.google.com/prompts/new_chat",
+                "https://aistudio.google.com/prompts/new_chat",
+            ]
+        )
+        mock_page.wait_for_url = AsyncMock()
+        mock_page.locator.return_value.first.inner_text = AsyncMock(
+            return_value="Model"
+        )
+
+        await _initialize_page_logic(mock_browser)
+
+        mock_input.assert_not_called()
+        mock_auth_save.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_init_login_interactive_suppress_wait(
     mock_browser, mock_browser_context, mock_page, mock_expect, mock_server_state
@@ -898,6 +990,28 @@ async def test_enable_temporary_chat_mode_activate_success(mock_page):
     locator.click.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_enable_temporary_chat_mode_waits_for_active_state(mock_page):
+    locator = MagicMock()
+    locator.wait_for = AsyncMock()
+    locator.click = AsyncMock()
+    locator.first.wait_for = AsyncMock()
+    mock_page.locator = MagicMock(return_value=locator)
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        await enable_temporary_chat_mode(mock_page)
+
+    locator.click.assert_called()
+    locator.first.wait_for.assert_awaited_once_with(state="attached", timeout=5000)
+    mock_sleep.assert_not_awaited()
+    selectors = [call.args[0] for call in mock_page.locator.call_args_list]
+    assert any(
+        "[data-test-incognito-checkmark]" in selector
+        and "button[data-test-incognito-toggle].ms-button-active" in selector
+        for selector in selectors
+    )
+
+
 @pytest.mark.asyncio
 async def test_enable_temporary_chat_mode_activate_fail(mock_page):
     locator = MagicMock()
@@ -927,3 +1041,72 @@ async def test_enable_temporary_chat_mode_cancelled(mock_page):
 
     with pytest.raises(asyncio.CancelledError):
         await enable_temporary_chat_mode(mock_page)
+
+
+def test_get_operations_imports_once():
+    import browser_utils.operations as operations
+    from browser_utils.initialization import core
+
+    with patch.object(core, "_operations_module", None):
+        assert core._get_operations() is operations
+        assert core._operations_module is operations
+        with patch.dict("sys.modules", {"browser_utils.operations": None}):
+            # Cached: no import is attempted on later calls
+            assert core._get_operations() is operations
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://aistudio.google.com/prompts/new_chat", True),
+        ("https://aistudio.google.com/prompts/abc123", True),
+        ("https://aistudio.google.com/apps", False),
+        ("https://accounts.google.com/prompts/", False),
+        ("", False),
+    ],
+)
+def test_is_ai_studio_prompts_url(url, expected):
+    from browser_utils.initialization.core import _is_ai_studio_prompts_url
+
+    assert _is_ai_studio_prompts_url(url) is expected
+
+
+@pytest.mark.asyncio
+async def test_on_model_list_response_only_schedules_model_list():
+    from browser_utils.initialization import core
+
+    handler = AsyncMock()
+    with patch("browser_utils.operations._handle_model_list_response", handler):
+        other = MagicMock(url="https://aistudio.google.com/static/app.js")
+        core._on_model_list_response(other)
+        assert not core._model_list_tasks
+
+        models = MagicMock(
+            url="https://alkalimakersuite-pa.clients6.google.com/$rpc/"
+            "google.internal.alkali.applications.makersuite.v1.MakerSuiteService/ListModels"
+        )
+        core._on_model_list_response(models)
+        await core._drain_model_list_tasks()
+
+    handler.assert_awaited_once_with(models)
+    assert not core._model_list_tasks
+
+
+@pytest.mark.asyncio
+async def test_drain_model_list_tasks_cancels_stragglers():
+    from browser_utils.initialization import core
+
+    finished = asyncio.Event()
+
+    async def slow_handler(response):
+        try:
+            await asyncio.sleep(10)
+        finally:
+            finished.set()
+
+    with patch("browser_utils.operations._handle_model_list_response", slow_handler):
+        core._on_model_list_response(MagicMock(url="x/MakerSuiteService/ListModels"))
+        await core._drain_model_list_tasks(timeout=0.01)
+
+    assert finished.is_set()
+    assert not core._model_list_tasks
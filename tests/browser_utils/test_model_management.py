@@ -396,7 +396,7 @@ async def test_set_model_from_page_display(mock_page):
 
     # Mock locator
     mock_locator = MagicMock()
-    mock_locator.first.inner_text = AsyncMock(return_value="new-model")
+    mock_locator.first.text_content = AsyncMock(return_value="new-model")
     mock_page.locator.return_value = mock_locator
 
     with (
@@ -441,7 +441,7 @@ async def test_handle_initial_model_state_needs_reload(mock_page):
 
         # Should reload page
         mock_page.goto.assert_called_with(
-            "http://test.url", wait_until="domcontentloaded", timeout=40000
+            "http://test.url", wait_until="commit", timeout=40000
         )
 
 
@@ -738,6 +738,34 @@ async def test_handle_initial_model_state_reload_retry_logic(mock_page):
         assert mock_set_model.call_count == 2
 
 
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_handle_initial_model_state_reload_backoff(mock_page):
+    """Retry delays back off exponentially from the base delay, plus jitter"""
+    mock_page.evaluate.return_value = None  # Trigger reload
+    mock_page.goto.side_effect = [Exception("Fail 1"), Exception("Fail 2"), None]
+
+    with (
+        patch("browser_utils.models.startup._set_model_from_page_display"),
+        patch(
+            "browser_utils.models.startup._verify_and_apply_ui_state",
+            new_callable=AsyncMock,
+        ),
+        patch("browser_utils.models.startup.logger"),
+        patch(
+            "browser_utils.models.startup.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep,
+        patch("browser_utils.models.startup.random.uniform", return_value=0.1),
+        patch("browser_utils.models.startup.expect_async") as mock_expect,
+    ):
+        mock_expect.return_value.to_be_visible = AsyncMock()
+
+        await _handle_initial_model_state_and_storage(mock_page)
+
+    delays = [call.args[0] for call in mock_sleep.await_args_list]
+    assert delays == [pytest.approx(0.6), pytest.approx(1.1)]
+
+
 @pytest.mark.asyncio
 @pytest.mark.timeout(5)
 async def test_set_model_from_page_display_timeout(mock_page):
@@ -749,17 +777,17 @@ async def test_set_model_from_page_display_timeout(mock_page):
     # Use AsyncMock for async event
     mock_event = AsyncMock(spec=asyncio.Event)
     mock_event.is_set.return_value = False  # Event not set, will wait
+    mock_event.wait.side_effect = TimeoutError
     mock_state.model_list_fetch_event = mock_event
 
     # Mock locator
     mock_locator = MagicMock()
-    mock_locator.first.inner_text = AsyncMock(return_value="displayed-model")
+    mock_locator.first.text_content = AsyncMock(return_value="displayed-model")
     mock_page.locator.return_value = mock_locator
 
     with (
         patch("api_utils.server_state.state", mock_state),
         patch("browser_utils.models.startup.logger") as mock_logger,
-        patch("asyncio.wait_for", side_effect=asyncio.TimeoutError),
     ):
         await _set_model_from_page_display(mock_page, set_storage=False)
 
@@ -785,12 +813,11 @@ async def test_set_model_from_page_display_storage_logic(mock_page):
     mock_state.parsed_model_list = []
 
     mock_locator = MagicMock()
-    mock_locator.first.inner_text = AsyncMock(return_value="new-model")
+    mock_locator.first.text_content = AsyncMock(return_value="new-model")
     mock_page.locator.return_value = mock_locator
 
-    # Mock existing prefs
-    existing_prefs = {"someKey": "someVal"}
-    mock_page.evaluate.return_value = json.dumps(existing_prefs)
+    # The page merge returns the resulting promptModel
+    mock_page.evaluate.return_value = "models/new-model"
 
     with (
         patch("api_utils.server_state.state", mock_state),
@@ -802,18 +829,17 @@ async def test_set_model_from_page_display_storage_logic(mock_page):
     ):
         await _set_model_from_page_display(mock_page, set_storage=True)
 
-        # Check that setItem was called with updated prefs
-        assert mock_page.evaluate.call_count == 2  # getItem, setItem
+        # Read, merge and write happen in a single evaluate
+        assert mock_page.evaluate.call_count == 1
 
-        # Verify setItem args
-        set_call = mock_page.evaluate.call_args_list[1]
+        set_call = mock_page.evaluate.call_args_list[0]
         assert "localStorage.setItem" in set_call[0][0]
-        saved_prefs = json.loads(set_call[0][1])
+        merge_args = set_call[0][1]
 
-        assert saved_prefs["isAdvancedOpen"] is True
-        assert saved_prefs["promptModel"] == "models/new-model"
+        assert merge_args["overrides"]["isAdvancedOpen"] is True
+        assert merge_args["overrides"]["promptModel"] == "models/new-model"
         # Check default keys added
-        assert "bidiModel" in saved_prefs
+        assert "bidiModel" in merge_args["defaults"]
 
 
 @pytest.mark.asyncio
@@ -1040,7 +1066,7 @@ async def test_handle_initial_state_valid_no_reload(mock_page, mock_server):
         {"promptModel": "models/valid-model", "isAdvancedOpen": True}
     )
 
-    with patch("browser_utils.models.startup._verify_ui_state_settings") as mock_verify:
+    with patch("browser_utils.models.startup._ui_state_from_prefs") as mock_verify:
         mock_verify.return_value = {"needsUpdate": False}
 
         with patch.dict(sys.modules, {"server": mock_server}):
@@ -1065,7 +1091,7 @@ async def test_handle_initial_model_state_and_storage_success(mock_page, mock_se
 
     with (
         patch(
-            "browser_utils.models.startup._verify_ui_state_settings",
+            "browser_utils.models.startup._ui_state_from_prefs",
             return_value={"needsUpdate": False},
         ),
         patch.dict("sys.modules", {"server": mock_server}),
@@ -1156,7 +1182,7 @@ async def test_handle_initial_model_state_reload_retry(mock_page, mock_server):
 async def test_set_model_from_display_basic(mock_page, mock_server):
     """Test setting model from page display."""
     mock_element = AsyncMock()
-    mock_element.inner_text.return_value = "displayed-model"
+    mock_element.text_content.return_value = "displayed-model"
 
     mock_locator = AsyncMock()
     mock_locator.first = mock_element
@@ -1204,7 +1230,7 @@ async def test_set_model_from_page_display_success(mock_page, mock_server):
     """Test _set_model_from_page_display success."""
     mock_locator = MagicMock()
     mock_element = AsyncMock()
-    mock_element.inner_text.return_value = "gemini-ultra"
+    mock_element.text_content.return_value = "gemini-ultra"
     type(mock_locator).first = PropertyMock(return_value=mock_element)
     mock_page.locator.return_value = mock_locator
 
@@ -1225,7 +1251,7 @@ async def test_set_model_from_page_display_success(mock_page, mock_server):
 @pytest.mark.timeout(5)
 async def test_set_model_from_page_display_set_storage_defaults(mock_page, mock_server):
     """Test set_storage=True logic with default keys."""
-    mock_page.locator.return_value.first.inner_text = AsyncMock(
+    mock_page.locator.return_value.first.text_content = AsyncMock(
         return_value="gemini-pro"
     )
     mock_page.evaluate.return_value = None  # No existing prefs
@@ -1241,10 +1267,9 @@ async def test_set_model_from_page_display_set_storage_defaults(mock_page, mock_
 
         args = mock_page.evaluate.call_args[0]
         assert "localStorage.setItem" in args[0]
-        prefs = json.loads(args[1])
-        assert prefs["isAdvancedOpen"] is True
-        assert prefs["promptModel"] == "models/gemini-pro"
-        assert prefs["getCodeLanguage"] == "Node.js"
+        assert args[1]["overrides"]["isAdvancedOpen"] is True
+        assert args[1]["overrides"]["promptModel"] == "models/gemini-pro"
+        assert args[1]["defaults"]["getCodeLanguage"] == "Node.js"
 
 
 @pytest.mark.asyncio
@@ -1258,7 +1283,7 @@ async def test_set_model_from_page_display_same_id(mock_page):
     mock_event.set()  # Already set
     mock_state.model_list_fetch_event = mock_event
 
-    mock_page.locator.return_value.first.inner_text = AsyncMock(
+    mock_page.locator.return_value.first.text_content = AsyncMock(
         return_value="gemini-pro"
     )
 
@@ -547,7 +547,7 @@ async def test_set_model_display_basic(mock_page):
     state.current_ai_studio_model_id = "old"
 
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(return_value="new-model")
+    mock_loc.first.text_content = AsyncMock(return_value="new-model")
     mock_page.locator.return_value = mock_loc
 
     await _set_model_from_page_display(mock_page, set_storage=False)
@@ -566,7 +566,7 @@ async def test_set_model_display_with_storage(mock_page):
     state.model_list_fetch_event = mock_event
 
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(return_value="model-id")
+    mock_loc.first.text_content = AsyncMock(return_value="model-id")
     mock_page.locator.return_value = mock_loc
 
     # First call returns existing prefs, second call for setItem
@@ -584,7 +584,7 @@ async def test_set_model_display_with_storage(mock_page):
 
 @pytest.mark.asyncio
 async def test_set_model_display_json_error_storage(mock_page):
-    """Lines 807-811: JSONDecodeError on existing prefs."""
+    """Unreadable stored prefs are replaced inside the page merge."""
     from api_utils.server_state import state
 
     # Setup event mock
@@ -593,19 +593,20 @@ async def test_set_model_display_json_error_storage(mock_page):
     state.model_list_fetch_event = mock_event
 
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(return_value="model")
+    mock_loc.first.text_content = AsyncMock(return_value="model")
     mock_page.locator.return_value = mock_loc
 
-    # First call returns invalid JSON, second call for setItem
-    mock_page.evaluate.side_effect = ["invalid json", None]
+    # The merge treats unparsable stored prefs as empty
+    mock_page.evaluate.return_value = "models/model"
 
     with patch(
         "browser_utils.models.startup._verify_and_apply_ui_state", return_value=True
     ):
         await _set_model_from_page_display(mock_page, set_storage=True)
 
-        # Should handle error and create new prefs
-        assert mock_page.evaluate.call_count >= 2
+        # No separate read: a single merge-and-write evaluate
+        assert mock_page.evaluate.call_count == 1
+        assert "JSON.parse" in mock_page.evaluate.call_args[0][0]
 
 
 @pytest.mark.asyncio
@@ -708,6 +709,51 @@ async def test_handle_initial_reload_retry_all_fail(mock_page):
         assert mock_page.goto.call_count == 3
 
 
+@pytest.mark.asyncio
+async def test_handle_initial_reload_fail_snapshot_in_background(mock_page):
+    """The final reload failure snapshot runs as a tracked background task."""
+    from browser_utils.models import startup
+
+    mock_page.evaluate.return_value = None  # Missing localStorage
+    mock_page.url = "https://test.url"
+    mock_page.goto.side_effect = Exception("Reload always fails")
+
+    snapshot_started = asyncio.Event()
+    release_snapshot = asyncio.Event()
+
+    async def slow_snapshot(name):
+        snapshot_started.set()
+        await release_snapshot.wait()
+
+    with (
+        patch.object(startup, "_pending_snapshot_tasks", set()),
+        patch("browser_utils.models.startup._set_model_from_page_display"),
+        patch("browser_utils.models.startup.expect_async"),
+        patch("browser_utils.operations.save_error_snapshot", new=slow_snapshot),
+        patch("browser_utils.models.startup.asyncio.sleep", new_callable=AsyncMock),
+    ):
+        # Returns without waiting for the snapshot
+        await startup._handle_initial_model_state_and_storage(mock_page)
+        await snapshot_started.wait()
+        assert len(startup._pending_snapshot_tasks) == 1
+
+        release_snapshot.set()
+        await startup.drain_snapshot_tasks()
+        assert not startup._pending_snapshot_tasks
+
+
+@pytest.mark.asyncio
+async def test_drain_snapshot_tasks_cancels_after_timeout():
+    """A snapshot still running when the budget runs out is cancelled."""
+    from browser_utils.models import startup
+
+    task = asyncio.create_task(asyncio.sleep(60))
+    with patch.object(startup, "_pending_snapshot_tasks", {task}):
+        await startup.drain_snapshot_tasks(timeout=0.01)
+
+    assert task.cancelled()
+
+
 @pytest.mark.asyncio
 async def test_handle_initial_valid_state_no_reload(mock_page):
     """Lines 734-737: Valid state, no reload needed."""
@@ -724,15 +770,13 @@ async def test_handle_initial_valid_state_no_reload(mock_page):
     )
     mock_page.evaluate.return_value = prefs
 
-    with patch(
-        "browser_utils.models.startup._verify_ui_state_settings",
-        return_value={"needsUpdate": False},
-    ):
-        await _handle_initial_model_state_and_storage(mock_page)
+    await _handle_initial_model_state_and_storage(mock_page)
 
-        # Should not call goto since state is valid
-        mock_page.goto.assert_not_called()
-        assert state.current_ai_studio_model_id == "valid-model"
+    # Should not call goto since state is valid
+    mock_page.goto.assert_not_called()
+    assert state.current_ai_studio_model_id == "valid-model"
+    # UI state is checked on the same read
+    mock_page.evaluate.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -746,7 +790,7 @@ async def test_set_model_display_wait_for_event_timeout(mock_page):
     state.model_list_fetch_event = mock_event
 
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(return_value="model-from-page")
+    mock_loc.first.text_content = AsyncMock(return_value="model-from-page")
     mock_page.locator.return_value = mock_loc
 
     await _set_model_from_page_display(mock_page, set_storage=False)
@@ -765,18 +809,21 @@ async def test_set_model_display_ui_state_fail_fallback(mock_page):
     state.model_list_fetch_event = mock_event
 
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(return_value="test-model")
+    mock_loc.first.text_content = AsyncMock(return_value="test-model")
     mock_page.locator.return_value = mock_loc
 
-    mock_page.evaluate.side_effect = [json.dumps({}), None]
+    mock_page.evaluate.return_value = "models/test-model"
 
     with patch(
         "browser_utils.models.startup._verify_and_apply_ui_state", return_value=False
     ):
         await _set_model_from_page_display(mock_page, set_storage=True)
 
-        # Should still call setItem with traditional method
-        assert mock_page.evaluate.call_count >= 2
+        # Should still write the flags through the merge
+        mock_page.evaluate.assert_awaited_once()
+        overrides = mock_page.evaluate.call_args[0][1]["overrides"]
+        assert overrides["isAdvancedOpen"] is True
+        assert overrides["areToolsOpen"] is True
 
 
 @pytest.mark.asyncio
@@ -789,7 +836,7 @@ async def test_set_model_display_no_model_id_found(mock_page):
     state.model_list_fetch_event = mock_event
 
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(return_value="unknown-display")
+    mock_loc.first.text_content = AsyncMock(return_value="unknown-display")
     mock_page.locator.return_value = mock_loc
 
     # Return empty prefs without promptModel
@@ -961,7 +1008,7 @@ async def test_handle_initial_exception_fallback_cancellederror(mock_page):
 async def test_set_model_display_cancellederror(mock_page):
     """Lines 861-862: CancelledError in set_model_from_page_display."""
     mock_loc = MagicMock()
-    mock_loc.first.inner_text = AsyncMock(side_effect=asyncio.CancelledError())
+    mock_loc.first.text_content = AsyncMock(side_effect=asyncio.CancelledError())
     mock_page.locator.return_value = mock_loc
 
     with pytest.raises(asyncio.CancelledError):
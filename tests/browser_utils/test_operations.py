@@ -13,6 +13,7 @@ from browser_utils.operations import (
     get_response_via_copy_button,
     get_response_via_edit_button,
 )
+from config import ERROR_TOAST_SELECTOR
 
 
 @pytest.fixture(autouse=True)
@@ -144,22 +145,28 @@ async def test_handle_model_list_response_success():
 @pytest.mark.asyncio
 async def test_detect_and_extract_page_error_found(mock_page):
     """Test detecting page error."""
-    error_locator = create_robust_locator()
-    message_locator = create_robust_locator(text="Error message")
-
-    mock_page.locator.return_value.last = error_locator
-    error_locator.locator.return_value = message_locator
+    mock_page.evaluate.return_value = "Error message"
 
     result = await detect_and_extract_page_error(mock_page, "req_id")
     assert result == "Error message"
+    # Single evaluate, scoped to the toast selector
+    assert mock_page.evaluate.await_args.args[1] == ERROR_TOAST_SELECTOR
 
 
 @pytest.mark.asyncio
 async def test_detect_and_extract_page_error_not_found(mock_page):
     """Test detecting page error when none exists."""
-    error_locator = create_robust_locator()
-    mock_page.locator.return_value.last = error_locator
-    error_locator.wait_for.side_effect = PlaywrightAsyncError("Timeout")
+    mock_page.evaluate.return_value = None
+
+    result = await detect_and_extract_page_error(mock_page, "req_id")
+    assert result is None
+    mock_page.locator.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_detect_and_extract_page_error_playwright_error(mock_page):
+    """Test detecting page error when the evaluate fails."""
+    mock_page.evaluate.side_effect = PlaywrightAsyncError("Target closed")
 
     result = await detect_and_extract_page_error(mock_page, "req_id")
     assert result is None
@@ -14,6 +14,7 @@ from config.settings import (
     get_boolean_env,
     get_environment_variable,
     get_int_env,
+    get_uvicorn_loop,
 )
 
 # ===================== get_environment_variable Tests =====================
@@ -236,6 +237,32 @@ def test_module_constants_with_env_override():
             del sys.modules["config.settings"]
 
 
+def test_snapshot_flags_with_env_override():
+    """Test scenario: Error snapshot flags default on and can be disabled."""
+    original_module = sys.modules.get("config.settings")
+
+    try:
+        with (
+            patch.dict(
+                os.environ,
+                {"SNAPSHOT_ON_ERROR": "false", "SNAPSHOT_FULL_DOM": "0"},
+            ),
+            patch("dotenv.load_dotenv"),
+        ):
+            if "config.settings" in sys.modules:
+                del sys.modules["config.settings"]
+
+            import config.settings as settings
+
+            assert settings.SNAPSHOT_ON_ERROR is False
+            assert settings.SNAPSHOT_FULL_DOM is False
+    finally:
+        if original_module is not None:
+            sys.modules["config.settings"] = original_module
+        elif "config.settings" in sys.modules:
+            del sys.modules["config.settings"]
+
+
 def test_log_rotation_config():
     """Test scenario: Log rotation configuration parsing."""
     original_module = sys.modules.get("config.settings")
@@ -263,3 +290,24 @@ def test_log_rotation_config():
             sys.modules["config.settings"] = original_module
         elif "config.settings" in sys.modules:
             del sys.modules["config.settings"]
+
+
+# ===================== get_uvicorn_loop Tests =====================
+
+
+@pytest.mark.parametrize(
+    "enabled, installed, expected",
+    [
+        ("true", True, "uvloop"),
+        ("true", False, "asyncio"),
+        ("false", True, "asyncio"),
+    ],
+)
+def test_get_uvicorn_loop(enabled, installed, expected):
+    """Test scenario: uvloop only when enabled and importable."""
+    spec = object() if installed else None
+    with (
+        patch.dict(os.environ, {"UVLOOP_ENABLED": enabled}),
+        patch("config.settings.importlib.util.find_spec", return_value=spec),
+    ):
+        assert get_uvicorn_loop() == expected
@@ -167,6 +167,8 @@ def mock_browser_context(mock_page):
     """Mock Playwright BrowserContext."""
     context = AsyncMock()
     context.new_page.return_value = mock_page
+    # context.on() is SYNC
+    context.on = MagicMock()
     return context
 
 
@@ -132,8 +132,8 @@ class TestRequestProcessorWithRealLocks:
             req_id, request, http_request, result_future
         )
 
-        # Should return None (early exit)
-        assert result is None
+        # Should return an empty result (early exit)
+        assert result == (None, None, None)
 
         # Future should have 499 error
         assert result_future.done()